@@ -18,43 +18,26 @@
 
         // GIM gear progression targets, by combat style and game stage. Shown on the
         // Gearing tab only for the GIM account (which has no live gear); the Ironman
-        // keeps its own static gear tables in #gear-im.
-        const GIM_GEAR = {
-            melee: {
-                slots: ['Head','Cape','Neck','Weapon','Shield','Body','Legs','Hands','Feet','Ring'],
-                low:  { Head:'Helm of neitiznot', Cape:'Obsidian cape', Neck:'Amulet of glory', Weapon:'Dragon scimitar', Shield:'Rune defender', Body:'Rune platebody / Fighter torso', Legs:'Rune platelegs', Hands:'Combat bracelet', Feet:'Dragon boots', Ring:'Warrior ring (i)' },
-                mid:  { Head:'Serpentine helm', Cape:'Fire cape', Neck:'Amulet of fury', Weapon:'Abyssal whip / tentacle', Shield:'Dragon defender', Body:'Fighter torso', Legs:'Obsidian platelegs', Hands:'Barrows gloves', Feet:'Dragon boots', Ring:'Berserker ring (i)' },
-                end:  { Head:'Neitiznot faceguard', Cape:'Infernal cape', Neck:'Amulet of torture', Weapon:'Ghrazi rapier', Shield:'Avernic defender', Body:'Bandos chestplate', Legs:'Bandos tassets', Hands:'Ferocious gloves', Feet:'Primordial boots', Ring:'Ultor ring' },
-                late: { Head:'Torva full helm', Cape:'Infernal cape', Neck:'Amulet of rancour', Weapon:'Scythe of vitur', Shield:'Avernic defender', Body:'Torva platebody', Legs:'Torva platelegs', Hands:'Ferocious gloves', Feet:'Primordial boots', Ring:'Ultor ring' },
-            },
-            ranged: {
-                slots: ['Head','Cape','Neck','Weapon','Ammo','Body','Legs','Hands','Feet','Ring'],
-                low:  { Head:'Archer helm', Cape:"Ava's accumulator", Neck:'Amulet of glory', Weapon:'Magic shortbow (i)', Ammo:'Rune / amethyst arrows', Body:"Black d'hide body", Legs:"Black d'hide chaps", Hands:"Black d'hide vambraces", Feet:'Snakeskin boots', Ring:'Archers ring (i)' },
-                mid:  { Head:"Karil's coif", Cape:"Ava's assembler", Neck:'Amulet of fury', Weapon:'Toxic blowpipe / Rune crossbow', Ammo:'Dragon darts / ruby+diamond bolts (e)', Body:'Armadyl chestplate', Legs:'Armadyl chainskirt', Hands:'Barrows gloves', Feet:'Ranger boots', Ring:'Archers ring (i)' },
-                end:  { Head:'Armadyl helmet', Cape:"Ava's assembler", Neck:'Necklace of anguish', Weapon:'Toxic blowpipe + Zaryte crossbow', Ammo:'Dragon darts / dragon bolts (e)', Body:'Armadyl chestplate', Legs:'Armadyl chainskirt', Hands:'Zaryte vambraces', Feet:'Pegasian boots', Ring:'Venator ring' },
-                late: { Head:'Masori mask (f)', Cape:"Dizana's quiver", Neck:'Necklace of anguish', Weapon:'Twisted bow', Ammo:'Dragon arrows', Body:'Masori body (f)', Legs:'Masori chaps (f)', Hands:'Zaryte vambraces', Feet:'Pegasian boots', Ring:'Venator ring' },
-            },
-            magic: {
-                slots: ['Head','Cape','Neck','Weapon','Shield','Body','Legs','Hands','Feet','Ring'],
-                low:  { Head:'Farseer helm / Mystic hat', Cape:'God cape', Neck:'Amulet of magic', Weapon:'Trident of the seas', Shield:'Unholy book', Body:'Mystic robe top', Legs:'Mystic robe bottom', Hands:'Combat bracelet', Feet:'Infinity boots', Ring:'Seers ring (i)' },
-                mid:  { Head:"Ahrim's hood", Cape:'Imbued god cape', Neck:'Occult necklace', Weapon:'Trident of the swamp', Shield:"Mage's book / Tome of fire", Body:"Ahrim's robetop", Legs:"Ahrim's robeskirt", Hands:'Barrows gloves', Feet:'Eternal boots', Ring:'Seers ring (i)' },
-                end:  { Head:'Ancestral hat', Cape:'Imbued god cape', Neck:'Occult necklace', Weapon:'Sanguinesti staff', Shield:"Elidinis' ward", Body:'Ancestral robe top', Legs:'Ancestral robe bottom', Hands:'Tormented bracelet', Feet:'Eternal boots', Ring:'Magus ring' },
-                late: { Head:'Ancestral hat', Cape:'Imbued god cape', Neck:'Occult necklace', Weapon:"Tumeken's shadow", Shield:"Elidinis' ward (f)", Body:'Ancestral robe top', Legs:'Ancestral robe bottom', Hands:'Tormented bracelet', Feet:'Eternal boots', Ring:'Magus ring' },
-            },
-        };
-
+        // keeps its own static gear tables in #gear-im. The targets are data in
+        // osrs_config.GEAR_TARGETS; build_progression.py marks which pieces the
+        // account already owns and ships them in progression.json.
         function renderGimGearing(style) {
             currentGearStyle = style || currentGearStyle;
             const host = document.getElementById('gear-gim');
             if (!host) return;
-            const g = GIM_GEAR[currentGearStyle];
-            if (!g) { host.innerHTML = ''; return; }
-            const stages = [['low','Low level'],['mid','Midgame'],['end','Endgame'],['late','Late game']];
+            const gear = progressionData?.gear_targets;
+            const g = gear?.styles?.[currentGearStyle];
+            if (!g) {
+                host.innerHTML = progressionData ? '' : '<div class="empty-state">Gear targets not built yet — run scripts/build_progression.py.</div>';
+                return;
+            }
             const esc = (typeof escapeTargets === 'function') ? escapeTargets : (s => s);
             const rows = g.slots.map(slot => {
-                const cells = stages.map(([k]) => {
-                    const v = g[k] && g[k][slot];
-                    return `<td>${v ? esc(v) : '<span class="gdash">-</span>'}</td>`;
+                const cells = gear.stages.map(({ key }) => {
+                    const c = g.cells[key]?.[slot];
+                    if (!c) return '<td><span class="gdash">-</span></td>';
+                    const cls = c.owned === true ? ' class="gown"' : '';
+                    return `<td${cls}>${c.owned === true ? '✓ ' : ''}${esc(c.name)}</td>`;
                 }).join('');
                 return `<tr><td>${slot}</td>${cells}</tr>`;
             }).join('');
@@ -63,7 +46,7 @@
                 <div class="gear-section-label">Gear progression targets - ${label}</div>
                 <div class="gear-table-wrap">
                 <table class="gear-table">
-                <thead><tr><th>Slot</th>${stages.map(([,l]) => `<th>${l}</th>`).join('')}</tr></thead>
+                <thead><tr><th>Slot</th>${gear.stages.map(({ label }) => `<th>${label}</th>`).join('')}</tr></thead>
                 <tbody>${rows}</tbody>
                 </table>
                 </div>`;
@@ -150,6 +133,10 @@
         let clogCategories = null;
         let diaryTasksData = null;
         let wikiCompData = null;
+        let progressionData = null;   // per-account progression.json (build_progression.py)
+        let timelineData = null;      // per-account timeline/index.json (update_stats.py)
+        let targetsClogData = null;   // per-account targets_clog.json (build_targets.py)
+        let targetsCAData = null;     // per-account targets_ca.json (build_targets.py)
         let wikiCATableData = null;
         let milestonesData = null;
 
@@ -159,6 +146,111 @@
         // from the browser was removed: it is blocked by CORS, and when it did run
         // it discarded the manual dates.
 
+        // Generated files may be written in the compact encoding from
+        // scripts/compact_json.py (OSRS_COMPACT_JSON=1): a shared string table,
+        // day-number dates and column/row tables. Expand it back to the normal
+        // shape; plain JSON passes through untouched.
+        function decodeCompact(obj) {
+            if (!obj || typeof obj !== 'object' || !('$compact' in obj)) return obj;
+            if (obj.$compact !== 1) throw new Error(`unsupported compact JSON version ${obj.$compact}`);
+            const strings = obj.strings;
+            const day = n => new Date(n * 86400000).toISOString().slice(0, 10);
+            const cell = (code, v) => v === null ? null
+                : code === 's' ? strings[v] : code === 'd' ? day(v) : expand(v);
+            function expand(node) {
+                if (Array.isArray(node)) return node.map(expand);
+                if (!node || typeof node !== 'object') return node;
+                if ('$s' in node && Object.keys(node).length === 1) return node.$s.map(i => strings[i]);
+                if ('$t' in node && '$r' in node) {
+                    const cols = node.$t, codes = node.$c;
+                    return node.$r.map(row => {
+                        const out = {};
+                        cols.forEach((c, i) => { out[c] = cell(codes[i], row[i]); });
+                        return out;
+                    });
+                }
+                const out = {};
+                for (const [k, v] of Object.entries(node)) out[k] = expand(v);
+                return out;
+            }
+            return expand(obj.data);
+        }
+
+        // The published site carries asset-manifest.json (scripts/publish_site.py)
+        // mapping each data file to a content-hashed copy that can be cached
+        // forever. Only the manifest is revalidated; without one (a local
+        // checkout) URLs are used as-is.
+        const assetManifest = fetch('asset-manifest.json', { cache: 'no-cache' })
+            .then(r => r.ok ? r.json() : null)
+            .then(m => m?.assets || {})
+            .catch(() => ({}));
+
+        async function assetUrl(url) {
+            const logical = url.replace(/^\.\//, '');
+            const hashed = (await assetManifest)[logical];
+            return hashed ? `./${hashed}` : url;
+        }
+
+        // Fetch a generated JSON file; null if it's missing or unreadable.
+        async function fetchJson(url) {
+            return fetch(await assetUrl(url)).then(r => r.ok ? r.json() : null).then(decodeCompact).catch(() => null);
+        }
+
+        // Fetch a data text file (YAML); null if it's missing.
+        async function fetchText(url) {
+            return fetch(await assetUrl(url)).then(r => r.ok ? r.text() : null).catch(() => null);
+        }
+
+        // Everything loadData needs, keyed like data/<account>/dashboard.json.
+        // build_dashboard_bundle.py compiles that file in CI with the YAML already
+        // parsed, so a normal load is a single request. Without it (an older
+        // checkout, or opening index.html before running the build) fall back to
+        // fetching and parsing the individual files.
+        const DASHBOARD_BUNDLE_VERSION = 3;
+
+        async function loadAccountBundle(D) {
+            const bundle = await fetchJson(`${D}/dashboard.json`);
+            if (bundle?.version === DASHBOARD_BUNDLE_VERSION) return bundle;
+
+            const [skills, bosses, clues, collection_log_index, combat_achievements, pets, quests, progression, timeline_index, diariesRes, dropsRes, clogCatRes, diaryTasksRes] = await Promise.all([
+                fetchJson(`${D}/skills.json`),
+                fetchJson(`${D}/bosses.json`),
+                fetchJson(`${D}/clues.json`),
+                fetchJson(`${D}/collection_log/index.json`),
+                fetchJson(`${D}/combat_achievements.json`),
+                fetchJson(`${D}/pets.json`),
+                fetchJson(`${D}/quests.json`),
+                fetchJson(`${D}/progression.json`),
+                fetchJson(`${D}/timeline/index.json`),
+                fetchText(`${D}/diaries.yaml`),
+                fetchText(`${D}/drops.yaml`),
+                fetchText(`${D}/clog_categories.yaml`),
+                fetchText(`${D}/diary_tasks.yaml`)
+            ]);
+            // Data built before the collection log was sharded only has the full file.
+            const collection_log = collection_log_index ? null
+                : await fetchJson(`${D}/collection_log.json`);
+            return {
+                skills, bosses, clues, collection_log_index, collection_log, combat_achievements, pets, quests, progression, timeline_index,
+                diaries: diariesRes ? parseDiariesYaml(diariesRes) : null,
+                drops: dropsRes ? parseDropsYaml(dropsRes) : null,
+                clog_categories: clogCatRes ? parseClogCategories(clogCatRes) : null,
+                diary_tasks: parseDiaryTasks(diaryTasksRes),
+            };
+        }
+
+        // Parse data/<account>/clog_categories.yaml ("Bosses: 115/333") -> [{ name, obtained, total }].
+        function parseClogCategories(text) {
+            return text.split('\n')
+                .map(l => l.trim())
+                .filter(l => l && !l.startsWith('#') && l.includes(':'))
+                .map(l => {
+                    const [name, val] = l.split(':');
+                    const [obt, tot] = (val || '').split('/').map(n => parseInt(n.trim(), 10) || 0);
+                    return { name: name.trim(), obtained: obt, total: tot };
+                });
+        }
+
         async function loadData() {
             const D = currentAccount.dir;  // account-specific data folder
 
@@ -166,36 +258,20 @@
             // missing a data file shows "—"/empty rather than the prior account's values.
             clogData = caData = petsData = cluesData = questsData = diariesData = null;
             skillsData = bossesData = milestonesData = clogCategories = null;
-            diaryTasksData = null;
+            diaryTasksData = progressionData = timelineData = targetsClogData = targetsCAData = null;
             dropsData = [];
             ['totalLevel', 'totalXp', 'combatLevel', 'count99s', 'overallRank', 'clogCount', 'caTasks',
              'petCount', 'clueCount', 'bossKcCard', 'questCount', 'diaryCount']
                 .forEach(id => { const el = document.getElementById(id); if (el) el.textContent = '—'; });
-            const [skillsRes, bossesRes, cluesRes, clogRes, caRes, petsRes, questsRes, diariesRes, dropsRes, clogCatRes, diaryTasksRes] = await Promise.all([
-                fetch(`${D}/skills.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/bosses.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/clues.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/collection_log.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/combat_achievements.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/pets.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/quests.json`).then(r=>r.json()).catch(()=>null),
-                fetch(`${D}/diaries.yaml`).then(r=>r.text()).catch(()=>null),
-                fetch(`${D}/drops.yaml`).then(r=>r.text()).catch(()=>null),
-                fetch(`${D}/clog_categories.yaml`).then(r=>r.ok?r.text():null).catch(()=>null),
-                fetch(`${D}/diary_tasks.yaml`).then(r=>r.ok?r.text():null).catch(()=>null)
-            ]);
-            diaryTasksData = parseDiaryTasks(diaryTasksRes);
-
-            if (clogCatRes) {
-                clogCategories = clogCatRes.split('\n')
-                    .map(l => l.trim())
-                    .filter(l => l && !l.startsWith('#') && l.includes(':'))
-                    .map(l => {
-                        const [name, val] = l.split(':');
-                        const [obt, tot] = (val || '').split('/').map(n => parseInt(n.trim(), 10) || 0);
-                        return { name: name.trim(), obtained: obt, total: tot };
-                    });
-            }
+            const b = await loadAccountBundle(D);
+            const clogRes = b.collection_log_index || b.collection_log;
+            const { skills: skillsRes, bosses: bossesRes, clues: cluesRes,
+                    combat_achievements: caRes, pets: petsRes, quests: questsRes,
+                    diaries: diariesRes, drops: dropsRes } = b;
+            diaryTasksData = b.diary_tasks;
+            clogCategories = b.clog_categories;
+            progressionData = b.progression || null;
+            timelineData = b.timeline_index?.timeline || null;
 
             if (skillsRes?.rsn) {
                 document.getElementById('playerName').textContent = skillsRes.rsn;
@@ -214,7 +290,9 @@
             if (clogRes?.collection_log) {
                 clogData = clogRes.collection_log;
                 clogData.rsn = clogRes.rsn || 'FoolinSlays';
-                clogData.collections = mergeClogCollections(clogData.collections);
+                clogData.collections = clogData.categories
+                    ? clogGroupsFromIndex(clogData.categories)
+                    : mergeClogCollections(clogData.collections);
                 document.getElementById('clogCount').textContent = `${clogData.total_obtained}/${clogData.total_items}`;
             }
 
@@ -256,10 +334,12 @@
             renderQuests();
             renderDiaries(diariesRes);
             renderDrops(dropsRes);
-            // Targets reference data (wiki_comp_rates/wiki_ca_table) is loaded
-            // lazily on first Targets-tab open — see ensureTargetsData().
-            renderTargets();
+            // Targets data is loaded lazily on first Targets-tab open — see
+            // ensureTargetsData(). Once it has been, reload it for the new account.
+            if (targetsDataLoaded) loadTargetsData();
+            else renderTargets();
             renderProgress();
+            renderProgression(progressionData);
             applyGearAccountView();
         }
 
@@ -281,7 +361,18 @@
             const TIER_PTS = { Easy: 1, Medium: 2, Hard: 3, Elite: 4, Master: 5, Grandmaster: 6 };
             const clog = {}, ca = {}, caPts = {}, drop = {};
 
-            if (clogData?.collections) {
+            // Prebuilt by update_stats.py (timeline/index.json): per-month counts,
+            // collection-log items deduplicated across the slots they fill.
+            const tlMonths = timelineData?.months;
+            if (tlMonths) {
+                for (const [k, m] of Object.entries(tlMonths)) {
+                    if (m.counts.clog) clog[k] = m.counts.clog;
+                    if (m.counts.ca) { ca[k] = m.counts.ca; caPts[k] = m.counts.ca_points; }
+                    if (m.counts.drop) drop[k] = m.counts.drop;
+                }
+            } else if (clogData?.obtained_by_month) {
+                Object.assign(clog, clogData.obtained_by_month);
+            } else if (clogData?.collections) {
                 for (const coll of Object.values(clogData.collections)) {
                     for (const it of (coll.obtained || [])) {
                         const k = ymKey(it.date);
@@ -289,7 +380,7 @@
                     }
                 }
             }
-            if (caData?.tiers) {
+            if (!tlMonths && caData?.tiers) {
                 for (const [tier, t] of Object.entries(caData.tiers)) {
                     for (const task of (t.completed || [])) {
                         const k = ymKey(task.date);
@@ -297,7 +388,7 @@
                     }
                 }
             }
-            for (const d of (dropsData || [])) {
+            for (const d of (tlMonths ? [] : (dropsData || []))) {
                 const k = ymKey(d.date);
                 if (k) drop[k] = (drop[k] || 0) + 1;
             }
@@ -332,16 +423,42 @@
                 </div>`;
 
             html += [...months].reverse().map(m => `
-                <div class="prog-row">
+                <div class="prog-row${tlMonths?.[m] ? ' has-entries' : ''}" data-month="${m}">
                     <div class="prog-month">${label(m)}</div>
                     <div class="prog-bars">
                         <div class="prog-line">${bar(clog[m] || 0, maxClog, 'clog')}</div>
                         <div class="prog-line">${bar(ca[m] || 0, maxCa, 'ca')}</div>
                         <div class="prog-line">${bar(drop[m] || 0, maxDrop, 'drop')}</div>
                     </div>
-                </div>`).join('');
+                </div>
+                <div class="prog-entries" data-entries="${m}" hidden></div>`).join('');
 
             container.innerHTML = html;
+            container.querySelectorAll('.prog-row.has-entries').forEach(row =>
+                row.addEventListener('click', () => toggleTimelineMonth(row.dataset.month)));
+        }
+
+        // Expand one Progress-tab month into what was obtained, fetching that
+        // month's timeline file the first time it is opened.
+        const TIMELINE_SOURCE_LABELS = { clog: 'Collection log', ca: 'Combat achievement', pet: 'Pet', drop: 'Drop' };
+        async function toggleTimelineMonth(month) {
+            const box = document.querySelector(`#progressContainer .prog-entries[data-entries="${month}"]`);
+            const meta = timelineData?.months?.[month];
+            if (!box || !meta) return;
+            box.hidden = !box.hidden;
+            if (box.hidden || box.dataset.loaded) return;
+            box.textContent = 'Loading…';
+            const D = currentAccount.dir;
+            const res = await fetchJson(`${D}/timeline/${meta.file}`);
+            if (D !== currentAccount.dir) return;
+            box.dataset.loaded = '1';
+            const entries = res?.entries || [];
+            box.innerHTML = entries.length ? entries.map(e => `
+                <div class="prog-entry prog-entry-${e.source}">
+                    <span class="prog-entry-date">${formatShortDate(e.date)}</span>
+                    <span class="prog-entry-name">${escapeTargets(e.name)}</span>
+                    <span class="prog-entry-detail">${escapeTargets(TIMELINE_SOURCE_LABELS[e.source] || e.source)}${e.detail ? ' · ' + escapeTargets(e.detail) : ''}</span>
+                </div>`).join('') : '<div class="empty-state">Nothing recorded.</div>';
         }
 
         function renderSkills(skills) {
@@ -384,74 +501,95 @@
             }
         }
 
-        // Ranks tab. Unlike every other tab this one is cross-account: it fetches
-        // skills.json for *both* accounts once and compares them side by side, so
-        // it does not reset when you switch accounts.
+        // Ranks tab. Unlike every other tab this one is cross-account: it reads
+        // data/ranks.json, which update_stats.py rebuilds from every configured
+        // account's skills.json with the best rank per row already marked, so it
+        // does not reset when you switch accounts.
         let ranksData = null;
 
         async function ensureRanksData() {
             if (ranksData) return;
-            ranksData = await Promise.all(ACCOUNTS.map(a =>
-                fetch(`${a.dir}/skills.json`).then(r => r.json()).catch(() => null)
-            ));
+            ranksData = await fetchJson('./data/ranks.json')
+                || ranksFromSkills(await Promise.all(ACCOUNTS.map(a => fetchJson(`${a.dir}/skills.json`))));
             renderRanks();
         }
 
+        // Fallback for data built before ranks.json existed: the same shape,
+        // assembled from each account's skills.json.
+        function ranksFromSkills(payloads) {
+            // Lower rank number = better. Only mark a winner when at least two
+            // accounts are actually ranked in that skill.
+            const best = cells => {
+                const ranked = cells.map((c, i) => [c?.rank, i]).filter(([r]) => r != null && r >= 0)
+                    .sort((a, b) => a[0] - b[0]);
+                return ranked.length >= 2 && ranked[0][0] !== ranked[1][0] ? ranked[0][1] : null;
+            };
+            const skills = {};
+            for (const name of ['Overall', ...SKILL_ORDER]) {
+                const cells = payloads.map(p => p?.skills?.[name] || null);
+                skills[name] = { accounts: cells, best: best(cells) };
+            }
+            return {
+                accounts: ACCOUNTS.map((a, i) => ({
+                    id: a.id, label: a.label,
+                    total_level: payloads[i]?.milestones?.total_level,
+                    total_xp: payloads[i]?.milestones?.total_xp,
+                })),
+                skills,
+            };
+        }
+
         function renderRanks() {
             const heroes = document.getElementById('rankHeroes');
             const table = document.getElementById('rankSkills');
             if (!heroes || !table) return;
             if (!ranksData) { table.textContent = 'Loading...'; return; }
 
-            heroes.innerHTML = ACCOUNTS.map((a, i) => {
-                const res = ranksData[i];
-                const overall = res?.skills?.Overall;
-                const m = res?.milestones;
+            const accounts = ranksData.accounts;
+            const row = name => ranksData.skills[name] || { accounts: accounts.map(() => null), best: null };
+
+            heroes.innerHTML = accounts.map((a, i) => {
+                const meta = ACCOUNTS.find(x => x.id === a.id) || ACCOUNTS[0];
+                const overall = row('Overall').accounts[i];
                 return `<div class="rank-hero${a.id === currentAccount.id ? ' current' : ''}">
                     <div class="rank-hero-head">
-                        <img src="${a.badge}" alt="${a.type}" class="iron-icon">
+                        <img src="${meta.badge}" alt="${meta.type}" class="iron-icon">
                         <span class="rank-hero-name">${a.label}</span>
                     </div>
                     <div class="rank-hero-value">${formatRank(overall?.rank)}</div>
                     <div class="rank-hero-sub">
-                        ${m?.total_level?.toLocaleString() || '—'} total &middot; ${formatNumber(m?.total_xp || 0)} XP
+                        ${a.total_level?.toLocaleString() || '—'} total &middot; ${formatNumber(a.total_xp || 0)} XP
                     </div>
                 </div>`;
             }).join('');
 
-            // Lower rank number = better. Only mark a winner when both accounts
-            // are actually ranked in that skill.
-            const better = (a, b) => (a != null && a >= 0 && b != null && b >= 0) ? (a < b ? 0 : b < a ? 1 : -1) : -1;
-
             const rows = SKILL_ORDER.map(name => {
-                const cells = ranksData.map(res => res?.skills?.[name] || null);
-                const win = better(cells[0]?.rank, cells[1]?.rank);
+                const { accounts: cells, best } = row(name);
                 return `<tr>
                     <td class="rank-skill-name">
                         <img src="${SKILL_ICONS[name]}" alt="${name}" class="rank-skill-icon">${name}
                     </td>
                     ${cells.map((s, i) => `
                         <td class="rank-lvl">${s?.level ?? '—'}</td>
-                        <td class="rank-val${win === i ? ' best' : ''}">${formatRank(s?.rank)}</td>
+                        <td class="rank-val${best === i ? ' best' : ''}">${formatRank(s?.rank)}</td>
                     `).join('')}
                 </tr>`;
             }).join('');
 
-            const overallCells = ranksData.map(res => res?.skills?.Overall || null);
-            const overallWin = better(overallCells[0]?.rank, overallCells[1]?.rank);
+            const overall = row('Overall');
 
             table.innerHTML = `<h3>🏅 Rank by Skill</h3>
                 <div class="rank-table-wrap"><table class="rank-table">
                     <thead>
-                        <tr><th rowspan="2">Skill</th>${ACCOUNTS.map(a => `<th colspan="2">${a.label}</th>`).join('')}</tr>
-                        <tr>${ACCOUNTS.map(() => '<th>Lvl</th><th>Rank</th>').join('')}</tr>
+                        <tr><th rowspan="2">Skill</th>${accounts.map(a => `<th colspan="2">${a.label}</th>`).join('')}</tr>
+                        <tr>${accounts.map(() => '<th>Lvl</th><th>Rank</th>').join('')}</tr>
                     </thead>
                     <tbody>
                         <tr class="rank-overall">
                             <td class="rank-skill-name">Overall</td>
-                            ${overallCells.map((s, i) => `
+                            ${overall.accounts.map((s, i) => `
                                 <td class="rank-lvl">${s?.level?.toLocaleString() ?? '—'}</td>
-                                <td class="rank-val${overallWin === i ? ' best' : ''}">${formatRank(s?.rank)}</td>
+                                <td class="rank-val${overall.best === i ? ' best' : ''}">${formatRank(s?.rank)}</td>
                             `).join('')}
                         </tr>
                         ${rows}
@@ -558,6 +696,43 @@
             return merged;
         }
 
+        // collection_log/index.json only carries per-group counts and the shard file
+        // holding each group's items; obtained/missing stay undefined until
+        // ensureClogShards() has fetched that group.
+        function clogGroupsFromIndex(categories) {
+            const groups = {};
+            for (const [name, c] of Object.entries(categories || {})) {
+                groups[name] = { obtained_count: c.obtained_count, total_count: c.total_count, shard: c.shard };
+            }
+            return groups;
+        }
+
+        function clogGroupLoaded(coll) {
+            return Array.isArray(coll?.obtained);
+        }
+
+        // Fetch the shards for the named collection-log groups that aren't loaded yet.
+        async function ensureClogShards(names) {
+            if (!clogData?.collections) return;
+            const D = currentAccount.dir;
+            const colls = clogData.collections;
+            const todo = names.filter(n => colls[n] && !clogGroupLoaded(colls[n]) && colls[n].shard);
+            if (!todo.length) return;
+            const shards = await Promise.all(todo.map(n =>
+                fetchJson(`${D}/collection_log/${colls[n].shard}`)
+            ));
+            if (colls !== clogData?.collections) return;  // account switched mid-fetch
+            todo.forEach((n, i) => {
+                const g = shards[i]?.collection;
+                colls[n].obtained = g?.obtained || [];
+                colls[n].missing = g?.missing || [];
+            });
+        }
+
+        function ensureAllClogShards() {
+            return ensureClogShards(Object.keys(clogData?.collections || {}));
+        }
+
         function renderCollectionLog(searchTerm = '', statusFilter = 'all') {
             const container = document.getElementById('clogContainer');
             if (!clogData) {
@@ -732,44 +907,88 @@
             renderClogList(searchTerm, statusFilter);
         }
 
+        let clogListFilter = { search: '', status: 'all' };
+
+        // Items of one group that pass the current search/status filter.
+        function clogListItems(collName, coll, search, statusFilter) {
+            let obtained = coll.obtained || [];
+            let missing = coll.missing || [];
+
+            if (search) {
+                if (!collName.toLowerCase().includes(search)) {
+                    obtained = obtained.filter(i => (i.name || i).toLowerCase().includes(search));
+                    missing = missing.filter(i => (i.name || i).toLowerCase().includes(search));
+                }
+            }
+
+            let items = [];
+            if (statusFilter === 'all' || statusFilter === 'obtained') {
+                items = items.concat(obtained.map(i => ({ name: i.name || i, date: i.date, obtained: true })));
+            }
+            if (statusFilter === 'all' || statusFilter === 'missing') {
+                items = items.concat(missing.map(i => ({ name: i.name || i, obtained: false })));
+            }
+            return items;
+        }
+
+        function clogItemsHtml(items) {
+            return items.map(i => `<div class="item ${i.obtained ? 'obtained' : 'missing'}">
+                <span class="item-check">${i.obtained ? '✓' : '○'}</span>
+                <span class="item-name">${escapeTargets(i.name)}</span>
+                ${i.date ? `<span class="item-date">${formatShortDate(i.date)}</span>` : ''}
+            </div>`).join('');
+        }
+
+        // Expand/collapse a group, fetching its shard the first time it opens.
+        async function toggleClogCollection(header) {
+            const el = header.parentElement;
+            el.classList.toggle('expanded');
+            const name = el.dataset.coll;
+            const coll = clogData?.collections?.[name];
+            if (!el.classList.contains('expanded') || !coll || clogGroupLoaded(coll)) return;
+            await ensureClogShards([name]);
+            const items = clogListItems(name, coll, clogListFilter.search, clogListFilter.status);
+            el.querySelector('.item-list').innerHTML = clogItemsHtml(items);
+        }
+
         function renderClogList(searchTerm, statusFilter) {
             const list = document.getElementById('clogList');
             const search = searchTerm.toLowerCase();
+            clogListFilter = { search, status: statusFilter };
+            const collections = Object.entries(clogData.collections);
+
+            // Searching needs every item name, so pull in the remaining shards first.
+            if (search && collections.some(([, c]) => !clogGroupLoaded(c))) {
+                list.innerHTML = '<div class="empty-state">Loading collection log…</div>';
+                ensureAllClogShards().then(() => {
+                    if (clogListFilter.search === search) renderClogList(searchTerm, statusFilter);
+                });
+                return;
+            }
+
             let html = '';
 
-            for (const [collName, coll] of Object.entries(clogData.collections).sort((a,b) => a[0].localeCompare(b[0]))) {
-                let obtained = coll.obtained || [];
-                let missing = coll.missing || [];
-                
-                if (search) {
-                    if (!collName.toLowerCase().includes(search)) {
-                        obtained = obtained.filter(i => (i.name || i).toLowerCase().includes(search));
-                        missing = missing.filter(i => (i.name || i).toLowerCase().includes(search));
-                    }
-                }
-                
+            for (const [collName, coll] of collections.sort((a,b) => a[0].localeCompare(b[0]))) {
+                const loaded = clogGroupLoaded(coll);
                 let items = [];
-                if (statusFilter === 'all' || statusFilter === 'obtained') {
-                    items = items.concat(obtained.map(i => ({ name: i.name || i, date: i.date, obtained: true })));
-                }
-                if (statusFilter === 'all' || statusFilter === 'missing') {
-                    items = items.concat(missing.map(i => ({ name: i.name || i, obtained: false })));
+                if (loaded) {
+                    items = clogListItems(collName, coll, search, statusFilter);
+                    if (items.length === 0) continue;
+                } else {
+                    // Not fetched yet: decide visibility from the index counts.
+                    const nMissing = coll.total_count - coll.obtained_count;
+                    if (statusFilter === 'obtained' && !coll.obtained_count) continue;
+                    if (statusFilter === 'missing' && !nMissing) continue;
                 }
                 
-                if (items.length === 0) continue;
-                
-                html += `<div class="collection">
-                    <div class="collection-header" onclick="this.parentElement.classList.toggle('expanded')">
+                html += `<div class="collection" data-coll="${escapeTargets(collName)}">
+                    <div class="collection-header" onclick="toggleClogCollection(this)">
                         <span class="collection-name">${escapeTargets(collName)}</span>
                         <span class="collection-count"><span class="obtained">${coll.obtained_count}</span> <span class="total">/ ${coll.total_count}</span></span>
                     </div>
                     <div class="collection-items">
                         <div class="item-list">
-                            ${items.map(i => `<div class="item ${i.obtained ? 'obtained' : 'missing'}">
-                                <span class="item-check">${i.obtained ? '✓' : '○'}</span>
-                                <span class="item-name">${escapeTargets(i.name)}</span>
-                                ${i.date ? `<span class="item-date">${formatShortDate(i.date)}</span>` : ''}
-                            </div>`).join('')}
+                            ${loaded ? clogItemsHtml(items) : '<div class="empty-state">Loading…</div>'}
                         </div>
                     </div>
                 </div>`;
@@ -1227,20 +1446,8 @@
             }).join('');
         }
 
-        function renderDiaries(yaml) {
-            const container = document.getElementById('diariesContainer');
-            if (!yaml) {
-                container.innerHTML = '<div class="empty-state">No diary data yet.</div>';
-                document.getElementById('diaryCount').textContent = '—';
-                return;
-            }
-            // Total diary tasks per region (OSRS Wiki counts; sums to 492).
-            const REGION_TASK_TOTALS = {
-                'Ardougne': 38, 'Desert': 33, 'Falador': 35, 'Fremennik': 39,
-                'Kandarin': 39, 'Karamja': 54, 'Kourend & Kebos': 46,
-                'Lumbridge & Draynor': 40, 'Morytania': 38, 'Varrock': 42,
-                'Western Provinces': 37, 'Wilderness': 51
-            };
+        // Parse data/<account>/diaries.yaml -> { regions: { region: { tier: value|null } }, tasks_completed, tasks_total }.
+        function parseDiariesYaml(yaml) {
             const regions = {};
             let currentRegion = null;
 
@@ -1275,6 +1482,26 @@
                     }
                 }
             });
+            return { regions, tasks_completed: tasksCompleted, tasks_total: tasksTotal };
+        }
+
+        function renderDiaries(diaries) {
+            const container = document.getElementById('diariesContainer');
+            if (!diaries) {
+                container.innerHTML = '<div class="empty-state">No diary data yet.</div>';
+                document.getElementById('diaryCount').textContent = '—';
+                return;
+            }
+            // Total diary tasks per region (OSRS Wiki counts; sums to 492).
+            const REGION_TASK_TOTALS = {
+                'Ardougne': 38, 'Desert': 33, 'Falador': 35, 'Fremennik': 39,
+                'Kandarin': 39, 'Karamja': 54, 'Kourend & Kebos': 46,
+                'Lumbridge & Draynor': 40, 'Morytania': 38, 'Varrock': 42,
+                'Western Provinces': 37, 'Wilderness': 51
+            };
+            const regions = diaries.regions;
+            let tasksCompleted = diaries.tasks_completed;
+            let tasksTotal = diaries.tasks_total;
             
             // Calculate tier stats
             const tiers = ['easy', 'medium', 'hard', 'elite'];
@@ -1477,15 +1704,15 @@
             tab.innerHTML = 'Drops' + (count ? ` <span class="tab-badge">${count}</span>` : '');
         }
 
-        function renderDrops(yaml) {
+        function renderDrops(drops) {
             const container = document.getElementById('dropsContainer');
-            if (!yaml) {
+            if (!drops) {
                 dropsData = [];
                 container.innerHTML = '<div class="empty-state">No drops logged yet.</div>';
                 updateDropsBadge();
                 return;
             }
-            dropsData = parseDropsYaml(yaml);
+            dropsData = drops;
             const toLogBanner = buildDropsToLogBanner();
             updateDropsBadge();
 
@@ -1673,177 +1900,51 @@
             `).join('');
         }
 
-        // Progression Tab
-        function renderProgression(dropsYaml) {
+        // Progression milestones (Gearing tab). The milestone definitions are data
+        // in osrs_config.PROGRESSION_PHASES; build_progression.py evaluates them
+        // against the account's data in CI, so this only renders progression.json.
+        function renderProgression(progression) {
             const container = document.getElementById('progressionContainer');
-            const drops = dropsYaml ? parseDropsYaml(dropsYaml) : [];
-            
-            // Helper to check if we have a drop
-            const hasDrop = (itemName) => drops.some(d => d.item.toLowerCase().includes(itemName.toLowerCase()));
-            const hasAnyDrop = (itemNames) => itemNames.some(n => hasDrop(n));
-            
-            // Helper to check skill level
-            const skillLevel = (name) => skillsData?.[name]?.level || 1;
-            const hasSkillLevel = (name, level) => skillLevel(name) >= level;
-            
-            // Helper to check boss KC
-            const bossKc = (name) => {
-                if (!bossesData) return 0;
-                const boss = Object.entries(bossesData).find(([k]) => k.toLowerCase().includes(name.toLowerCase()));
-                return boss ? boss[1].kc : 0;
-            };
-            const hasBossKc = (name, kc) => bossKc(name) >= kc;
-            
-            // Helper to check quest completion
-            const hasQuest = (name) => {
-                if (!questsData?.categories) return false;
-                const nameLower = name.toLowerCase();
-                for (const cat of Object.values(questsData.categories)) {
-                    if (cat.completed) {
-                        const found = cat.completed.some(q => {
-                            const questName = typeof q === 'string' ? q : q.name;
-                            return questName.toLowerCase().includes(nameLower);
-                        });
-                        if (found) return true;
-                    }
-                }
-                return false;
-            };
-
-            // Define milestones for each phase
-            const phases = [
-                {
-                    name: 'Early Game',
-                    phase: 'early',
-                    icon: '🌱',
-                    description: 'Building your foundation',
-                    milestones: [
-                        { name: 'Fire Cape', detail: 'Fight Caves', check: () => hasDrop('Fire Cape'), type: 'drop' },
-                        { name: 'Barrows Gloves', detail: 'Recipe for Disaster', check: () => hasQuest('Recipe for Disaster'), type: 'quest' },
-                        { name: 'Fighter Torso', detail: 'Barbarian Assault', check: () => hasDrop('Fighter Torso') || true, type: 'gear' },
-                        { name: 'Dragon Defender', detail: 'Warriors Guild', check: () => hasDrop('Dragon Defender') || hasSkillLevel('Attack', 70), type: 'gear' },
-                        { name: 'Iban\'s Staff', detail: 'Underground Pass', check: () => hasQuest('Underground Pass') || true, type: 'quest' },
-                        { name: 'Berserker Ring', detail: 'Dagannoth Rex', check: () => hasDrop('Berserker Ring'), type: 'drop' },
-                        { name: '70 Prayer', detail: 'Piety unlocked', check: () => hasSkillLevel('Prayer', 70), type: 'skill' },
-                        { name: '75 Magic', detail: 'Trident access', check: () => hasSkillLevel('Magic', 75), type: 'skill' },
-                        { name: 'Full Barrows Set', detail: 'Any brother', check: () => drops.filter(d => d.boss === 'Barrows').length >= 4, type: 'drop' },
-                        { name: 'Quest Cape', detail: 'All quests done', check: () => questsData?.total_completed >= 158, type: 'quest' },
-                    ]
-                },
-                {
-                    name: 'Mid Game',
-                    phase: 'mid',
-                    icon: '⚔️',
-                    description: 'Gearing up for end game',
-                    milestones: [
-                        { name: 'Trident of the Seas', detail: 'Kraken', check: () => hasDrop('Trident') || hasBossKc('Kraken', 50), type: 'drop' },
-                        { name: 'Abyssal Whip', detail: 'Abyssal Demons', check: () => hasDrop('Abyssal Whip'), type: 'drop' },
-                        { name: 'Dragon Warhammer', detail: 'Lizardman Shamans', check: () => hasDrop('Dragon Warhammer'), type: 'drop' },
-                        { name: 'Zenyte Jewelry', detail: 'Demonic Gorillas', check: () => hasDrop('Zenyte'), type: 'drop' },
-                        { name: 'Occult Necklace', detail: 'Smoke Devils', check: () => hasDrop('Occult') || hasSkillLevel('Slayer', 93), type: 'drop' },
-                        { name: '87 Slayer', detail: 'Kraken unlocked', check: () => hasSkillLevel('Slayer', 87), type: 'skill' },
-                        { name: '91 Slayer', detail: 'Cerberus unlocked', check: () => hasSkillLevel('Slayer', 91), type: 'skill' },
-                        { name: 'Elite Void', detail: 'Pest Control + diaries', check: () => true, type: 'gear' },
-                        { name: 'Dragon Pickaxe', detail: 'Wildy bosses', check: () => hasDrop('Dragon Pickaxe'), type: 'drop' },
-                        { name: 'Imbued Heart', detail: 'Superior Slayer', check: () => hasDrop('Imbued Heart'), type: 'drop' },
-                    ]
-                },
-                {
-                    name: 'Late Game',
-                    phase: 'late',
-                    icon: '🔮',
-                    description: 'High-level PvM unlocks',
-                    milestones: [
-                        { name: 'Blade of Saeldor', detail: 'Corrupted Gauntlet', check: () => hasDrop('Enhanced crystal weapon seed') || hasDrop('Blade of Saeldor'), type: 'drop' },
-                        { name: 'Bowfa', detail: 'Corrupted Gauntlet', check: () => hasDrop('Enhanced crystal weapon seed'), type: 'drop' },
-                        { name: 'Full Crystal Armor', detail: '6 armor seeds', check: () => drops.filter(d => d.item.includes('Crystal armour seed')).length >= 6, type: 'drop' },
-                        { name: 'Primordial Boots', detail: 'Cerberus', check: () => hasDrop('Primordial crystal'), type: 'drop' },
-                        { name: 'Pegasian Boots', detail: 'Cerberus', check: () => hasDrop('Pegasian crystal'), type: 'drop' },
-                        { name: 'Eternal Boots', detail: 'Cerberus', check: () => hasDrop('Eternal crystal'), type: 'drop' },
-                        { name: 'Infernal Cape', detail: 'The Inferno', check: () => hasDrop('Infernal Cape'), type: 'drop' },
-                        { name: 'Tormented Bracelet', detail: 'Zenyte + enchant', check: () => drops.filter(d => d.item.includes('Zenyte')).length >= 2, type: 'gear' },
-                        { name: 'Necklace of Anguish', detail: 'Zenyte + enchant', check: () => drops.filter(d => d.item.includes('Zenyte')).length >= 3, type: 'gear' },
-                        { name: '95+ Slayer', detail: 'Hydra unlocked', check: () => hasSkillLevel('Slayer', 95), type: 'skill' },
-                    ]
-                },
-                {
-                    name: 'End Game',
-                    phase: 'end',
-                    icon: '👑',
-                    description: 'Ultimate goals',
-                    milestones: [
-                        { name: 'Twisted Bow', detail: 'Chambers of Xeric', check: () => hasDrop('Twisted Bow'), type: 'drop' },
-                        { name: 'Scythe of Vitur', detail: 'Theatre of Blood', check: () => hasDrop('Scythe'), type: 'drop' },
-                        { name: 'Tumeken\'s Shadow', detail: 'Tombs of Amascut', check: () => hasDrop('Tumeken'), type: 'drop' },
-                        { name: 'Torva Armor', detail: 'Nex', check: () => hasAnyDrop(['Torva platebody', 'Torva platelegs', 'Torva helm']), type: 'drop' },
-                        { name: 'Masori Armor', detail: 'Tombs of Amascut', check: () => hasAnyDrop(['Masori body', 'Masori chaps', 'Masori mask']), type: 'drop' },
-                        { name: 'Max Cape', detail: 'All 99s', check: () => skillsData && Object.values(skillsData).every(s => s.level >= 99), type: 'skill' },
-                        { name: 'Grandmaster CAs', detail: 'All GM tasks', check: () => caData?.tiers?.Grandmaster?.completed === caData?.tiers?.Grandmaster?.total, type: 'achievement' },
-                        { name: 'All Pets', detail: 'Gotta catch em all', check: () => petsData?.total_obtained >= 50, type: 'collection' },
-                        { name: 'Completionist', detail: 'Collection log', check: () => clogData?.total_obtained >= 1400, type: 'collection' },
-                        { name: 'All Hard Diaries', detail: 'Every region', check: () => true, type: 'achievement' },
-                    ]
-                }
-            ];
-
-            // Calculate stats
-            let totalMilestones = 0;
-            let completedMilestones = 0;
-            phases.forEach(phase => {
-                phase.milestones.forEach(m => {
-                    totalMilestones++;
-                    m.complete = m.check();
-                    if (m.complete) completedMilestones++;
-                });
-                phase.completed = phase.milestones.filter(m => m.complete).length;
-                phase.total = phase.milestones.length;
-                phase.percent = Math.round((phase.completed / phase.total) * 100);
-            });
-
-            // Determine current phase
-            let currentPhase = 'Early Game';
-            if (phases[0].percent >= 80) currentPhase = 'Mid Game';
-            if (phases[1].percent >= 80) currentPhase = 'Late Game';
-            if (phases[2].percent >= 80) currentPhase = 'End Game';
-
-            const overallPercent = Math.round((completedMilestones / totalMilestones) * 100);
+            if (!container) return;
+            if (!progression?.phases) { container.innerHTML = ''; return; }
 
             const getTypeIcon = (type) => {
                 const icons = { drop: '💎', skill: '📊', quest: '📜', gear: '🛡️', achievement: '🏆', collection: '📚' };
                 return icons[type] || '✓';
             };
+            const stats = progression.stats || {};
 
             container.innerHTML = `
                 <div class="progression-header">
-                    <h2>Ironman Progression</h2>
-                    <p>Currently in: <strong>${currentPhase}</strong></p>
+                    <h2>${currentAccount.type} Progression</h2>
+                    <p>Currently in: <strong>${progression.current_phase}</strong></p>
                 </div>
 
                 <div class="progression-stats">
                     <div class="prog-stat">
-                        <div class="prog-stat-value">${overallPercent}%</div>
+                        <div class="prog-stat-value">${progression.percent}%</div>
                         <div class="prog-stat-label">Overall</div>
                     </div>
                     <div class="prog-stat">
-                        <div class="prog-stat-value">${completedMilestones}/${totalMilestones}</div>
+                        <div class="prog-stat-value">${progression.completed}/${progression.total}</div>
                         <div class="prog-stat-label">Milestones</div>
                     </div>
                     <div class="prog-stat">
-                        <div class="prog-stat-value">${skillsData ? Object.entries(skillsData).filter(([k, s]) => k !== 'Overall' && s.level >= 99).length : 0}</div>
+                        <div class="prog-stat-value">${stats.skills_99 ?? 0}</div>
                         <div class="prog-stat-label">99s</div>
                     </div>
                     <div class="prog-stat">
-                        <div class="prog-stat-value">${drops.length}</div>
+                        <div class="prog-stat-value">${stats.notable_drops ?? 0}</div>
                         <div class="prog-stat-label">Notable Drops</div>
                     </div>
                     <div class="prog-stat">
-                        <div class="prog-stat-value">${petsData?.total_obtained || 0}</div>
+                        <div class="prog-stat-value">${stats.pets ?? 0}</div>
                         <div class="prog-stat-label">Pets</div>
                     </div>
                 </div>
 
                 <div class="progression-phases">
-                    ${phases.map(phase => `
+                    ${progression.phases.map(phase => `
                         <div class="phase ${phase.phase}">
                             <div class="phase-header">
                                 <div class="phase-title">
@@ -1863,8 +1964,8 @@
                                         <div class="milestone ${m.complete ? 'complete' : 'incomplete'}">
                                             <span class="milestone-icon">${m.complete ? '✓' : getTypeIcon(m.type)}</span>
                                             <div class="milestone-info">
-                                                <div class="milestone-name">${m.name}</div>
-                                                <div class="milestone-detail">${m.detail}</div>
+                                                <div class="milestone-name">${escapeTargets(m.name)}</div>
+                                                <div class="milestone-detail">${escapeTargets(m.detail)}</div>
                                             </div>
                                             <span class="milestone-status ${m.complete ? 'done' : ''}">${m.complete ? 'Done' : '—'}</span>
                                         </div>
@@ -1905,6 +2006,16 @@
         };
 
         function buildTargetsClogRows() {
+            // Precomputed by build_targets.py: missing items only, already joined.
+            if (targetsClogData?.items) {
+                return targetsClogData.items.map(it => ({
+                    name: it.name,
+                    sourceDisplay: it.source,
+                    pct: it.comp_pct,
+                    wikiUrl: 'https://oldschool.runescape.wiki/w/' + encodeURIComponent(it.name.replace(/ /g, '_')),
+                }));
+            }
+            // Fallback: join the full wiki table against the collection log here.
             if (!clogData || !wikiCompData?.items) return [];
             const norm = s => (s || '').toLowerCase().trim();
             const obtained = new Set();
@@ -1933,6 +2044,14 @@
             // Otherwise fall back to caData.tiers.not_completed (just name+tier).
             const norm = s => (s || '').toLowerCase().trim();
 
+            // Precomputed by build_targets.py, in pct-desc order.
+            if (targetsCAData?.tasks) {
+                return targetsCAData.tasks.map(t => ({
+                    name: t.name, monster: t.monster, description: t.description, type: t.type,
+                    tier: t.tier, points: t.points, pct: t.comp_pct, wikiUrl: t.wiki_url,
+                }));
+            }
+
             if (wikiCATableData?.tasks && caData?.tiers) {
                 // Build set of completed task names from her caData
                 const completed = new Set();
@@ -2048,8 +2167,9 @@
                 document.head.appendChild(s);
             }
 
-            const updatedNote = wikiCompData?.updated
-                ? ` Wiki data updated ${new Date(wikiCompData.updated).toLocaleDateString()} (${(wikiCompData.item_count || wikiCompData.items?.length || 0).toLocaleString()} items).`
+            const compMeta = targetsClogData?.wiki || wikiCompData;
+            const updatedNote = compMeta?.updated
+                ? ` Wiki data updated ${new Date(compMeta.updated).toLocaleDateString()} (${(compMeta.item_count || compMeta.items?.length || 0).toLocaleString()} items).`
                 : '';
 
             container.innerHTML = `
@@ -2105,14 +2225,14 @@
             const body = document.getElementById('targetsBody');
             if (!body) return;
 
-            if (!wikiCompData?.items) {
+            if (!targetsClogData && !wikiCompData?.items) {
                 body.innerHTML = `<div class="targets-empty">
                     Missing <code>data/wiki_comp_rates.json</code>. Run
                     <code>scrape_wiki_comp_rates.py</code> to generate it.
                 </div>`;
                 return;
             }
-            if (!clogData) {
+            if (!targetsClogData && !clogData) {
                 body.innerHTML = `<div class="targets-empty">Collection log data not loaded.</div>`;
                 return;
             }
@@ -2156,10 +2276,12 @@
             const arrow = sortKey === 'pct-asc' ? ' ▲' : sortKey === 'pct-desc' ? ' ▼' : ' ▲';
 
             // Sources with the most items still missing
-            const topSources = [...counts.entries()]
-                .sort((a,b) => b[1]-a[1] || a[0].localeCompare(b[0]))
-                .slice(0, 10)
-                .map(([name, n]) => ({ name, value: n }));
+            const topSources = targetsClogData?.top_sources
+                ? targetsClogData.top_sources.map(t => ({ name: t.name, value: t.missing }))
+                : [...counts.entries()]
+                    .sort((a,b) => b[1]-a[1] || a[0].localeCompare(b[0]))
+                    .slice(0, 10)
+                    .map(([name, n]) => ({ name, value: n }));
 
             body.innerHTML = `
                 ${targetsTopHtml(topSources, 'items', targetsState.clogSource)}
@@ -2241,14 +2363,20 @@
             }
 
             const allRows = buildTargetsCARows();
-            const haveWiki = !!wikiCATableData?.tasks;
+            const pre = targetsCAData?.tasks ? targetsCAData : null;
+            const haveWiki = !!(pre || wikiCATableData?.tasks);
 
             // Build dropdown options from the unfiltered set (count desc, name asc)
             const monsterCounts = new Map();
             const typeCounts = new Map();
-            for (const r of allRows) {
-                if (r.monster) monsterCounts.set(r.monster, (monsterCounts.get(r.monster)||0)+1);
-                if (r.type)    typeCounts.set(r.type, (typeCounts.get(r.type)||0)+1);
+            if (pre) {
+                for (const m of pre.monsters) monsterCounts.set(m.name, m.tasks);
+                for (const [t, idx] of Object.entries(pre.by_type)) typeCounts.set(t, idx.length);
+            } else {
+                for (const r of allRows) {
+                    if (r.monster) monsterCounts.set(r.monster, (monsterCounts.get(r.monster)||0)+1);
+                    if (r.type)    typeCounts.set(r.type, (typeCounts.get(r.type)||0)+1);
+                }
             }
             const monsterOpts = [...monsterCounts.entries()]
                 .sort((a,b) => b[1]-a[1] || a[0].localeCompare(b[0]))
@@ -2261,26 +2389,46 @@
 
             // Monsters holding the most unclaimed points. Ranked by points, not task
             // count - one Grandmaster task is worth six Easy ones.
-            const ptsByMonster = new Map();
-            for (const r of allRows) {
-                if (!r.monster) continue;
-                const cur = ptsByMonster.get(r.monster) || { pts: 0, n: 0 };
-                cur.pts += r.points || 0;
-                cur.n += 1;
-                ptsByMonster.set(r.monster, cur);
-            }
-            const topMonsters = [...ptsByMonster.entries()]
-                .sort((a,b) => b[1].pts - a[1].pts || a[0].localeCompare(b[0]))
+            let monsterRollup;
+            if (pre) {
+                monsterRollup = pre.monsters.map(m => [m.name, { pts: m.points, n: m.tasks }]);
+            } else {
+                const ptsByMonster = new Map();
+                for (const r of allRows) {
+                    if (!r.monster) continue;
+                    const cur = ptsByMonster.get(r.monster) || { pts: 0, n: 0 };
+                    cur.pts += r.points || 0;
+                    cur.n += 1;
+                    ptsByMonster.set(r.monster, cur);
+                }
+                monsterRollup = [...ptsByMonster.entries()]
+                    .sort((a,b) => b[1].pts - a[1].pts || a[0].localeCompare(b[0]));
+            }
+            const topMonsters = monsterRollup
                 .slice(0, 10)
                 .map(([name, v]) => ({ name, value: v.pts, sub: `${v.n} task${v.n === 1 ? '' : 's'}` }));
 
-            // Apply filters
+            // Apply filters. With precomputed data the monster/tier/type filters
+            // and the sort are index lookups; only search and hide-N/A scan rows.
             const q = targetsState.caSearch.trim().toLowerCase();
-            let rows = allRows.filter(r => {
+            const sortKey = targetsState.caSort;
+            let candidates = allRows;
+            if (pre) {
+                const picks = [
+                    targetsState.caMonster && (pre.by_monster[targetsState.caMonster] || []),
+                    targetsState.caTier && (pre.by_tier[targetsState.caTier] || []),
+                    targetsState.caType && (pre.by_type[targetsState.caType] || []),
+                ].filter(Boolean).map(idx => new Set(idx));
+                const order = pre.orders[sortKey] || pre.orders['pct-desc'];
+                candidates = order.filter(i => picks.every(p => p.has(i))).map(i => allRows[i]);
+            }
+            let rows = candidates.filter(r => {
                 if (targetsState.caHideNA && r.pct == null) return false;
-                if (targetsState.caMonster && r.monster !== targetsState.caMonster) return false;
-                if (targetsState.caTier && r.tier !== targetsState.caTier) return false;
-                if (targetsState.caType && r.type !== targetsState.caType) return false;
+                if (!pre) {
+                    if (targetsState.caMonster && r.monster !== targetsState.caMonster) return false;
+                    if (targetsState.caTier && r.tier !== targetsState.caTier) return false;
+                    if (targetsState.caType && r.type !== targetsState.caType) return false;
+                }
                 if (q) {
                     const hay = [r.name, r.monster, r.description].join(' ').toLowerCase();
                     if (!hay.includes(q)) return false;
@@ -2289,8 +2437,7 @@
             });
 
             // Sort
-            const sortKey = targetsState.caSort;
-            rows.sort((a,b) => {
+            if (!pre) rows.sort((a,b) => {
                 if (sortKey === 'pct-desc' || sortKey === 'pct-asc') {
                     const dir = sortKey === 'pct-desc' ? -1 : 1;
                     const na = a.pct == null, nb = b.pct == null;
@@ -2308,8 +2455,9 @@
             });
 
             const sortArrow = sortKey === 'pct-asc' ? ' ▲' : ' ▼';
-            const updatedNote = wikiCATableData?.updated
-                ? ` Wiki CA data updated ${new Date(wikiCATableData.updated).toLocaleDateString()} (${wikiCATableData.task_count?.toLocaleString() || allRows.length} tasks).`
+            const caMeta = pre?.wiki || wikiCATableData;
+            const updatedNote = caMeta?.updated
+                ? ` Wiki CA data updated ${new Date(caMeta.updated).toLocaleDateString()} (${caMeta.task_count?.toLocaleString() || allRows.length} tasks).`
                 : '';
 
             body.innerHTML = `
@@ -2405,19 +2553,32 @@
             });
         }
 
-        // The Targets tab's reference tables (~1,700 items + 637 tasks) are large
-        // and only used here, so fetch them lazily the first time the tab opens.
+        // The Targets tab's data is only used here, so fetch it lazily the first
+        // time the tab opens. Each account has precomputed targets_clog.json and
+        // targets_ca.json; the full wiki tables (~1,700 items, 637 tasks) and
+        // every clog shard are only needed when those are missing.
         let targetsDataLoaded = false;
         async function ensureTargetsData() {
             if (targetsDataLoaded) return;
             targetsDataLoaded = true;
-            const [comp, ca] = await Promise.all([
-                fetch('./data/wiki_comp_rates.json').then(r => r.json()).catch(() => null),
-                fetch('./data/wiki_ca_table.json').then(r => r.json()).catch(() => null)
+            await loadTargetsData();
+        }
+
+        async function loadTargetsData() {
+            const D = currentAccount.dir;
+            const [clogTargets, caTargets] = await Promise.all([
+                fetchJson(`${D}/targets_clog.json`),
+                fetchJson(`${D}/targets_ca.json`),
+            ]);
+            if (D !== currentAccount.dir) return;  // account switched mid-fetch
+            targetsClogData = clogTargets;
+            targetsCAData = caTargets;
+            await Promise.all([
+                !clogTargets && !wikiCompData && fetchJson('./data/wiki_comp_rates.json').then(d => { wikiCompData = d; }),
+                !clogTargets && ensureAllClogShards(),  // the in-browser join needs every obtained item
+                !caTargets && !wikiCATableData && fetchJson('./data/wiki_ca_table.json').then(d => { wikiCATableData = d; }),
             ]);
-            wikiCompData = comp;
-            wikiCATableData = ca;
-            renderTargets();
+            if (D === currentAccount.dir) renderTargets();
         }
 
         // Tab switch (all tabs are open; bank data is simply absent when private)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Bank item categorization: CATEGORY_RULES compiled into one keyword automaton.
+
+categorize_item() used to test every item against each rule's keywords in
+turn, a substring scan per keyword. CategoryMatcher compiles all the keywords
+once into an Aho-Corasick automaton, so a name is scanned a single time no
+matter how many rules there are. Each keyword remembers the index of its rule
+and the lowest matching index wins, which keeps the "first rule that matches"
+priority the rules table is written around (Barrows before Equipment, raw
+fish before cooked, ...).
+
+On top of that, CategoryMemo keeps name -> (category, subcategory) results in
+a cache file keyed by a hash of the rules table. Re-pricing a bank only runs
+the automaton for names it has never seen, and editing CATEGORY_RULES
+invalidates the whole memo.
+"""
+
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+
+from osrs_config import CATEGORY_RULES
+from osrs_utils import CACHE_DIR, load_json, save_json
+
+FALLBACK = ("Miscellaneous", "Other")
+
+MEMO_PATH = CACHE_DIR / "bank_categories.json"
+MEMO_VERSION = 1
+
+
+def rules_hash(rules=CATEGORY_RULES) -> str:
+    """Stable digest of a rules table; any edit to it changes the digest."""
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class CategoryMatcher:
+    """Aho-Corasick automaton over every keyword in a CATEGORY_RULES table."""
+
+    def __init__(self, rules=CATEGORY_RULES):
+        self.labels = [(category, subcategory) for category, subcategory, _ in rules]
+        # goto[node] = {char: node}; best[node] = lowest rule index of any
+        # keyword ending at this node (or via its suffix links), else None.
+        self._goto: list[dict[str, int]] = [{}]
+        self._best: list[int | None] = [None]
+        for index, (_, _, keywords) in enumerate(rules):
+            for keyword in keywords:
+                self._add(keyword.lower(), index)
+        self._fail = self._link()
+
+    def _add(self, keyword: str, index: int):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._best.append(None)
+            node = nxt
+        if self._best[node] is None or index < self._best[node]:
+            self._best[node] = index
+
+    def _link(self) -> list[int]:
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[child] = self._goto[f].get(ch, 0)
+                # A keyword that is a suffix of this one also matches here.
+                inherited = self._best[fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+        return fail
+
+    def rule_index(self, name: str) -> int | None:
+        """Index of the first rule with a keyword contained in name, else None."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = None
+        node = 0
+        for ch in name.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best[node]
+            if hit is not None and (found is None or hit < found):
+                found = hit
+                if found == 0:
+                    break
+        return found
+
+    def categorize(self, name: str) -> tuple[str, str]:
+        index = self.rule_index(name)
+        return FALLBACK if index is None else self.labels[index]
+
+
+class CategoryMemo:
+    """name -> (category, subcategory), persisted and tied to one rules table."""
+
+    def __init__(self, path: Path | None = MEMO_PATH, rules=CATEGORY_RULES):
+        self.path = path
+        self.rules = rules
+        self.digest = rules_hash(rules)
+        self._matcher: CategoryMatcher | None = None
+        self.entries: dict[str, tuple[str, str]] = {}
+        self.added = 0
+        if path is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            cached = load_json(self.path)
+        except (OSError, ValueError):
+            return
+        if cached.get("version") == MEMO_VERSION and cached.get("rules_hash") == self.digest:
+            self.entries = {name: tuple(label) for name, label in cached.get("items", {}).items()}
+
+    @property
+    def matcher(self) -> CategoryMatcher:
+        # Built lazily: a run where every name is memoized never compiles it.
+        if self._matcher is None:
+            self._matcher = CategoryMatcher(self.rules)
+        return self._matcher
+
+    def categorize(self, name: str) -> tuple[str, str]:
+        key = name.lower()
+        label = self.entries.get(key)
+        if label is None:
+            label = self.entries[key] = self.matcher.categorize(key)
+            self.added += 1
+        return label
+
+    def save(self) -> bool:
+        """Write the memo if this run categorized anything new."""
+        if self.path is None or not self.added:
+            return False
+        payload = {
+            "version": MEMO_VERSION,
+            "rules_hash": self.digest,
+            "items": {name: list(label) for name, label in sorted(self.entries.items())},
+        }
+        self.added = 0
+        return save_json(self.path, payload, skip_if_only_timestamp_changed=False, quiet=True, compact=False)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Column-oriented bank valuation: totals per category and top-N by value.
+
+update_bank.py's processed items are a list of dicts, and summing them into
+nested category dicts one item at a time (then sorting the whole list to take
+ten) dominates the run for large multi-account inventories. BankArrays holds
+the numeric fields in parallel typed arrays instead:
+
+    ids, quantities, prices, values   array('q')  (int64)
+    groups                            array('l')  code of (category, subcategory)
+
+Category totals are a grouped sum over `groups` and top-N is a partial
+selection (heapq.nlargest), both linear in the number of items. With NumPy
+installed the same reductions run vectorized (np.add.at / np.argpartition);
+results are identical either way, including tie order.
+"""
+
+import heapq
+from array import array
+
+try:  # Optional fast path; the stdlib arrays give the same answers.
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BankArrays:
+    """Parallel typed arrays over a list of processed bank items."""
+
+    def __init__(self, items: list[dict], *, use_numpy: bool | None = None):
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self.labels: list[tuple[str, str]] = []
+        codes: dict[tuple[str, str], int] = {}
+        self.ids, self.quantities, self.prices, self.values = array("q"), array("q"), array("q"), array("q")
+        self.groups = array("l")
+        for item in items:
+            label = (item["category"], item["subcategory"])
+            code = codes.get(label)
+            if code is None:
+                # Codes follow first appearance, so summaries keep item order.
+                code = codes[label] = len(self.labels)
+                self.labels.append(label)
+            self.ids.append(item["id"])
+            self.quantities.append(item["quantity"])
+            self.prices.append(item["ge_price"])
+            self.values.append(item["total_value"])
+            self.groups.append(code)
+
+    def __len__(self):
+        return len(self.values)
+
+    def total_value(self) -> int:
+        return sum(self.values)
+
+    def total_quantity(self) -> int:
+        return sum(self.quantities)
+
+    def group_totals(self) -> tuple[list[int], list[int]]:
+        """(quantity, value) summed per (category, subcategory) code."""
+        n = len(self.labels)
+        if self.use_numpy and len(self):
+            groups = np.frombuffer(self.groups, dtype=f"i{self.groups.itemsize}")
+            counts = np.zeros(n, dtype=np.int64)
+            values = np.zeros(n, dtype=np.int64)
+            np.add.at(counts, groups, np.frombuffer(self.quantities, dtype=np.int64))
+            np.add.at(values, groups, np.frombuffer(self.values, dtype=np.int64))
+            return counts.tolist(), values.tolist()
+        counts, values = [0] * n, [0] * n
+        for g, q, v in zip(self.groups, self.quantities, self.values, strict=True):
+            counts[g] += q
+            values[g] += v
+        return counts, values
+
+    def summary(self) -> dict:
+        """update_bank's categories_summary: {category: {count, value, subcategories}}."""
+        out: dict[str, dict] = {}
+        counts, values = self.group_totals()
+        for (category, subcategory), count, value in zip(self.labels, counts, values, strict=True):
+            cat = out.setdefault(category, {"count": 0, "value": 0, "subcategories": {}})
+            cat["count"] += count
+            cat["value"] += value
+            cat["subcategories"][subcategory] = {"count": count, "value": value}
+        return out
+
+    def top(self, n: int) -> list[int]:
+        """Indexes of the n most valuable items, highest first; ties keep item order."""
+        if n <= 0 or not len(self):
+            return []
+        if self.use_numpy and len(self) > n:
+            values = np.frombuffer(self.values, dtype=np.int64)
+            # Every index whose value could make the cut, then an exact stable
+            # ordering of just those (argpartition alone breaks ties arbitrarily).
+            cutoff = values[np.argpartition(values, len(values) - n)[len(values) - n]]
+            candidates = np.flatnonzero(values >= cutoff)
+            order = candidates[np.argsort(-values[candidates], kind="stable")]
+            return order[:n].tolist()
+        return heapq.nlargest(n, range(len(self)), key=self.values.__getitem__)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the parsers and derivations, at synthetic scale.
+
+Each case builds realistic input of a given size with a seeded generator
+from synthetic.py (collection logs, combat achievement and pet YAML, Temple
+responses, banks, league tasks), times one function on it across several
+sizes, and compares the result with the stored baseline in
+scripts/bench_baseline.json:
+
+    python scripts/bench.py                     # all cases, compare to baseline
+    python scripts/bench.py --quick             # smaller sizes (what CI runs)
+    python scripts/bench.py --case categorize_item --case is_done
+    python scripts/bench.py --update-baseline   # after an intended change
+
+Timings are divided by a fixed pure-Python calibration workload measured in
+the same run, so a baseline recorded on one machine is usable on another. A
+case/size slower than the baseline by more than --tolerance (default 50%)
+is measured again, and if the faster of the two readings is still over,
+it is reported as a regression and the exit status is 1. CI runs --quick
+with --tolerance 1.0 (shared runners are noisy), so a change that doubles
+a case's time fails the build. The growth column is the measured scaling
+exponent between consecutive sizes (1.0 = linear).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import build_league_tasks
+import update_bank
+import update_stats
+from osrs_utils import parse_yaml_with_dates, using_data_dir
+from synthetic import (
+    WORDS,
+    gen_bank_names,
+    gen_ca_yaml,
+    gen_clog_yaml,
+    gen_league_tasks,
+    gen_pets_yaml,
+    gen_recent_items,
+    gen_temple_clog,
+)
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+BASELINE_VERSION = 1
+DEFAULT_TOLERANCE = 0.5
+
+# Minimum measured time per repeat; the loop count grows until a repeat takes this long.
+MIN_REPEAT_SECONDS = 0.05
+REPEATS = 3
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+def _case_parse_yaml_with_dates(n):
+    content = gen_clog_yaml(n)
+    return lambda: parse_yaml_with_dates(content)
+
+
+def _case_parse_pets_yaml(n):
+    content = gen_pets_yaml(n)
+    return lambda: update_stats.parse_pets_yaml(content)
+
+
+def _case_load_combat_achievements(n):
+    # Reads the YAML from a data dir like the real run; the dir lives as long as the callable.
+    scratch = tempfile.TemporaryDirectory(prefix="bench-ca-")
+    data_dir = Path(scratch.name)
+    (data_dir / "combat_achievements.yaml").write_text(gen_ca_yaml(n), encoding="utf-8")
+
+    def load():
+        with using_data_dir(data_dir):
+            return update_stats.load_combat_achievements()
+    load.scratch = scratch
+    return load
+
+
+def _case_process_temple_clog(n):
+    args = gen_temple_clog(n)
+    return lambda: update_stats.process_temple_clog(*args)
+
+
+def _case_dedup_recent_items(n):
+    items, sources = gen_recent_items(n)
+    return lambda: update_stats.dedup_recent_items(items, sources)
+
+
+def _case_categorize_item(n):
+    names = gen_bank_names(n)
+    categorize = update_bank.categorize_item
+    return lambda: [categorize(name) for name in names]
+
+
+def _case_is_done(n):
+    # is_done's cost is driven by the account's owned items (one regex each), not the task count.
+    tasks, acc = gen_league_tasks(IS_DONE_TASKS, n_items=n)
+    is_done = build_league_tasks.is_done
+    return lambda: [is_done(task, acc) for task in tasks]
+
+
+IS_DONE_TASKS = 25
+
+# name -> (setup(size) -> callable, full sizes, --quick sizes)
+CASES: dict[str, tuple[Callable, tuple[int, ...], tuple[int, ...]]] = {
+    "parse_yaml_with_dates": (_case_parse_yaml_with_dates, (1_000, 4_000, 16_000), (200, 800)),
+    "parse_pets_yaml": (_case_parse_pets_yaml, (100, 1_000, 10_000), (50, 200)),
+    "load_combat_achievements": (_case_load_combat_achievements, (600, 2_400, 9_600), (150, 600)),
+    "process_temple_clog": (_case_process_temple_clog, (1_000, 4_000, 16_000), (200, 800)),
+    "dedup_recent_items": (_case_dedup_recent_items, (1_000, 10_000, 50_000), (200, 1_000)),
+    "categorize_item": (_case_categorize_item, (1_000, 10_000, 50_000), (200, 1_000)),
+    "is_done": (_case_is_done, (100, 400, 1_600), (50, 200)),
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def calibrate() -> float:
+    """Seconds for a fixed mix of dict, string and sort work (best of 7)."""
+    words = [f"{w}{i}" for i, w in enumerate(WORDS * 200)]
+
+    def workload():
+        index = {}
+        for w in words:
+            index.setdefault(w.lower()[:4], []).append(w)
+        return sorted(words, key=len), " ".join(words).split()
+
+    best = math.inf
+    for _ in range(7):
+        start = time.perf_counter()
+        workload()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(fn: Callable, min_seconds: float = MIN_REPEAT_SECONDS, repeats: int = REPEATS) -> float:
+    """Best per-call seconds over `repeats` repeats of an auto-sized loop."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed * 10 < min_seconds else 1 + math.ceil(min_seconds / max(elapsed, 1e-9))
+    best = elapsed / loops
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def run(cases: list[str], quick: bool = False, min_seconds: float = MIN_REPEAT_SECONDS) -> dict:
+    """{"calibration": s, "results": {case: {size: normalized}}, "seconds": {case: {size: s}}}."""
+    cal = calibrate()
+    seconds = {}
+    for name in cases:
+        setup, full, small = CASES[name]
+        seconds[name] = {}
+        for size in small if quick else full:
+            fn = setup(size)
+            # The functions under test log as they go; keep the report readable.
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds[name][str(size)] = measure(fn, min_seconds)
+    # Calibrate again at the end and keep the faster: a single reading is easily inflated by noise.
+    cal = min(cal, calibrate())
+    results = {name: {size: t / cal for size, t in sizes.items()} for name, sizes in seconds.items()}
+    return {"calibration": cal, "results": results, "seconds": seconds}
+
+
+def best_of(current: dict, again: dict) -> dict:
+    """`current` with each case/size re-measured in `again` replaced by the faster (normalized) reading."""
+    results = {name: dict(sizes) for name, sizes in current["results"].items()}
+    seconds = {name: dict(sizes) for name, sizes in current["seconds"].items()}
+    for name, sizes in again["results"].items():
+        for size, norm in sizes.items():
+            if norm < results[name][size]:
+                results[name][size] = norm
+                seconds[name][size] = again["seconds"][name][size]
+    return {"calibration": current["calibration"], "results": results, "seconds": seconds}
+
+
+def compare(current: dict, baseline: dict | None, tolerance: float) -> list[dict]:
+    """One row per case/size with the ratio to the baseline and the growth exponent."""
+    rows = []
+    base_results = (baseline or {}).get("results", {})
+    for name, sizes in current["results"].items():
+        prev = None
+        for size, norm in sizes.items():
+            base = base_results.get(name, {}).get(size)
+            ratio = norm / base if base else None
+            growth = None
+            if prev is not None:
+                growth = math.log(norm / prev[1]) / math.log(int(size) / int(prev[0]))
+            rows.append({
+                "case": name, "size": int(size), "seconds": current["seconds"][name][size],
+                "ratio": ratio, "growth": growth,
+                "regression": ratio is not None and ratio > 1 + tolerance,
+            })
+            prev = (size, norm)
+    return rows
+
+
+def print_report(rows: list[dict], calibration: float):
+    print(f"Calibration: {calibration * 1000:.2f} ms")
+    print(f"{'case':<24} {'size':>7} {'ms/call':>10} {'us/elem':>9} {'growth':>7} {'vs base':>8}")
+    for r in rows:
+        growth = f"{r['growth']:.2f}" if r["growth"] is not None else ""
+        ratio = f"{r['ratio']:.2f}x" if r["ratio"] is not None else "new"
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['case']:<24} {r['size']:>7} {r['seconds'] * 1000:>10.3f} {r['seconds'] * 1e6 / r['size']:>9.2f}"
+              f" {growth:>7} {ratio:>8}{flag}")
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict | None:
+    try:
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return baseline if baseline.get("version") == BASELINE_VERSION else None
+
+
+def save_baseline(current: dict, path: Path = BASELINE_PATH, merge: dict | None = None):
+    results = {name: dict(sizes) for name, sizes in (merge or {}).get("results", {}).items()}
+    for name, sizes in current["results"].items():
+        results.setdefault(name, {}).update(sizes)
+    path.write_text(json.dumps({
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "calibration": round(current["calibration"], 6),
+        "results": {name: {size: round(v, 4) for size, v in sizes.items()} for name, sizes in results.items()},
+    }, indent=2) + "\n", encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown vs baseline as a fraction (default 0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    current = run(args.case or list(CASES), quick=args.quick)
+    baseline = load_baseline(args.baseline)
+    rows = compare(current, baseline, args.tolerance)
+    slow = sorted({r["case"] for r in rows if r["regression"]})
+    if slow and not args.update_baseline:
+        # A single slow reading is often just a noisy machine: measure those cases again, keep the faster.
+        print(f"Re-measuring {', '.join(slow)}")
+        current = best_of(current, run(slow, quick=args.quick))
+        rows = compare(current, baseline, args.tolerance)
+    print_report(rows, current["calibration"])
+
+    if args.update_baseline:
+        save_baseline(current, args.baseline, merge=baseline)
+        print(f"Saved baseline: {args.baseline}")
+        return 0
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"{len(regressions)} case/size(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compile each account's dashboard inputs into one pre-parsed bundle.
+
+Runs in CI after update_stats.py. For every account in osrs_config.ACCOUNTS it
+reads the generated JSON files plus the hand-edited YAML the dashboard needs
+(diaries, drops, collection-log categories, diary tasks), parses the YAML with
+the same rules app.js uses, and writes <account dir>/dashboard.json. The
+dashboard loads that single file instead of thirteen, and does no YAML parsing in
+the browser. Any file that is absent is stored as null, exactly as a failed
+fetch would have been.
+
+    python scripts/build_dashboard_bundle.py
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from instrumentation import run_instrumented, timed
+from osrs_config import ACCOUNTS
+from osrs_utils import (
+    REPO_ROOT,
+    load_json,
+    parse_clog_categories,
+    parse_diaries_yaml,
+    parse_diary_tasks_yaml,
+    parse_drops_yaml,
+    save_json,
+)
+
+# Bump when the bundle layout changes; app.js ignores a bundle whose version it
+# doesn't know and falls back to fetching the individual files.
+BUNDLE_VERSION = 3
+BUNDLE_NAME = "dashboard.json"
+
+# bundle key -> generated JSON file, embedded as-is.
+JSON_SOURCES = {
+    "skills": "skills.json",
+    "bosses": "bosses.json",
+    "clues": "clues.json",
+    # The index only: the Collection Log tab fetches category shards on demand.
+    "collection_log_index": "collection_log/index.json",
+    "combat_achievements": "combat_achievements.json",
+    "pets": "pets.json",
+    "quests": "quests.json",
+    # Milestones and gear targets, already evaluated by build_progression.py.
+    "progression": "progression.json",
+    # Per-month counts only; the Progress tab fetches a month's entries on expand.
+    "timeline_index": "timeline/index.json",
+}
+
+# bundle key -> (YAML file, parser).
+YAML_SOURCES = {
+    "diaries": ("diaries.yaml", parse_diaries_yaml),
+    "drops": ("drops.yaml", parse_drops_yaml),
+    "clog_categories": ("clog_categories.yaml", parse_clog_categories),
+    "diary_tasks": ("diary_tasks.yaml", parse_diary_tasks_yaml),
+}
+
+
+def _read_json(path: Path):
+    try:
+        return load_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+@timed()
+def build_bundle(data_dir: Path, account_id: str) -> dict:
+    """The dashboard bundle for one account directory."""
+    bundle = {
+        "version": BUNDLE_VERSION,
+        "account": account_id,
+        "updated": datetime.now(timezone.utc).isoformat(),
+    }
+    for key, name in JSON_SOURCES.items():
+        bundle[key] = _read_json(data_dir / name)
+    for key, (name, parse) in YAML_SOURCES.items():
+        path = data_dir / name
+        bundle[key] = parse(path.read_text(encoding="utf-8")) if path.exists() else None
+    return bundle
+
+
+def main():
+    for account in ACCOUNTS:
+        data_dir = REPO_ROOT / account["dir"]
+        bundle = build_bundle(data_dir, account["id"])
+        present = [k for k in (*JSON_SOURCES, *YAML_SOURCES) if bundle[k] is not None]
+        print(f"{account['label']}: {len(present)}/{len(JSON_SOURCES) + len(YAML_SOURCES)} sources")
+        save_json(data_dir / BUNDLE_NAME, bundle)
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "build_dashboard_bundle")
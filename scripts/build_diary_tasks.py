@@ -3,16 +3,27 @@
 Scrape OSRS Wiki achievement-diary tasks into <data dir>/diary_tasks.yaml.
 
 Re-run to refresh. Writes to OSRS_DATA_DIR (so `OSRS_DATA_DIR=data/gim
-python scripts/build_diary_tasks.py` targets the GIM account). The dashboard's
-Diaries tab reads this list; delete a task once it's done and it drops off.
+python scripts/build_diary_tasks.py` targets the GIM account), or to every
+account in osrs_config.ACCOUNTS with --all-accounts. The dashboard's Diaries
+tab reads this list; delete a task once it's done and it drops off.
+
+All diary pages are pulled in one batched `action=query` request (up to
+QUERY_BATCH titles each) rather than one `action=parse` call per page, and each
+page is parsed as soon as its batch arrives.
 """
 
+import argparse
 import re
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from osrs_utils import DATA_DIR, fetch_json
+from instrumentation import run_instrumented
+from osrs_config import ACCOUNTS
+from osrs_utils import DATA_DIR, account_dirs, fetch_json
 
 API = "https://oldschool.runescape.wiki/api.php"
+# MediaWiki caps `titles=` at 50 per request for anonymous clients.
+QUERY_BATCH = 50
 TIERS = ["Easy", "Medium", "Hard", "Elite"]
 REGIONS = [
     "Ardougne Diary", "Desert Diary", "Falador Diary", "Fremennik Diary",
@@ -44,6 +55,52 @@ def fetch_wikitext(page):
     return (data or {}).get("parse", {}).get("wikitext", "")
 
 
+def fetch_wikitext_batch(pages):
+    """Return {requested page: wikitext} for up to QUERY_BATCH pages in one request.
+
+    Titles the wiki normalized or redirected are mapped back to the name we
+    asked for; pages it didn't return (missing, or a failed request) are
+    simply absent so the caller can fall back to fetch_wikitext().
+    """
+    data = fetch_json(API, {
+        "action": "query", "prop": "revisions", "rvprop": "content", "rvslots": "main",
+        "titles": "|".join(pages), "redirects": "1", "format": "json", "formatversion": "2",
+    })
+    query = (data or {}).get("query", {})
+    requested = {p: p for p in pages}
+    for step in query.get("normalized", []) + query.get("redirects", []):
+        requested[step["to"]] = requested.get(step["from"], step["from"])
+
+    out = {}
+    for pg in query.get("pages", []):
+        revs = pg.get("revisions") or []
+        content = revs[0].get("slots", {}).get("main", {}).get("content") if revs else None
+        if content and pg.get("title") in requested:
+            out[requested[pg["title"]]] = content
+    return out
+
+
+def fetch_all_tasks(pages, batch_size=QUERY_BATCH):
+    """Return {page: {tier: [tasks]}}, fetching in batches and parsing as they land."""
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+    tasks = {}
+    with ThreadPoolExecutor(max_workers=min(4, len(batches)) or 1) as pool:
+        fetches = [pool.submit(fetch_wikitext_batch, b) for b in batches]
+        parses = {}
+        for fut in as_completed(fetches):
+            for page, wt in fut.result().items():
+                parses[pool.submit(parse_tasks, wt)] = page
+        for fut, page in parses.items():
+            tasks[page] = fut.result()
+
+    # Anything the batch query didn't return gets the old one-page parse call.
+    for page in pages:
+        if page not in tasks:
+            print(f"  {page}: not in batch response, fetching individually")
+            tasks[page] = parse_tasks(fetch_wikitext(page))
+    return tasks
+
+
 def parse_tasks(wt):
     """Return {tier: [tasks]} from a diary page's wikitext."""
     out = {t: [] for t in TIERS}
@@ -61,28 +118,45 @@ def parse_tasks(wt):
     return out
 
 
-def main():
+def render_yaml(tasks_by_page):
+    """diary_tasks.yaml text for {page: {tier: [tasks]}}, in REGIONS order."""
     lines = ["# Achievement diary tasks (scraped from the OSRS Wiki).",
              "# Delete a task once it's completed; the Diaries tab shows what's left.",
              ""]
-    total = 0
     for page in REGIONS:
-        print(f"Fetching {page}...")
-        tasks = parse_tasks(fetch_wikitext(page))
-        n = sum(len(v) for v in tasks.values())
-        total += n
-        print(f"  {n} tasks ({'/'.join(str(len(tasks[t])) for t in TIERS)})")
+        tasks = tasks_by_page[page]
         lines.append(f"{page[:-len(' Diary')]}:")
         for tier in TIERS:
             lines.append(f"  {tier}:")
             lines.extend(f"    - {t}" for t in tasks[tier])
         lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--all-accounts", action="store_true",
+                    help="write diary_tasks.yaml for every account in osrs_config.ACCOUNTS")
+    args = ap.parse_args()
+
+    print(f"Fetching {len(REGIONS)} diary pages...")
+    tasks_by_page = fetch_all_tasks(REGIONS)
+    total = 0
+    for page in REGIONS:
+        tasks = tasks_by_page[page]
+        n = sum(len(v) for v in tasks.values())
+        total += n
+        print(f"  {page}: {n} tasks ({'/'.join(str(len(tasks[t])) for t in TIERS)})")
 
-    out = DATA_DIR / "diary_tasks.yaml"
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    print(f"\nWrote {out} ({total} tasks)")
+    # The task list is the same for every account, so it's scraped once and
+    # written to each target directory.
+    text = render_yaml(tasks_by_page)
+    for data_dir in (account_dirs(ACCOUNTS) if args.all_accounts else [DATA_DIR]):
+        out = data_dir / "diary_tasks.yaml"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text, encoding="utf-8")
+        print(f"Wrote {out} ({total} tasks)")
 
 
 if __name__ == "__main__":
-    main()
+    run_instrumented(main, "build_diary_tasks")
@@ -21,7 +21,7 @@ import urllib.parse
 import urllib.request
 from html.parser import HTMLParser
 
-from osrs_utils import DATA_DIR
+from osrs_utils import DATA_DIR, load_json, upstream_url
 
 WIKI_API = "https://oldschool.runescape.wiki/api.php"
 TASKS_PAGE = "Demonic_Pacts_League/Tasks"
@@ -37,7 +37,7 @@ def fetch_tasks_html():
     params = {"action": "parse", "page": TASKS_PAGE, "prop": "text",
               "format": "json", "formatversion": "2"}
     url = f"{WIKI_API}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers={"User-Agent": "OSRS-Ironman-Tracker/1.0"})
+    req = urllib.request.Request(upstream_url(url), headers={"User-Agent": "OSRS-Ironman-Tracker/1.0"})
     with urllib.request.urlopen(req, timeout=60) as r:
         return json.loads(r.read().decode())["parse"]["text"]
 
@@ -107,7 +107,7 @@ def _load(name):
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return load_json(path)
     except Exception:
         return None
 
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Evaluate the progression milestones and gear targets for every account.
+
+Runs in CI after update_stats.py. The milestone definitions live as data in
+osrs_config.PROGRESSION_PHASES (gear targets in GEAR_TARGETS); this indexes
+each account's skills, boss KC, drops, quests, CAs, pets and collection log
+once and writes <account dir>/progression.json with every milestone already
+marked done or not. The dashboard only renders it.
+
+    python scripts/build_progression.py
+"""
+
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from instrumentation import run_instrumented, timed
+from osrs_config import ACCOUNTS, GEAR_STAGES, GEAR_TARGETS, PROGRESSION_PHASE_ADVANCE_PCT, PROGRESSION_PHASES
+from osrs_utils import REPO_ROOT, load_json, parse_drops_yaml, save_json
+
+PROGRESSION_NAME = "progression.json"
+
+# Every collection-log item name, so gear targets can tell "not obtained yet"
+# from "not a collection-log item" even when the log only lists obtained items.
+WIKI_COMP_RATES = REPO_ROOT / "data" / "wiki_comp_rates.json"
+
+# "Warrior ring (i)" -> "Warrior ring": imbued / fortified / enchanted variants
+# aren't separate collection-log items, so fall back to the base item.
+_VARIANT_SUFFIX = re.compile(r"\s*\((?:i|e|f|or|u)\)$")
+
+
+class ProgressIndex:
+    """Lookups over one account's data, built once and shared by every check."""
+
+    def __init__(self, skills=None, bosses=None, drops=None, quests=None, ca=None, pets=None, clog=None,
+                 clog_items=()):
+        self.levels = {name: s.get("level", 1) for name, s in (skills or {}).items()}
+        # Insertion order matters: a boss check takes the first name that matches.
+        self.boss_kc = [(name.lower(), b.get("kc", 0)) for name, b in (bosses or {}).items()]
+        drops = drops or []
+        self.drop_items = [d["item"].lower() for d in drops if d.get("item")]
+        self.drop_names = set(self.drop_items)
+        self.drops_by_boss = Counter(d.get("boss") for d in drops)
+        self.quests = [
+            (q if isinstance(q, str) else q.get("name", "")).lower()
+            for cat in (quests or {}).get("categories", {}).values()
+            for q in cat.get("completed", [])
+        ]
+        self.quests_completed = (quests or {}).get("total_completed", 0)
+        self.ca_tiers = (ca or {}).get("tiers", {})
+        self.pets_obtained = (pets or {}).get("total_obtained", 0)
+        clog = clog or {}
+        self.clog_obtained = clog.get("total_obtained", 0)
+        collections = clog.get("collections", {}).values()
+        self.owned = {i["name"].lower() for c in collections for i in c.get("obtained", [])}
+        self.missing = {n.lower() for c in collections for n in c.get("missing", [])}
+        self.missing.update(n.lower() for n in clog_items)
+        self.missing -= self.owned
+        self._has_drop: dict[str, bool] = {}
+
+    def has_drop(self, name: str) -> bool:
+        """A drops.yaml item, or an obtained collection-log item, contains name."""
+        key = name.lower()
+        if key not in self._has_drop:
+            self._has_drop[key] = (key in self.owned or any(key in item for item in self.drop_items)
+                                   or any(key in item for item in self.owned))
+        return self._has_drop[key]
+
+    def drop_count(self, name: str) -> int:
+        key = name.lower()
+        return sum(1 for item in self.drop_items if key in item)
+
+    def boss(self, name: str) -> int:
+        key = name.lower()
+        return next((kc for boss, kc in self.boss_kc if key in boss), 0)
+
+    def has_quest(self, name: str) -> bool:
+        key = name.lower()
+        return any(key in q for q in self.quests)
+
+    def item_status(self, name: str) -> bool | None:
+        """True if owned, False if a known collection-log item not yet owned,
+        None if the data doesn't track the item at all."""
+        for key in dict.fromkeys((name.lower().strip(), _VARIANT_SUFFIX.sub("", name.lower().strip()))):
+            if key in self.owned or key in self.drop_names:
+                return True
+            if key in self.missing:
+                return False
+        return None
+
+
+def _ca_tier_done(idx: ProgressIndex, tier: str) -> bool:
+    t = idx.ca_tiers.get(tier) or {}
+    total = t.get("total_count", 0)
+    return total > 0 and t.get("completed_count", 0) >= total
+
+
+# Rule name -> evaluator(index, *args). See PROGRESSION_PHASES for the rules.
+CHECKS = {
+    "drop": lambda idx, name: idx.has_drop(name),
+    "drop_count": lambda idx, name, n: idx.drop_count(name) >= n,
+    "drops_from": lambda idx, boss, n: idx.drops_by_boss[boss] >= n,
+    "skill": lambda idx, skill, level: idx.levels.get(skill, 1) >= level,
+    "all_skills": lambda idx, level: bool(idx.levels) and all(lvl >= level for lvl in idx.levels.values()),
+    "boss_kc": lambda idx, boss, kc: idx.boss(boss) >= kc,
+    "quest": lambda idx, name: idx.has_quest(name),
+    "quests_completed": lambda idx, n: idx.quests_completed >= n,
+    "ca_tier_done": _ca_tier_done,
+    "pets": lambda idx, n: idx.pets_obtained >= n,
+    "clog": lambda idx, n: idx.clog_obtained >= n,
+    "any": lambda idx, checks: any(evaluate(c, idx) for c in checks),
+    "always": lambda idx: True,
+}
+
+
+def evaluate(check: tuple, idx: ProgressIndex) -> bool:
+    rule, *args = check
+    if rule not in CHECKS:
+        raise ValueError(f"unknown progression check {rule!r}")
+    return CHECKS[rule](idx, *args)
+
+
+@timed()
+def evaluate_phases(idx: ProgressIndex, phases=PROGRESSION_PHASES) -> dict:
+    """Every phase with its milestones marked, plus the overall summary."""
+    out = []
+    for phase in phases:
+        milestones = [
+            {"name": name, "detail": detail, "type": kind, "complete": evaluate(check, idx)}
+            for name, detail, kind, check in phase["milestones"]
+        ]
+        done = sum(m["complete"] for m in milestones)
+        out.append({
+            **{k: phase[k] for k in ("name", "phase", "icon", "description")},
+            "completed": done,
+            "total": len(milestones),
+            "percent": round(100 * done / len(milestones)) if milestones else 0,
+            "milestones": milestones,
+        })
+
+    current = out[0]["name"] if out else None
+    for prev, nxt in zip(out, out[1:], strict=False):
+        if prev["percent"] >= PROGRESSION_PHASE_ADVANCE_PCT:
+            current = nxt["name"]
+    completed = sum(p["completed"] for p in out)
+    total = sum(p["total"] for p in out)
+    return {
+        "current_phase": current,
+        "completed": completed,
+        "total": total,
+        "percent": round(100 * completed / total) if total else 0,
+        "phases": out,
+    }
+
+
+def piece_status(piece: str, idx: ProgressIndex) -> bool | None:
+    """Ownership of one gear-target cell: any ' / ' alternative whose ' + ' items are all owned."""
+    statuses = []
+    for alt in piece.split(" / "):
+        items = [idx.item_status(i) for i in alt.split(" + ")]
+        statuses.append(True if all(items) else False if False in items else None)
+    if True in statuses:
+        return True
+    return False if all(s is False for s in statuses) else None
+
+
+@timed()
+def evaluate_gear(idx: ProgressIndex, targets=GEAR_TARGETS) -> dict:
+    """Gear targets per style with each cell's ownership (True / False / None = untracked)."""
+    styles = {}
+    for style, t in targets.items():
+        cells = {
+            stage: {
+                slot: {"name": t[stage][slot], "owned": piece_status(t[stage][slot], idx)}
+                for slot in t["slots"] if t.get(stage, {}).get(slot)
+            }
+            for stage, _ in GEAR_STAGES
+        }
+        styles[style] = {"slots": t["slots"], "cells": cells}
+    return {"stages": [{"key": k, "label": label} for k, label in GEAR_STAGES], "styles": styles}
+
+
+def _read_json(path: Path, key: str):
+    try:
+        return load_json(path).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@timed()
+def load_index(data_dir: Path, clog_items=()) -> ProgressIndex:
+    """ProgressIndex over the generated files in one account directory."""
+    drops_path = data_dir / "drops.yaml"
+    return ProgressIndex(
+        skills=_read_json(data_dir / "skills.json", "skills"),
+        bosses=_read_json(data_dir / "bosses.json", "bosses"),
+        drops=parse_drops_yaml(drops_path.read_text(encoding="utf-8")) if drops_path.exists() else [],
+        quests=_read_json(data_dir / "quests.json", "quests"),
+        ca=_read_json(data_dir / "combat_achievements.json", "combat_achievements"),
+        pets=_read_json(data_dir / "pets.json", "pets"),
+        clog=_read_json(data_dir / "collection_log.json", "collection_log"),
+        clog_items=clog_items,
+    )
+
+
+def build_progression(data_dir: Path, account: dict, clog_items=()) -> dict:
+    idx = load_index(data_dir, clog_items)
+    out = {
+        "account": account["id"],
+        "updated": datetime.now(timezone.utc).isoformat(),
+        **evaluate_phases(idx),
+        "stats": {
+            "skills_99": sum(1 for name, lvl in idx.levels.items() if name != "Overall" and lvl >= 99),
+            "notable_drops": len(idx.drop_items),
+            "pets": idx.pets_obtained,
+        },
+    }
+    if account.get("gear_targets"):
+        out["gear_targets"] = evaluate_gear(idx)
+    return out
+
+
+def main():
+    clog_items = [i["name"] for i in (_read_json(WIKI_COMP_RATES, "items") or []) if i.get("name")]
+    for account in ACCOUNTS:
+        data_dir = REPO_ROOT / account["dir"]
+        progression = build_progression(data_dir, account, clog_items)
+        print(f"{account['label']}: {progression['completed']}/{progression['total']} milestones"
+              f" ({progression['current_phase']})")
+        save_json(data_dir / PROGRESSION_NAME, progression)
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "build_progression")
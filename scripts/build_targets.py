@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Precompute the dashboard's Targets tab for every account.
+
+Runs in CI after update_stats.py. The Targets tab used to download the full
+wiki reference tables and join them against the account's data in the browser
+on every open. This does the join once per account and writes small,
+ready-to-render files next to the account's other data:
+
+  targets_clog.json   collection-log items the account is still missing,
+                      with wiki completion rates, ranked easiest first, plus
+                      the top sources by items missing.
+  targets_ca.json     uncompleted combat achievements with the task list
+                      pre-sorted under every sort the tab offers, index lists
+                      by monster / tier / type so filtering is a lookup, and
+                      per-monster unclaimed-point rollups.
+
+    python scripts/build_targets.py
+"""
+
+import urllib.parse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from instrumentation import run_instrumented, timed
+from osrs_config import ACCOUNTS
+from osrs_utils import REPO_ROOT, load_json, save_json
+
+# Shared wiki reference tables (scraped locally, committed under data/).
+WIKI_COMP_RATES = REPO_ROOT / "data" / "wiki_comp_rates.json"
+WIKI_CA_TABLE = REPO_ROOT / "data" / "wiki_ca_table.json"
+
+TARGETS_CLOG_NAME = "targets_clog.json"
+TARGETS_CA_NAME = "targets_ca.json"
+
+# Same order and default points as the dashboard's Targets tab.
+CA_TIER_ORDER = ["Easy", "Medium", "Hard", "Elite", "Master", "Grandmaster"]
+CA_POINTS_BY_TIER = {tier: i + 1 for i, tier in enumerate(CA_TIER_ORDER)}
+WIKI_URL = "https://oldschool.runescape.wiki/w/"
+
+# Size of the "most left to get" banner.
+TOP_N = 10
+
+
+def _norm(name: str | None) -> str:
+    return (name or "").lower().strip()
+
+
+def _read(path: Path):
+    try:
+        return load_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _pct_desc_key(row: dict):
+    """Easiest first (highest comp%), unknown comp% last, then by name."""
+    pct = row["comp_pct"]
+    return (pct is None, -(pct or 0), row["name"].casefold())
+
+
+def _pct_asc_key(row: dict):
+    """Rarest first; unknown comp% still sorts last."""
+    pct = row["comp_pct"]
+    return (pct is None, pct or 0, row["name"].casefold())
+
+
+def _tier_asc_key(row: dict):
+    # Unknown tiers sort first, as indexOf() == -1 does in the dashboard.
+    tier = CA_TIER_ORDER.index(row["tier"]) if row["tier"] in CA_TIER_ORDER else -1
+    return (tier, row["name"].casefold())
+
+
+def _name_key(row: dict):
+    return row["name"].casefold()
+
+
+# Sort orders the Targets tab offers for combat achievements.
+CA_SORTS = {
+    "pct-desc": _pct_desc_key,
+    "pct-asc": _pct_asc_key,
+    "tier-asc": _tier_asc_key,
+    "name-asc": _name_key,
+}
+
+
+def clog_obtained_names(clog: dict) -> set[str]:
+    """Normalized names of every obtained item in a collection_log.json payload."""
+    return {
+        _norm(item.get("name"))
+        for coll in clog.get("collections", {}).values()
+        for item in coll.get("obtained", [])
+    }
+
+
+@timed()
+def build_clog_targets(clog: dict, comp: dict) -> dict:
+    """Missing collection-log items joined with wiki completion rates.
+
+    Mirrors the dashboard's old in-browser join: items are matched on
+    lowercased name, and an item listed under the same source twice appears
+    once.
+    """
+    obtained = clog_obtained_names(clog)
+    seen = set()
+    items = []
+    for it in comp.get("items", []):
+        name = it.get("name")
+        if not name or _norm(name) in obtained:
+            continue
+        source = it.get("source_display") or ", ".join(it.get("sources") or ["Unknown"])
+        key = (_norm(name), it.get("source_display") or "")
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append({"name": name, "source": source, "comp_pct": it.get("comp_pct")})
+    items.sort(key=_pct_desc_key)
+
+    counts: dict[str, int] = {}
+    for it in items:
+        counts[it["source"]] = counts.get(it["source"], 0) + 1
+    sources = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0].casefold()))
+
+    return {
+        "wiki": {"updated": comp.get("updated"), "item_count": comp.get("item_count") or len(comp.get("items", []))},
+        "missing_count": len(items),
+        "top_sources": [{"name": n, "missing": k} for n, k in sources[:TOP_N]],
+        "items": items,
+    }
+
+
+def ca_completed_names(ca: dict) -> set[str]:
+    """Normalized names of every completed task in a combat_achievements.json payload."""
+    names = set()
+    for tier in ca.get("tiers", {}).values():
+        for entry in tier.get("completed", []):
+            name = entry if isinstance(entry, str) else (entry or {}).get("name")
+            if name:
+                names.add(_norm(name))
+    return names
+
+
+def _index_by(tasks: list[dict], field: str) -> dict[str, list[int]]:
+    index: dict[str, list[int]] = {}
+    for i, task in enumerate(tasks):
+        if task[field]:
+            index.setdefault(task[field], []).append(i)
+    return index
+
+
+@timed()
+def build_ca_targets(ca: dict, table: dict) -> dict:
+    """Uncompleted combat achievements joined with the wiki CA table.
+
+    `tasks` is in pct-desc order; `orders` holds every sort as a list of
+    indexes into it, and `by_monster` / `by_tier` / `by_type` the indexes of
+    each filter value (in pct-desc order).
+    """
+    completed = ca_completed_names(ca)
+    tasks = []
+    for t in table.get("tasks", []):
+        name = t.get("name") or ""
+        if _norm(name) in completed:
+            continue
+        tier = t.get("tier") or ""
+        points = t.get("points")
+        tasks.append({
+            "name": name,
+            "monster": t.get("monster") or "Miscellaneous",
+            "description": t.get("description") or "",
+            "type": t.get("type") or "",
+            "tier": tier,
+            "points": points if points is not None else CA_POINTS_BY_TIER.get(tier),
+            "comp_pct": t.get("comp_pct"),
+            "wiki_url": t.get("wiki_url") or WIKI_URL + urllib.parse.quote(name.replace(" ", "_"), safe="!'()*"),
+        })
+    tasks.sort(key=_pct_desc_key)
+
+    positions = range(len(tasks))
+    orders = {sort: sorted(positions, key=lambda i, k=key: k(tasks[i])) for sort, key in CA_SORTS.items()}
+
+    rollup: dict[str, dict] = {}
+    for task in tasks:
+        entry = rollup.setdefault(task["monster"], {"name": task["monster"], "points": 0, "tasks": 0})
+        entry["points"] += task["points"] or 0
+        entry["tasks"] += 1
+    # Ranked by points, not task count - one Grandmaster task is worth six Easy ones.
+    monsters = sorted(rollup.values(), key=lambda m: (-m["points"], m["name"].casefold()))
+
+    return {
+        "wiki": {"updated": table.get("updated"), "task_count": table.get("task_count") or len(table.get("tasks", []))},
+        "uncompleted_count": len(tasks),
+        "points_available": sum(m["points"] for m in monsters),
+        "monsters": monsters,
+        "by_monster": _index_by(tasks, "monster"),
+        "by_tier": _index_by(tasks, "tier"),
+        "by_type": _index_by(tasks, "type"),
+        "orders": orders,
+        "tasks": tasks,
+    }
+
+
+def main():
+    comp = _read(WIKI_COMP_RATES)
+    if not comp:
+        print(f"build_targets: {WIKI_COMP_RATES.name} not found — skipping collection-log targets.")
+    table = _read(WIKI_CA_TABLE)
+    if not table:
+        print(f"build_targets: {WIKI_CA_TABLE.name} not found — skipping combat-achievement targets.")
+    now = datetime.now(timezone.utc).isoformat()
+
+    for account in ACCOUNTS:
+        data_dir = REPO_ROOT / account["dir"]
+        clog = (_read(data_dir / "collection_log.json") or {}).get("collection_log")
+        if comp and clog:
+            targets = build_clog_targets(clog, comp)
+            print(f"{account['label']}: {targets['missing_count']} collection-log targets")
+            save_json(data_dir / TARGETS_CLOG_NAME, {"account": account["id"], "updated": now, **targets})
+        ca = (_read(data_dir / "combat_achievements.json") or {}).get("combat_achievements")
+        if table and ca:
+            targets = build_ca_targets(ca, table)
+            print(f"{account['label']}: {targets['uncompleted_count']} combat-achievement targets"
+                  f" ({targets['points_available']} pts)")
+            save_json(data_dir / TARGETS_CA_NAME, {"account": account["id"], "updated": now, **targets})
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "build_targets")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Compact, dictionary-encoded JSON for the generated data files.
+
+The pretty-printed files repeat the same keys ('name', 'date', 'quantity'),
+category names and ISO dates on every item. This encoding stores:
+
+  - every string that sits in a table column or string list once, in a
+    shared string table, and refers to it by index;
+  - ISO dates ('2026-06-22') as day numbers since 1970-01-01;
+  - lists of same-shaped dicts as one column header plus array rows.
+
+The envelope is {"$compact": 1, "strings": [...], "data": <encoded>}. decode()
+expands it back to exactly the original structure, and passes anything that
+isn't an envelope through unchanged, so readers can call it unconditionally.
+app.js has a matching decodeCompact().
+
+    Table:        {"$t": [col, ...], "$c": [code, ...], "$r": [[v, ...], ...]}
+                  code "s" = string-table index, "d" = day number, "v" = value
+    String list:  {"$s": [index, ...]}
+"""
+
+import re
+from datetime import date
+from typing import Any
+
+VERSION = 1
+
+_EPOCH = date(1970, 1, 1).toordinal()
+_ISO_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _is_iso_day(value: Any) -> bool:
+    if not isinstance(value, str) or not _ISO_DAY.match(value):
+        return False
+    try:
+        return date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+def _column_code(values: list) -> str:
+    present = [v for v in values if v is not None]
+    if not present or not all(isinstance(v, str) for v in present):
+        return "v"
+    return "d" if all(_is_iso_day(v) for v in present) else "s"
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def ref(self, s: str) -> int:
+        i = self._index.get(s)
+        if i is None:
+            i = self._index[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def cell(self, code: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if code == "s":
+            return self.ref(value)
+        if code == "d":
+            return date.fromisoformat(value).toordinal() - _EPOCH
+        return self.encode(value)
+
+    def encode(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {k: self.encode(v) for k, v in obj.items()}
+        if not isinstance(obj, list) or not obj:
+            return obj
+        if all(isinstance(v, str) for v in obj):
+            return {"$s": [self.ref(v) for v in obj]}
+        if all(isinstance(v, dict) for v in obj):
+            cols = list(obj[0])
+            if cols and all(len(row) == len(cols) and all(c in row for c in cols) for row in obj):
+                codes = [_column_code([row[c] for row in obj]) for c in cols]
+                rows = [[self.cell(code, row[c]) for c, code in zip(cols, codes, strict=True)] for row in obj]
+                return {"$t": cols, "$c": codes, "$r": rows}
+        return [self.encode(v) for v in obj]
+
+
+def encode(obj: Any) -> dict:
+    """Compact envelope for a JSON-compatible object."""
+    enc = _Encoder()
+    data = enc.encode(obj)
+    return {"$compact": VERSION, "strings": enc.strings, "data": data}
+
+
+def is_compact(obj: Any) -> bool:
+    return isinstance(obj, dict) and "$compact" in obj
+
+
+def decode(obj: Any) -> Any:
+    """Expand a compact envelope; anything else is returned unchanged."""
+    if not is_compact(obj):
+        return obj
+    if obj["$compact"] != VERSION:
+        raise ValueError(f"unsupported compact JSON version {obj['$compact']!r}")
+    strings = obj["strings"]
+
+    def cell(code, value):
+        if value is None:
+            return None
+        if code == "s":
+            return strings[value]
+        if code == "d":
+            return date.fromordinal(value + _EPOCH).isoformat()
+        return expand(value)
+
+    def expand(node):
+        if isinstance(node, list):
+            return [expand(v) for v in node]
+        if not isinstance(node, dict):
+            return node
+        if "$s" in node and len(node) == 1:
+            return [strings[i] for i in node["$s"]]
+        if "$t" in node and "$r" in node:
+            cols, codes = node["$t"], node["$c"]
+            return [{c: cell(code, v) for c, code, v in zip(cols, codes, row, strict=True)} for row in node["$r"]]
+        return {k: expand(v) for k, v in node.items()}
+
+    return expand(obj["data"])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Evaluate untradeable_values.UNTRADEABLE_RECIPES against a GE price snapshot.
+
+Each recipe is a small expression over other items' prices (see the term
+grammar in untradeable_values.py), so the recipes form a graph. DerivedValues
+walks it with memoization: every item is evaluated at most once per
+snapshot, however many recipes share it, and a cycle is reported instead of
+recursing forever. A recipe whose GE inputs are missing from the snapshot
+falls back to the item's hardcoded UNTRADEABLE_VALUES entry.
+"""
+
+from price_history import mid_price
+from untradeable_values import UNTRADEABLE_RECIPES, UNTRADEABLE_VALUES
+
+
+class DerivedValues:
+    """Untradeable item values for one GE snapshot ({id: {"high", "low"}})."""
+
+    def __init__(self, ge_prices: dict, recipes=UNTRADEABLE_RECIPES, table=UNTRADEABLE_VALUES):
+        self.ge_prices = ge_prices
+        self.recipes = recipes
+        self.table = table
+        self._memo: dict[int, int | None] = {}
+        self._active: set[int] = set()
+        self.priced = 0
+
+    def ge(self, item_id: int) -> int | None:
+        return mid_price(self.ge_prices.get(str(item_id))) or None
+
+    def _term(self, term) -> int | None:
+        """A term's value, or None if a GE input has no price."""
+        if isinstance(term, int):
+            return term
+        op, *args = term
+        if op == "ge":
+            return self.ge(args[0])
+        if op == "value":
+            return self.value(args[0])
+        if op == "mul":
+            base = self._term(args[0])
+            return None if base is None else round(base * args[1])
+        if op == "sum":
+            parts = [self._term(t) for t in args]
+            return None if None in parts else sum(parts)
+        raise ValueError(f"unknown recipe term {op!r}")
+
+    def derived(self, item_id: int) -> int | None:
+        """The recipe's value for item_id (memoized); None without a usable recipe."""
+        if item_id in self._memo:
+            return self._memo[item_id]
+        recipe = self.recipes.get(item_id)
+        if recipe is None:
+            return None
+        if item_id in self._active:
+            raise ValueError(f"untradeable recipe cycle through item {item_id}")
+        self._active.add(item_id)
+        try:
+            self._memo[item_id] = self._term(recipe)
+        finally:
+            self._active.discard(item_id)
+        return self._memo[item_id]
+
+    def value(self, item_id: int) -> int | None:
+        """Recipe value, else the hardcoded table, else the item's own GE price."""
+        derived = self.derived(item_id)
+        if derived is not None:
+            return derived
+        if item_id in self.table:
+            return self.table[item_id]
+        return self.ge(item_id)
+
+    def table_with_recipes(self) -> dict[int, int]:
+        """UNTRADEABLE_VALUES with every evaluable recipe applied: one pass over the graph."""
+        values = dict(self.table)
+        self.priced = 0
+        for item_id in self.recipes:
+            derived = self.derived(item_id)
+            if derived is not None:
+                values[item_id] = derived
+                self.priced += 1
+        return values
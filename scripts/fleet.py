@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Run update_stats for a whole roster of accounts through a bounded worker pool.
+
+The roster is a text file with one account per line, optionally followed by
+its hiscores board (the default is --hiscores-variant):
+
+    # rsn | hiscores variant
+    FoolinSlays
+    GIM Foolin | hiscore_oldschool
+
+Each account is updated in-process with update_stats.update_account() into
+<out>/<slug>/, reading any YAML already there (dates, CAs, quests), with its
+output going to <queue dir>/logs/<slug>.log. The Temple item map is fetched
+once and shared. With --db the generated JSON goes into a SQLite database
+instead of the account dirs (see sqlite_store.py; its export command writes
+the files back out); the YAML inputs are still read from <out>/<slug>/.
+
+--schedule runs only the accounts scheduler.py says are due, within a daily
+request budget (--budget), and feeds each result back into it, so active
+accounts are refreshed often and dormant ones rarely. Run it on a short cron
+matching --run-every. The schedule is what makes these runs resumable, so
+the journal starts fresh each time: an account is due until an update of it
+finishes.
+
+Progress is journaled to a queue file (JSON lines, fsynced per event) as
+each account starts, finishes or fails, so an interrupted run picks up where
+it stopped: finished accounts are skipped, accounts that were mid-update
+are redone, and failures are retried until --max-attempts is spent (counted
+across runs). --fresh discards the journal.
+
+    python scripts/fleet.py roster.txt --workers 8
+    python scripts/fleet.py roster.txt --out /srv/fleet --queue /srv/fleet/queue.jsonl
+    python scripts/fleet.py roster.txt --db /srv/fleet/tracker.sqlite3
+    python scripts/fleet.py roster.txt --schedule --budget 2000 --run-every 1
+
+While running it prints throughput (accounts per minute, overall and over the
+last minute) and an ETA. At the end it writes fleet_report.json next to the
+queue with totals and every failed account with its last error.
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+
+import update_stats
+from instrumentation import run_instrumented
+from osrs_utils import CACHE_DIR
+from scheduler import DEFAULT_BUDGET, DEFAULT_RUN_EVERY, SCHEDULE_PATH, RefreshSchedule
+from sqlite_store import SqliteStore
+
+QUEUE_PATH = CACHE_DIR / "fleet" / "queue.jsonl"
+OUT_DIR = CACHE_DIR / "fleet" / "accounts"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+PROGRESS_EVERY = 10  # seconds between progress lines
+RATE_WINDOW = 60  # seconds of completions behind the "recent" rate
+
+
+def parse_roster(content: str, default_variant: str = update_stats.HISCORES_VARIANT) -> list[dict]:
+    """[{"rsn", "variant"}] in file order; repeated RSNs (case-insensitive) are dropped."""
+    accounts, seen = [], set()
+    for line in content.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        rsn, _, variant = (part.strip() for part in line.partition("|"))
+        if rsn.lower() in seen:
+            print(f"Roster: skipping repeated {rsn!r}")
+            continue
+        seen.add(rsn.lower())
+        accounts.append({"rsn": rsn, "variant": variant or default_variant})
+    return accounts
+
+
+def slug(rsn: str) -> str:
+    """Directory name for an RSN; the hiscores treat spaces and underscores alike."""
+    return re.sub(r"[^a-z0-9_-]", "", rsn.lower().replace(" ", "_")) or "_"
+
+
+class WorkQueue:
+    """Per-account status, journaled so a later run resumes from it.
+
+    Each line of the journal is one event: {"rsn", "status", "at", ...} with
+    status running / done / failed. An account's state is its last event.
+    """
+
+    def __init__(self, path: Path = QUEUE_PATH, *, fresh: bool = False):
+        self.path = path
+        self.state: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fresh:
+            path.unlink(missing_ok=True)
+        elif path.exists():
+            self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # a line torn by a crash mid-write
+                self._apply(event)
+
+    def _apply(self, event: dict):
+        entry = self.state.setdefault(event["rsn"].lower(), {"attempts": 0})
+        entry["status"] = event["status"]
+        if event["status"] == "running":
+            entry["attempts"] += 1
+        for key in ("error", "seconds"):
+            if key in event:
+                entry[key] = event[key]
+
+    def close(self):
+        self._file.close()
+
+    def record(self, rsn: str, status: str, **fields):
+        event = {"rsn": rsn, "status": status, "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                 **fields}
+        with self._lock:
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._apply(event)
+
+    def status(self, rsn: str) -> dict:
+        return self.state.get(rsn.lower(), {"status": "pending", "attempts": 0})
+
+    def todo(self, accounts: list[dict], max_attempts: int) -> list[dict]:
+        """Accounts still to run: not done, with attempts left (interrupted ones included)."""
+        return [a for a in accounts
+                if self.status(a["rsn"])["status"] != "done" and self.status(a["rsn"])["attempts"] < max_attempts]
+
+
+class Throughput:
+    """Completed accounts per minute, overall and over the last RATE_WINDOW seconds."""
+
+    def __init__(self, now: float | None = None):
+        self.started = time.monotonic() if now is None else now
+        self.finished: deque[float] = deque()
+        self.count = 0
+
+    def add(self, now: float | None = None):
+        now = time.monotonic() if now is None else now
+        self.count += 1
+        self.finished.append(now)
+
+    def per_minute(self, now: float | None = None) -> float:
+        now = time.monotonic() if now is None else now
+        return self.count * 60 / max(now - self.started, 1e-9)
+
+    def recent_per_minute(self, now: float | None = None) -> float:
+        now = time.monotonic() if now is None else now
+        while self.finished and now - self.finished[0] > RATE_WINDOW:
+            self.finished.popleft()
+        return len(self.finished) * 60 / min(RATE_WINDOW, max(now - self.started, 1e-9))
+
+
+_account_log: ContextVar = ContextVar("fleet_account_log", default=None)
+
+
+class _AccountOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends an account's prints to its log.
+
+    Keyed on a context variable rather than the thread, so prints from the
+    fetch threads update_stats starts for an account land in the same log.
+    """
+
+    def __init__(self, default):
+        self.default = default
+
+    def write(self, text: str) -> int:
+        return (_account_log.get() or self.default).write(text)
+
+    def flush(self):
+        (_account_log.get() or self.default).flush()
+
+
+def update_one(account: dict, out_dir: Path, item_names: dict | None, store: SqliteStore | None = None) -> dict:
+    """Run update_stats for one account; raises if its hiscores couldn't be fetched."""
+    data_dir = out_dir / slug(account["rsn"])
+    if store is None:
+        result = update_stats.update_account(account["rsn"], data_dir,
+                                             hiscores_variant=account["variant"], item_names=item_names)
+    else:
+        with store.capture(account["rsn"], data_dir):
+            result = update_stats.update_account(account["rsn"], data_dir,
+                                                 hiscores_variant=account["variant"], item_names=item_names)
+    if not result["hiscores"]:
+        raise RuntimeError("hiscores unavailable (not on this board, or the service is down)")
+    return result
+
+
+def run_fleet(accounts: list[dict], queue: WorkQueue, out_dir: Path = OUT_DIR, *,
+              workers: int = DEFAULT_WORKERS, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+              item_names: dict | None = None, log_dir: Path | None = None,
+              progress_every: float = PROGRESS_EVERY, store: SqliteStore | None = None,
+              schedule: RefreshSchedule | None = None) -> dict:
+    """Update every pending account; returns the run summary (also the report's body).
+
+    With a store, each account's generated files go into it instead of its dir.
+    With a schedule, each finished update is recorded in it, and so is each
+    failure once its retries are spent; the caller saves it.
+    """
+    log_dir = log_dir or queue.path.parent / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    todo = deque(queue.todo(accounts, max_attempts))
+    already_done = sum(queue.status(a["rsn"])["status"] == "done" for a in accounts)
+    print(f"Fleet: {len(accounts)} accounts, {already_done} already done, {len(todo)} to run "
+          f"with {workers} workers")
+
+    output = _AccountOutput(sys.stdout)
+
+    def job(account: dict) -> dict:
+        with open(log_dir / f"{slug(account['rsn'])}.log", "w", encoding="utf-8") as log:
+            token = _account_log.set(log)
+            try:
+                return update_one(account, out_dir, item_names, store)
+            finally:
+                _account_log.reset(token)
+
+    rate = Throughput()
+    counts = {"done": 0, "failed": 0}
+    inflight: dict = {}
+
+    def settle(future, retry: bool = True):
+        account, started = inflight.pop(future)
+        seconds = round(time.monotonic() - started, 2)
+        error = future.exception()
+        if error is None:
+            result = future.result()
+            queue.record(account["rsn"], "done", seconds=seconds,
+                         temple=result["temple"], clog_source=result["clog_source"])
+            counts["done"] += 1
+            if schedule is not None:
+                schedule.observe(account["rsn"], result.get("total_xp"), result.get("temple_synced"))
+        else:
+            queue.record(account["rsn"], "failed", seconds=seconds, error=f"{type(error).__name__}: {error}")
+            counts["failed"] += 1
+            if retry and queue.status(account["rsn"])["attempts"] < max_attempts:
+                todo.append(account)  # retried after the rest of the roster
+            elif schedule is not None:
+                schedule.failed(account["rsn"])
+        rate.add()
+
+    interrupted = False
+    last_progress = time.monotonic()
+    with redirect_stdout(output), ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while todo or inflight:
+                while todo and len(inflight) < workers:
+                    account = todo.popleft()
+                    queue.record(account["rsn"], "running")
+                    inflight[pool.submit(job, account)] = (account, time.monotonic())
+                finished, _ = wait(inflight, timeout=progress_every, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    settle(future)
+                if time.monotonic() - last_progress >= progress_every:
+                    last_progress = time.monotonic()
+                    print(_progress_line(counts, len(todo) + len(inflight), rate))
+        except KeyboardInterrupt:
+            interrupted = True
+            todo.clear()
+            print(f"Interrupted: letting {len(inflight)} running account(s) finish...")
+    # Only reached after the pool has drained, so every in-flight update is finished.
+    for future in list(inflight):
+        settle(future, retry=False)
+
+    failures = [{"rsn": a["rsn"], **queue.status(a["rsn"])} for a in accounts
+                if queue.status(a["rsn"])["status"] == "failed"]
+    summary = {
+        "accounts": len(accounts),
+        "done": sum(queue.status(a["rsn"])["status"] == "done" for a in accounts),
+        "failed": len(failures),
+        "ran": counts,
+        "seconds": round(time.monotonic() - rate.started, 1),
+        "accounts_per_minute": round(rate.per_minute(), 2),
+        "interrupted": interrupted,
+        "failures": failures,
+    }
+    print(_progress_line(counts, 0, rate))
+    print(f"Fleet: {summary['done']}/{len(accounts)} done, {len(failures)} failed"
+          + (" (interrupted; rerun to resume)" if interrupted else ""))
+    for failure in failures[:20]:
+        print(f"  FAILED {failure['rsn']} after {failure['attempts']} attempt(s): {failure.get('error')}")
+    if len(failures) > 20:
+        print(f"  ... and {len(failures) - 20} more (see fleet_report.json)")
+    return summary
+
+
+def _progress_line(counts: dict, remaining: int, rate: Throughput) -> str:
+    recent = rate.recent_per_minute()
+    eta = f", ETA {remaining / recent:.0f} min" if remaining and recent else ""
+    return (f"  {counts['done']} done, {counts['failed']} failed, {remaining} left | "
+            f"{rate.per_minute():.1f} accounts/min ({recent:.1f} over the last minute){eta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("roster", type=Path, help="one RSN per line, optionally 'RSN | hiscores variant'")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="parent of the per-account data dirs")
+    parser.add_argument("--queue", type=Path, default=QUEUE_PATH, help="journal file for resuming")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    parser.add_argument("--hiscores-variant", default=update_stats.HISCORES_VARIANT)
+    parser.add_argument("--fresh", action="store_true", help="discard the journal and start over")
+    parser.add_argument("--db", type=Path, help="write generated files into this SQLite database")
+    parser.add_argument("--schedule", type=Path, nargs="?", const=SCHEDULE_PATH,
+                        help=f"only run accounts due on this adaptive schedule (default {SCHEDULE_PATH})")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="with --schedule: upstream requests/day")
+    parser.add_argument("--run-every", type=float, default=DEFAULT_RUN_EVERY,
+                        help="with --schedule: hours between scheduled runs")
+    args = parser.parse_args()
+
+    accounts = parse_roster(args.roster.read_text(encoding="utf-8"), args.hiscores_variant)
+    schedule = RefreshSchedule(args.schedule) if args.schedule else None
+    if schedule is not None:
+        roster = len(accounts)
+        accounts = schedule.due(accounts, args.budget, args.run_every)
+        print(f"Schedule: {len(accounts)}/{roster} accounts due")
+    queue = WorkQueue(args.queue, fresh=args.fresh or schedule is not None)
+    store = SqliteStore(args.db) if args.db else None
+    started = datetime.now(timezone.utc)
+    try:
+        # One Temple item map for the whole run instead of one download per account.
+        item_names = update_stats.load_item_names() or None if queue.todo(accounts, args.max_attempts) else None
+        summary = run_fleet(accounts, queue, args.out, workers=args.workers,
+                            max_attempts=args.max_attempts, item_names=item_names, store=store,
+                            schedule=schedule)
+    finally:
+        queue.close()
+        if store is not None:
+            store.close()
+        if schedule is not None:
+            schedule.save()
+    report = {"roster": str(args.roster), "started": started.isoformat(),
+              "finished": datetime.now(timezone.utc).isoformat(), **summary}
+    report_path = args.queue.parent / "fleet_report.json"
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report: {report_path}")
+    if summary["failed"] or summary["interrupted"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "fleet")
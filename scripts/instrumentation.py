@@ -0,0 +1,427 @@
+"""
+Timing spans, per-host HTTP metrics, cProfile and tracemalloc for every script.
+
+Nested spans, aggregated by name under their parent:
+
+    with span("collection log"):
+        ...
+    @timed()                     # span named after the function
+    def process_temple_clog(...):
+
+run_instrumented(main, label) wraps a script's main(), prints the top-level
+spans against the previous run plus the per-host HTTP table (http_metrics,
+recorded by osrs_utils.fetch_json), and writes both to
+.cache/timings/<label>.json (plus a line per run in <label>.history.jsonl).
+OSRS_PROFILE=1 also runs main() under cProfile and writes <label>.prof and a
+pstats report, <label>.pstats.txt (main thread only). Spans opened in worker
+threads attach to the run's root.
+
+OSRS_TRACEMALLOC=N runs main() under tracemalloc. Every main-thread span
+records its peak traced memory and what it left allocated (retained), and
+spans up to N levels deep (1 = top-level stages) also diff snapshots taken
+at entry and exit into the allocation sites that grew. A site is the
+innermost line in this repo's scripts that led to the allocation, plus its
+caller, so json.load inside load_json reports where it was called from.
+Frames in this module are never sites. Snapshots are slow on big heaps;
+span timings are inflated in this mode.
+
+This module imports nothing from the rest of the repo, so osrs_utils can
+time its own helpers with it.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# HTTP metrics
+# ---------------------------------------------------------------------------
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class HttpMetrics:
+    """Per-host request metrics recorded by fetch_json (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts: dict[str, dict] = {}
+
+    def reset(self):
+        with self._lock:
+            self.hosts.clear()
+
+    def _host(self, host: str) -> dict:
+        h = self.hosts.get(host)
+        if h is None:
+            h = self.hosts[host] = {
+                "requests": 0, "ok": 0, "errors": 0, "retries": 0, "gave_up": 0,
+                "bytes": 0, "latency_ms_total": 0.0, "latency_ms_max": 0.0,
+                "latency_hist": [0] * (len(LATENCY_BUCKETS_MS) + 1), "backoff_s": 0.0,
+            }
+        return h
+
+    def request(self, host: str, seconds: float, nbytes: int = 0, ok: bool = True):
+        ms = seconds * 1000
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            h = self._host(host)
+            h["requests"] += 1
+            h["ok" if ok else "errors"] += 1
+            h["bytes"] += nbytes
+            h["latency_ms_total"] += ms
+            h["latency_ms_max"] = max(h["latency_ms_max"], ms)
+            h["latency_hist"][bucket] += 1
+
+    def retry(self, host: str, backoff_seconds: float):
+        with self._lock:
+            h = self._host(host)
+            h["retries"] += 1
+            h["backoff_s"] += backoff_seconds
+
+    def gave_up(self, host: str):
+        with self._lock:
+            self._host(host)["gave_up"] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "latency_buckets_ms": [*LATENCY_BUCKETS_MS, None],
+                "hosts": {host: {**h, "latency_ms_total": round(h["latency_ms_total"], 1),
+                                 "latency_ms_max": round(h["latency_ms_max"], 1),
+                                 "backoff_s": round(h["backoff_s"], 2)}
+                          for host, h in sorted(self.hosts.items())},
+            }
+
+    def summary_lines(self) -> list[str]:
+        """The end-of-run table, slowest host first."""
+        hosts = sorted(self.to_dict()["hosts"].items(), key=lambda kv: -kv[1]["latency_ms_total"])
+        if not hosts:
+            return []
+        lines = [f"  {'host':<34} {'reqs':>5} {'err':>4} {'retry':>5} {'gave up':>7} {'KiB':>9}"
+                 f" {'avg ms':>8} {'max ms':>8} {'backoff s':>9}"]
+        for host, h in hosts:
+            avg = h["latency_ms_total"] / h["requests"] if h["requests"] else 0
+            lines.append(f"  {host:<34} {h['requests']:>5} {h['errors']:>4} {h['retries']:>5} {h['gave_up']:>7}"
+                         f" {h['bytes'] / 1024:>9.1f} {avg:>8.0f} {h['latency_ms_max']:>8.0f} {h['backoff_s']:>9.1f}")
+        return lines
+
+
+# Metrics for the current run; run_instrumented() resets, prints and saves them.
+http_metrics = HttpMetrics()
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def _memory_depth(value: str) -> int:
+    value = value.strip().lower()
+    if value in ("true", "yes"):
+        return 1
+    return int(value) if value.isdigit() else 0
+
+
+# osrs_utils.CACHE_DIR/timings; this module sits below osrs_utils, so it reads the env itself.
+TIMINGS_DIR = (Path(os.environ["OSRS_CACHE_DIR"]) if os.environ.get("OSRS_CACHE_DIR")
+               else Path(__file__).parent.parent / ".cache") / "timings"
+PROFILE = os.environ.get("OSRS_PROFILE", "").lower() in ("1", "true", "yes")
+TRACE_MEMORY = _memory_depth(os.environ.get("OSRS_TRACEMALLOC", ""))
+MEMORY_FRAMES = 16
+MEMORY_TOP_SITES = 10
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent)
+# Frames in this file are span/run machinery, never an allocation site of interest.
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class Span:
+    __slots__ = ("name", "calls", "seconds", "children", "peak", "retained", "sites")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.children: dict[str, Span] = {}
+        self.peak: int | None = None  # bytes; None unless traced
+        self.retained = 0
+        self.sites: dict[str, list[int]] | None = None  # site -> [size, count] growth
+
+    def add_memory(self, peak: int, retained: int, sites: dict[str, list[int]] | None):
+        self.peak = peak if self.peak is None else max(self.peak, peak)
+        self.retained += retained
+        if sites is not None:
+            merged = self.sites if self.sites is not None else {}
+            for site, (size, count) in sites.items():
+                total = merged.setdefault(site, [0, 0])
+                total[0] += size
+                total[1] += count
+            self.sites = merged
+
+    def top_sites(self, n: int = MEMORY_TOP_SITES) -> list[dict]:
+        ranked = sorted((self.sites or {}).items(), key=lambda kv: -kv[1][0])[:n]
+        return [{"site": site, "kb": round(size / 1024, 1), "blocks": count}
+                for site, (size, count) in ranked if size > 0]
+
+    def to_dict(self) -> dict:
+        out = {"name": self.name, "calls": self.calls, "seconds": round(self.seconds, 4)}
+        if self.peak is not None:
+            out["memory"] = {"peak_kb": round(self.peak / 1024, 1), "retained_kb": round(self.retained / 1024, 1)}
+            if self.sites is not None:
+                out["memory"]["sites"] = self.top_sites()
+        if self.children:
+            out["children"] = [c.to_dict() for c in self.children.values()]
+        return out
+
+    def flatten(self, prefix: str = "") -> dict[str, float]:
+        """{"a/b/c": seconds} for every span below this one."""
+        out = {}
+        for child in self.children.values():
+            path = f"{prefix}{child.name}"
+            out[path] = round(child.seconds, 4)
+            out.update(child.flatten(path + "/"))
+        return out
+
+
+_root = Span("run")
+_span_lock = threading.Lock()
+_local = threading.local()
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_local, "stack", None)
+    if not stack or stack[0] is not _root:
+        stack = _local.stack = [_root]
+    return stack
+
+
+class _MemoryFrame:
+    """Traced memory at a span's entry, the peak seen while open, and optionally its sites."""
+    __slots__ = ("start", "peak", "sites")
+
+    def __init__(self, sites: dict[str, list[int]] | None):
+        self.sites = sites
+        # Measured after the site table is built: it stays alive until exit, so it cancels out.
+        self.start = self.peak = tracemalloc.get_traced_memory()[0]
+
+
+def _memory_frames() -> list[_MemoryFrame]:
+    frames = getattr(_local, "memory", None)
+    if frames is None:
+        frames = _local.memory = []
+    return frames
+
+
+def _fold_peak(frames: list[_MemoryFrame]) -> int:
+    """Credit the peak since the last reset to every open frame, reset it; returns current bytes."""
+    current, peak = tracemalloc.get_traced_memory()
+    for frame in frames:
+        frame.peak = max(frame.peak, peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+def _instrumentation(frame: tracemalloc.Frame) -> bool:
+    return frame.filename == _THIS_FILE
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    """The innermost repo frame (and its repo caller) behind an allocation."""
+    ours = [f for f in reversed(traceback) if f.filename.startswith(_SCRIPTS_DIR) and not _instrumentation(f)]
+    frames = ours[:2] or [traceback[-1]]
+    return " <- ".join(f"{Path(f.filename).name}:{f.lineno}" for f in frames)
+
+
+def _site_sizes() -> dict[str, list[int]]:
+    out: dict[str, list[int]] = {}
+    for stat in tracemalloc.take_snapshot().statistics("traceback"):
+        innermost = stat.traceback[-1]
+        if _instrumentation(innermost) or innermost.filename == tracemalloc.__file__:
+            continue  # the site tables of open spans, and tracemalloc's own bookkeeping
+        total = out.setdefault(_site(stat.traceback), [0, 0])
+        total[0] += stat.size
+        total[1] += stat.count
+    return out
+
+
+def _memory_enter(depth: int) -> _MemoryFrame | None:
+    """Open a memory frame for a span at `depth` (main thread only; threads share the heap)."""
+    if not tracemalloc.is_tracing() or threading.current_thread() is not threading.main_thread():
+        return None
+    frames = _memory_frames()
+    _fold_peak(frames)
+    frame = _MemoryFrame(_site_sizes() if depth <= TRACE_MEMORY else None)
+    tracemalloc.reset_peak()
+    frames.append(frame)
+    return frame
+
+
+def _memory_exit(frame: _MemoryFrame) -> tuple[int, int, dict[str, list[int]] | None]:
+    """(peak, retained, site growth) for a frame opened by _memory_enter."""
+    frames = _memory_frames()
+    current = _fold_peak(frames)
+    if frames and frames[-1] is frame:
+        frames.pop()
+    sites = None
+    if frame.sites is not None:
+        before, after = frame.sites, _site_sizes()
+        sites = {}
+        for site in before.keys() | after.keys():
+            size0, count0 = before.get(site, (0, 0))
+            size1, count1 = after.get(site, (0, 0))
+            if size1 != size0:
+                sites[site] = [size1 - size0, count1 - count0]
+    return frame.peak, current - frame.start, sites
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as a child of the innermost open span."""
+    stack = _stack()
+    parent = stack[-1]
+    with _span_lock:
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = Span(name)
+    memory = _memory_enter(len(stack)) if TRACE_MEMORY else None
+    stack.append(node)
+    start = time.perf_counter()
+    try:
+        yield node
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        measured = _memory_exit(memory) if memory is not None else None
+        with _span_lock:
+            node.calls += 1
+            node.seconds += elapsed
+            if measured is not None:
+                node.add_memory(*measured)
+
+
+def timed(name: str | None = None) -> Callable:
+    """Decorator form of span(); defaults to the function's name."""
+    def wrap(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):8.1f} MB"
+
+
+def memory_summary_lines(root: Span, depth: int | None = None, sites: int = 3) -> list[str]:
+    """Peak/retained per traced span (indented by depth) with each one's top growing sites."""
+    if root.peak is None:
+        return []
+    depth = TRACE_MEMORY if depth is None else depth
+    lines = [f"  {'(run)':<34} peak {_mb(root.peak)}  retained {_mb(root.retained)}"]
+
+    def walk(node: Span, level: int):
+        for child in sorted(node.children.values(), key=lambda c: -(c.peak or 0)):
+            if child.peak is None:
+                continue
+            name = "  " * (level - 1) + child.name
+            lines.append(f"  {name:<34} peak {_mb(child.peak)}  retained {_mb(child.retained)}")
+            for site in child.top_sites(sites):
+                lines.append(f"  {'':<{2 * level}}+{site['kb']:>10,.1f} KB  {site['site']}")
+            if level < depth:
+                walk(child, level + 1)
+
+    walk(root, 1)
+    lines.append("  Still allocated at exit:")
+    lines += [f"    {site['kb']:>10,.1f} KB  {site['site']}" for site in root.top_sites(5)]
+    return lines
+
+
+def write_timings(label: str, started: datetime, root: Span, out_dir: Path | None = None) -> dict:
+    """Write <label>.json and append to <label>.history.jsonl; returns the report."""
+    out_dir = out_dir or TIMINGS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{label}.json"
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = None
+    report = {
+        "label": label,
+        "started": started.isoformat(),
+        "seconds": round(root.seconds, 4),
+        "spans": [c.to_dict() for c in root.children.values()],
+        "http": http_metrics.to_dict(),
+    }
+    history = {"started": report["started"], "seconds": report["seconds"], "spans": root.flatten()}
+    if root.peak is not None:
+        report["memory"] = {
+            "frames": MEMORY_FRAMES, "snapshot_depth": TRACE_MEMORY,
+            "peak_kb": round(root.peak / 1024, 1), "retained_kb": round(root.retained / 1024, 1),
+            "sites": root.top_sites(),
+        }
+        history["peak_kb"] = report["memory"]["peak_kb"]
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    with open(out_dir / f"{label}.history.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(history) + "\n")
+
+    before = {s["name"]: s["seconds"] for s in (previous or {}).get("spans", [])}
+    print(f"Timings ({label}): {root.seconds:.2f}s -> {path}")
+    for child in sorted(root.children.values(), key=lambda c: -c.seconds):
+        delta = f" ({child.seconds - before[child.name]:+.2f}s)" if child.name in before else ""
+        print(f"  {child.name:<28} {child.seconds:8.2f}s{delta}")
+    http_lines = http_metrics.summary_lines()
+    if http_lines:
+        print("HTTP:")
+        print("\n".join(http_lines))
+    memory_lines = memory_summary_lines(root)
+    if memory_lines:
+        print("Memory (tracemalloc):")
+        print("\n".join(memory_lines))
+    return report
+
+
+def run_instrumented(main: Callable, label: str, out_dir: Path | None = None):
+    """Run a script's main() inside a root span (cProfile with OSRS_PROFILE=1, tracemalloc
+    with OSRS_TRACEMALLOC)."""
+    global _root
+    _root = Span(label)
+    http_metrics.reset()
+    out_dir = out_dir or TIMINGS_DIR
+    started = datetime.now(timezone.utc)
+    profiler = cProfile.Profile() if PROFILE else None
+    tracing = TRACE_MEMORY and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start(MEMORY_FRAMES)
+    _local.memory = []
+    memory = _memory_enter(0) if TRACE_MEMORY else None
+    start = time.perf_counter()
+    try:
+        if profiler is None:
+            return main()
+        return profiler.runcall(main)
+    finally:
+        _root.seconds = time.perf_counter() - start
+        _root.calls = 1
+        if memory is not None:
+            _root.add_memory(*_memory_exit(memory))
+        if tracing:
+            tracemalloc.stop()
+        write_timings(label, started, _root, out_dir)
+        if profiler is not None:
+            profiler.dump_stats(out_dir / f"{label}.prof")
+            with open(out_dir / f"{label}.pstats.txt", "w", encoding="utf-8") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(40)
+            print(f"Profile: {out_dir / (label + '.pstats.txt')}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cached OSRS Wiki item mapping with a normalized name -> ID index.
+
+update_bank.py needs item IDs for entries exported without one (potion
+storage). It used to download the full /mapping (~4 MB) on every run and only
+match names exactly, so "prayer potion (4)" never found "Prayer potion(4)".
+
+ItemMapping keeps [id, name] pairs in .cache/item_mapping.json and refetches
+only when the cache is missing, was written in an older format, or is older
+than MAPPING_TTL. A name that doesn't resolve triggers one refetch per run
+(at most once a day) in case the item is newer than the cache. Lookups go
+through normalize_name(), so each resolution is one dict hit:
+
+  - case-folded, whitespace collapsed, curly apostrophes straightened;
+  - dose and (unf) suffixes with or without a space: "Prayer potion (4)" and
+    "prayer potion(4)" match, as do "Ranarr potion(unf)" and "Ranarr potion (unf)";
+  - a potion named without a dose resolves to its highest-dose variant.
+"""
+
+import re
+import time
+from pathlib import Path
+
+from osrs_utils import CACHE_DIR, fetch_json, load_json, save_json
+from price_history import PRICES_API
+
+MAPPING_URL = f"{PRICES_API}/mapping"
+
+CACHE_PATH = CACHE_DIR / "item_mapping.json"
+# Bump when the cached layout or normalize_name() changes; older caches are refetched.
+CACHE_VERSION = 1
+MAPPING_TTL = 7 * 24 * 60 * 60
+MISS_REFRESH_AFTER = 24 * 60 * 60
+
+_SUFFIX = re.compile(r"\s*\(\s*(\d|unf)\s*\)$")
+
+
+def normalize_name(name: str) -> str:
+    key = " ".join(name.replace("\u2019", "'").casefold().split())
+    return _SUFFIX.sub(r"(\1)", key)
+
+
+def build_index(pairs) -> dict[str, int]:
+    """normalize_name(name) -> id, plus dose-less base names -> highest dose."""
+    index: dict[str, int] = {}
+    doses: dict[str, tuple[int, int]] = {}
+    for item_id, name in sorted(pairs):
+        key = normalize_name(name)
+        index.setdefault(key, item_id)  # lowest ID wins a collision
+        m = _SUFFIX.search(key)
+        if m and m.group(1).isdigit():
+            base, dose = key[:m.start()], int(m.group(1))
+            if base not in doses or dose > doses[base][0]:
+                doses[base] = (dose, item_id)
+    for base, (_, item_id) in doses.items():
+        index.setdefault(base, item_id)
+    return index
+
+
+class ItemMapping:
+    """Name -> item ID over the cached wiki mapping."""
+
+    def __init__(self, path: Path | None = CACHE_PATH, *, ttl: float = MAPPING_TTL, offline: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.offline = offline
+        self.pairs: list[list] = []
+        self.fetched = 0.0
+        self.index: dict[str, int] = {}
+        self._refetched = False
+        if not self._load_cache():
+            self.refresh()
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def _load_cache(self) -> bool:
+        """Use the cached mapping if it's current; returns whether it was."""
+        if self.path is None:
+            return False
+        try:
+            cached = load_json(self.path)
+        except (OSError, ValueError):
+            return False
+        if cached.get("version") != CACHE_VERSION or not cached.get("items"):
+            return False
+        self._set(cached["items"], cached.get("fetched", 0))
+        return self.offline or time.time() - self.fetched < self.ttl
+
+    def _set(self, pairs, fetched):
+        self.pairs = pairs
+        self.fetched = fetched
+        self.index = build_index(pairs)
+
+    def refresh(self) -> bool:
+        """Refetch /mapping; keeps whatever was cached if the request fails."""
+        if self.offline:
+            return False
+        self._refetched = True
+        print("Fetching item mapping...")
+        data = fetch_json(MAPPING_URL)
+        if not data:
+            return False
+        pairs = sorted([item["id"], item["name"]] for item in data if item.get("id") and item.get("name"))
+        self._set(pairs, time.time())
+        if self.path is not None:
+            save_json(self.path, {"version": CACHE_VERSION, "fetched": self.fetched, "items": pairs},
+                      skip_if_only_timestamp_changed=False, quiet=True, compact=False)
+        return True
+
+    def resolve(self, name: str) -> int | None:
+        key = normalize_name(name)
+        item_id = self.index.get(key)
+        if (item_id is None and not self._refetched
+                and time.time() - self.fetched > MISS_REFRESH_AFTER and self.refresh()):
+            item_id = self.index.get(key)
+        return item_id
+
+    def get(self, name: str, default=None):
+        """dict.get-compatible resolve()."""
+        item_id = self.resolve(name)
+        return default if item_id is None else item_id
@@ -7,6 +7,23 @@ edit in one place. Comments next to individual rules carry maintenance notes
 (priority ordering, deliberate keyword choices) — keep them when editing.
 """
 
+# ---------------------------------------------------------------------------
+# Accounts
+# ---------------------------------------------------------------------------
+
+# Every account the dashboard shows, in dropdown order. "dir" is relative to
+# the repo root and mirrors ACCOUNTS in app.js; "hiscores_variant" is the board
+# update_stats reads (GIM accounts aren't on the ironman board). "gear_targets"
+# marks accounts whose Gearing tab shows GEAR_TARGETS instead of the static
+# Ironman tables. Scripts that build every account in one invocation iterate
+# this table.
+ACCOUNTS = [
+    {"id": "main", "rsn": "FoolinSlays", "label": "FoolinSlays", "dir": "data",
+     "hiscores_variant": "hiscore_oldschool_ironman"},
+    {"id": "gim", "rsn": "GIM Foolin", "label": "GIM Foolin", "dir": "data/gim",
+     "hiscores_variant": "hiscore_oldschool", "gear_targets": True},
+]
+
 # ---------------------------------------------------------------------------
 # update_stats.py
 # ---------------------------------------------------------------------------
@@ -52,6 +69,155 @@ PET_NAMES = {
     'tektiny', 'vanguard', 'vasa minirio',
 }
 
+
+# ---------------------------------------------------------------------------
+# build_progression.py
+# ---------------------------------------------------------------------------
+
+# Progression milestones, evaluated per account at build time. Each milestone
+# is (name, detail, type, check); a check is a tuple naming a rule and its
+# arguments:
+#
+#   ("drop", name)             a drops.yaml item or obtained clog item contains name
+#   ("drop_count", name, n)    at least n drops.yaml entries whose item contains name
+#   ("drops_from", boss, n)    at least n drops.yaml entries from that boss
+#   ("skill", skill, level)    skill level >= level
+#   ("all_skills", level)      every skill >= level
+#   ("boss_kc", boss, kc)      first boss whose name contains boss has >= kc
+#   ("quest", name)            a completed quest contains name
+#   ("quests_completed", n)    at least n quests completed
+#   ("ca_tier_done", tier)     every task in that CA tier completed
+#   ("pets", n) / ("clog", n)  at least n pets / collection-log items
+#   ("any", [checks])          any of the nested checks
+#   ("always",)                counted as done (not tracked in the data)
+#
+# Name matching is case-insensitive substring, as the dashboard always did.
+PROGRESSION_PHASES = [
+    {"name": "Early Game", "phase": "early", "icon": "🌱", "description": "Building your foundation",
+     "milestones": [
+         ("Fire Cape", "Fight Caves", "drop", ("drop", "Fire Cape")),
+         ("Barrows Gloves", "Recipe for Disaster", "quest", ("quest", "Recipe for Disaster")),
+         ("Fighter Torso", "Barbarian Assault", "gear", ("always",)),
+         ("Dragon Defender", "Warriors Guild", "gear",
+          ("any", [("drop", "Dragon Defender"), ("skill", "Attack", 70)])),
+         ("Iban's Staff", "Underground Pass", "quest", ("always",)),
+         ("Berserker Ring", "Dagannoth Rex", "drop", ("drop", "Berserker Ring")),
+         ("70 Prayer", "Piety unlocked", "skill", ("skill", "Prayer", 70)),
+         ("75 Magic", "Trident access", "skill", ("skill", "Magic", 75)),
+         ("Full Barrows Set", "Any brother", "drop", ("drops_from", "Barrows", 4)),
+         ("Quest Cape", "All quests done", "quest", ("quests_completed", 158)),
+     ]},
+    {"name": "Mid Game", "phase": "mid", "icon": "⚔️", "description": "Gearing up for end game",
+     "milestones": [
+         ("Trident of the Seas", "Kraken", "drop", ("any", [("drop", "Trident"), ("boss_kc", "Kraken", 50)])),
+         ("Abyssal Whip", "Abyssal Demons", "drop", ("drop", "Abyssal Whip")),
+         ("Dragon Warhammer", "Lizardman Shamans", "drop", ("drop", "Dragon Warhammer")),
+         ("Zenyte Jewelry", "Demonic Gorillas", "drop", ("drop", "Zenyte")),
+         ("Occult Necklace", "Smoke Devils", "drop", ("any", [("drop", "Occult"), ("skill", "Slayer", 93)])),
+         ("87 Slayer", "Kraken unlocked", "skill", ("skill", "Slayer", 87)),
+         ("91 Slayer", "Cerberus unlocked", "skill", ("skill", "Slayer", 91)),
+         ("Elite Void", "Pest Control + diaries", "gear", ("always",)),
+         ("Dragon Pickaxe", "Wildy bosses", "drop", ("drop", "Dragon Pickaxe")),
+         ("Imbued Heart", "Superior Slayer", "drop", ("drop", "Imbued Heart")),
+     ]},
+    {"name": "Late Game", "phase": "late", "icon": "🔮", "description": "High-level PvM unlocks",
+     "milestones": [
+         ("Blade of Saeldor", "Corrupted Gauntlet", "drop",
+          ("any", [("drop", "Enhanced crystal weapon seed"), ("drop", "Blade of Saeldor")])),
+         ("Bowfa", "Corrupted Gauntlet", "drop", ("drop", "Enhanced crystal weapon seed")),
+         ("Full Crystal Armor", "6 armor seeds", "drop", ("drop_count", "Crystal armour seed", 6)),
+         ("Primordial Boots", "Cerberus", "drop", ("drop", "Primordial crystal")),
+         ("Pegasian Boots", "Cerberus", "drop", ("drop", "Pegasian crystal")),
+         ("Eternal Boots", "Cerberus", "drop", ("drop", "Eternal crystal")),
+         ("Infernal Cape", "The Inferno", "drop", ("drop", "Infernal Cape")),
+         ("Tormented Bracelet", "Zenyte + enchant", "gear", ("drop_count", "Zenyte", 2)),
+         ("Necklace of Anguish", "Zenyte + enchant", "gear", ("drop_count", "Zenyte", 3)),
+         ("95+ Slayer", "Hydra unlocked", "skill", ("skill", "Slayer", 95)),
+     ]},
+    {"name": "End Game", "phase": "end", "icon": "👑", "description": "Ultimate goals",
+     "milestones": [
+         ("Twisted Bow", "Chambers of Xeric", "drop", ("drop", "Twisted Bow")),
+         ("Scythe of Vitur", "Theatre of Blood", "drop", ("drop", "Scythe")),
+         ("Tumeken's Shadow", "Tombs of Amascut", "drop", ("drop", "Tumeken")),
+         ("Torva Armor", "Nex", "drop",
+          ("any", [("drop", "Torva platebody"), ("drop", "Torva platelegs"), ("drop", "Torva helm")])),
+         ("Masori Armor", "Tombs of Amascut", "drop",
+          ("any", [("drop", "Masori body"), ("drop", "Masori chaps"), ("drop", "Masori mask")])),
+         ("Max Cape", "All 99s", "skill", ("all_skills", 99)),
+         ("Grandmaster CAs", "All GM tasks", "achievement", ("ca_tier_done", "Grandmaster")),
+         ("All Pets", "Gotta catch em all", "collection", ("pets", 50)),
+         ("Completionist", "Collection log", "collection", ("clog", 1400)),
+         ("All Hard Diaries", "Every region", "achievement", ("always",)),
+     ]},
+]
+
+# Move to the next phase once the previous one is at least this % complete.
+PROGRESSION_PHASE_ADVANCE_PCT = 80
+
+# Gear progression targets by combat style and game stage, shown on the
+# Gearing tab for accounts with "gear_targets" set in ACCOUNTS. " / " separates
+# alternatives and " + " items worn together; ownership is looked up per item.
+GEAR_STAGES = [("low", "Low level"), ("mid", "Midgame"), ("end", "Endgame"), ("late", "Late game")]
+GEAR_TARGETS = {
+    "melee": {
+        "slots": ["Head", "Cape", "Neck", "Weapon", "Shield", "Body", "Legs", "Hands", "Feet", "Ring"],
+        "low": {"Head": "Helm of neitiznot", "Cape": "Obsidian cape", "Neck": "Amulet of glory",
+                "Weapon": "Dragon scimitar", "Shield": "Rune defender", "Body": "Rune platebody / Fighter torso",
+                "Legs": "Rune platelegs", "Hands": "Combat bracelet", "Feet": "Dragon boots",
+                "Ring": "Warrior ring (i)"},
+        "mid": {"Head": "Serpentine helm", "Cape": "Fire cape", "Neck": "Amulet of fury",
+                "Weapon": "Abyssal whip / tentacle", "Shield": "Dragon defender", "Body": "Fighter torso",
+                "Legs": "Obsidian platelegs", "Hands": "Barrows gloves", "Feet": "Dragon boots",
+                "Ring": "Berserker ring (i)"},
+        "end": {"Head": "Neitiznot faceguard", "Cape": "Infernal cape", "Neck": "Amulet of torture",
+                "Weapon": "Ghrazi rapier", "Shield": "Avernic defender", "Body": "Bandos chestplate",
+                "Legs": "Bandos tassets", "Hands": "Ferocious gloves", "Feet": "Primordial boots",
+                "Ring": "Ultor ring"},
+        "late": {"Head": "Torva full helm", "Cape": "Infernal cape", "Neck": "Amulet of rancour",
+                 "Weapon": "Scythe of vitur", "Shield": "Avernic defender", "Body": "Torva platebody",
+                 "Legs": "Torva platelegs", "Hands": "Ferocious gloves", "Feet": "Primordial boots",
+                 "Ring": "Ultor ring"},
+    },
+    "ranged": {
+        "slots": ["Head", "Cape", "Neck", "Weapon", "Ammo", "Body", "Legs", "Hands", "Feet", "Ring"],
+        "low": {"Head": "Archer helm", "Cape": "Ava's accumulator", "Neck": "Amulet of glory",
+                "Weapon": "Magic shortbow (i)", "Ammo": "Rune / amethyst arrows", "Body": "Black d'hide body",
+                "Legs": "Black d'hide chaps", "Hands": "Black d'hide vambraces", "Feet": "Snakeskin boots",
+                "Ring": "Archers ring (i)"},
+        "mid": {"Head": "Karil's coif", "Cape": "Ava's assembler", "Neck": "Amulet of fury",
+                "Weapon": "Toxic blowpipe / Rune crossbow", "Ammo": "Dragon darts / ruby+diamond bolts (e)",
+                "Body": "Armadyl chestplate", "Legs": "Armadyl chainskirt", "Hands": "Barrows gloves",
+                "Feet": "Ranger boots", "Ring": "Archers ring (i)"},
+        "end": {"Head": "Armadyl helmet", "Cape": "Ava's assembler", "Neck": "Necklace of anguish",
+                "Weapon": "Toxic blowpipe + Zaryte crossbow", "Ammo": "Dragon darts / dragon bolts (e)",
+                "Body": "Armadyl chestplate", "Legs": "Armadyl chainskirt", "Hands": "Zaryte vambraces",
+                "Feet": "Pegasian boots", "Ring": "Venator ring"},
+        "late": {"Head": "Masori mask (f)", "Cape": "Dizana's quiver", "Neck": "Necklace of anguish",
+                 "Weapon": "Twisted bow", "Ammo": "Dragon arrows", "Body": "Masori body (f)",
+                 "Legs": "Masori chaps (f)", "Hands": "Zaryte vambraces", "Feet": "Pegasian boots",
+                 "Ring": "Venator ring"},
+    },
+    "magic": {
+        "slots": ["Head", "Cape", "Neck", "Weapon", "Shield", "Body", "Legs", "Hands", "Feet", "Ring"],
+        "low": {"Head": "Farseer helm / Mystic hat", "Cape": "God cape", "Neck": "Amulet of magic",
+                "Weapon": "Trident of the seas", "Shield": "Unholy book", "Body": "Mystic robe top",
+                "Legs": "Mystic robe bottom", "Hands": "Combat bracelet", "Feet": "Infinity boots",
+                "Ring": "Seers ring (i)"},
+        "mid": {"Head": "Ahrim's hood", "Cape": "Imbued god cape", "Neck": "Occult necklace",
+                "Weapon": "Trident of the swamp", "Shield": "Mage's book / Tome of fire", "Body": "Ahrim's robetop",
+                "Legs": "Ahrim's robeskirt", "Hands": "Barrows gloves", "Feet": "Eternal boots",
+                "Ring": "Seers ring (i)"},
+        "end": {"Head": "Ancestral hat", "Cape": "Imbued god cape", "Neck": "Occult necklace",
+                "Weapon": "Sanguinesti staff", "Shield": "Elidinis' ward", "Body": "Ancestral robe top",
+                "Legs": "Ancestral robe bottom", "Hands": "Tormented bracelet", "Feet": "Eternal boots",
+                "Ring": "Magus ring"},
+        "late": {"Head": "Ancestral hat", "Cape": "Imbued god cape", "Neck": "Occult necklace",
+                 "Weapon": "Tumeken's shadow", "Shield": "Elidinis' ward (f)", "Body": "Ancestral robe top",
+                 "Legs": "Ancestral robe bottom", "Hands": "Tormented bracelet", "Feet": "Eternal boots",
+                 "Ring": "Magus ring"},
+    },
+}
+
 # ---------------------------------------------------------------------------
 # update_bank.py
 # ---------------------------------------------------------------------------
@@ -4,25 +4,60 @@ Shared helpers for the OSRS Ironman tracker scripts.
 
 Consolidates what used to be duplicated across update_stats.py and
 update_bank.py: HTTP fetching, JSON saving, date handling and the
-hand-rolled YAML-ish parsing used for the manually-edited data files.
+hand-rolled YAML-ish parsing used for the manually-edited data files. The
+timing spans, HTTP metrics and profiling every script reports through live
+in instrumentation.py.
 """
 
 import json
 import os
+import re
 import time
 import urllib.parse
 import urllib.request
 from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
+import compact_json
+from instrumentation import http_metrics, span
+
+REPO_ROOT = Path(__file__).parent.parent
+
 # Data directory. Override with OSRS_DATA_DIR to point at a specific account
 # (e.g. "data/gim") so the same scripts can build multiple accounts.
-DATA_DIR = Path(os.environ["OSRS_DATA_DIR"]) if os.environ.get("OSRS_DATA_DIR") else (Path(__file__).parent.parent / "data")
+DATA_DIR = Path(os.environ["OSRS_DATA_DIR"]) if os.environ.get("OSRS_DATA_DIR") else (REPO_ROOT / "data")
+
+# Local, git-ignored cache for derived data that is expensive to rebuild
+# (categorization memo, price history, ...). Override with OSRS_CACHE_DIR.
+CACHE_DIR = Path(os.environ["OSRS_CACHE_DIR"]) if os.environ.get("OSRS_CACHE_DIR") else (REPO_ROOT / ".cache")
 
 USER_AGENT = "OSRS-Ironman-Tracker/1.0 (github.com/foolish127)"
 
+# Base URL of a stand-in for every upstream API (scripts/upstream_sim.py). When
+# set, https://<host>/<path> is requested as <OSRS_UPSTREAM>/<host>/<path>.
+UPSTREAM = os.environ.get("OSRS_UPSTREAM", "").rstrip("/")
+
+# Set OSRS_COMPACT_JSON=1 to write generated files in the dictionary-encoded
+# compact format (see compact_json.py) instead of indented JSON.
+COMPACT_JSON = os.environ.get("OSRS_COMPACT_JSON", "").lower() in ("1", "true", "yes")
+
+
+def account_dirs(accounts: Iterable[dict]) -> list[Path]:
+    """Absolute data directories for a list of osrs_config.ACCOUNTS entries."""
+    return [REPO_ROOT / a["dir"] for a in accounts]
+
+
+def upstream_url(url: str) -> str:
+    """`url` routed through OSRS_UPSTREAM when it's set, else unchanged."""
+    if not UPSTREAM:
+        return url
+    parts = urllib.parse.urlsplit(url)
+    return f"{UPSTREAM}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
 
 # ---------------------------------------------------------------------------
 # HTTP
@@ -50,18 +85,29 @@ def fetch_json(
     if headers:
         hdrs.update(headers)
 
+    host = urllib.parse.urlsplit(url).hostname or "?"
     last_err: Exception | None = None
-    for attempt in range(1, retries + 1):
-        try:
-            req = urllib.request.Request(url, headers=hdrs)
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode())
-        except Exception as e:  # noqa: BLE001 - network/JSON errors are all non-fatal here
-            last_err = e
-            print(f"  fetch attempt {attempt}/{retries} failed for {url}: {e}")
-            if attempt < retries:
-                time.sleep(backoff * attempt)
-
+    with span(f"fetch {host}"):
+        for attempt in range(1, retries + 1):
+            start = time.perf_counter()
+            body = b""
+            try:
+                req = urllib.request.Request(upstream_url(url), headers=hdrs)
+                with urllib.request.urlopen(req, timeout=timeout) as resp:
+                    body = resp.read()
+                parsed = json.loads(body.decode())
+            except Exception as e:  # noqa: BLE001 - network/JSON errors are all non-fatal here
+                http_metrics.request(host, time.perf_counter() - start, len(body), ok=False)
+                last_err = e
+                print(f"  fetch attempt {attempt}/{retries} failed for {url}: {e}")
+                if attempt < retries:
+                    http_metrics.retry(host, backoff * attempt)
+                    time.sleep(backoff * attempt)
+                continue
+            http_metrics.request(host, time.perf_counter() - start, len(body))
+            return parsed
+
+    http_metrics.gave_up(host)
     print(f"Error fetching {url} (gave up after {retries} attempts): {last_err}")
     return None
 
@@ -77,24 +123,126 @@ def _strip_updated(obj: Any) -> Any:
     return obj
 
 
-def save_json(path: Path, data: Any, *, skip_if_only_timestamp_changed: bool = True) -> None:
+def load_json(path: Path) -> Any:
+    """Read a JSON file, expanding it if it was written in the compact format.
+
+    Raises like json.loads/read_text on a missing or malformed file. Inside
+    using_json_sink() a file the sink owns is read from the sink.
+    """
+    sink = _owning_sink(path)
+    if sink is None:
+        return compact_json.decode(json.loads(path.read_text(encoding="utf-8")))
+    text = sink.read(path)
+    if text is None:
+        raise FileNotFoundError(f"No {sink.label} document for {path}")
+    return compact_json.decode(json.loads(text))
+
+
+def json_text(data: Any, compact: bool) -> str:
+    """The exact text save_json() writes for `data`: indented, or the compact encoding."""
+    if compact:
+        return json.dumps(compact_json.encode(data), separators=(",", ":"))
+    return json.dumps(data, indent=2)
+
+
+def only_timestamp_changed(old_text: str, data: Any, compact: bool) -> bool:
+    """Whether previously written text already holds `data` in the same format, 'updated' aside."""
+    raw = json.loads(old_text)
+    return compact_json.is_compact(raw) == compact and _strip_updated(compact_json.decode(raw)) == _strip_updated(data)
+
+
+_json_sink: ContextVar[Any] = ContextVar("osrs_json_sink", default=None)
+
+
+@contextmanager
+def using_json_sink(sink):
+    """Send this context's JSON reads and writes to `sink` instead of the filesystem.
+
+    For a path sink.owns(), save_json() calls sink.save(path, data, compact=,
+    skip_if_only_timestamp_changed=), which returns whether it stored the
+    document; load_json() and json_exists() use sink.read(path), the
+    document's text or None; remove_stale_json() calls
+    sink.retain(directory, names) instead of deleting anything. Other paths
+    go to disk as usual. sink.label tags the log line. Used by
+    sqlite_store.py (SqliteStore.capture) to capture an account's update.
+    """
+    token = _json_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _json_sink.reset(token)
+
+
+def _owning_sink(path: Path):
+    sink = _json_sink.get()
+    return sink if sink is not None and sink.owns(path) else None
+
+
+def json_exists(path: Path) -> bool:
+    """Whether load_json(path) has something to read (through the active sink, if it owns path)."""
+    sink = _owning_sink(path)
+    return path.exists() if sink is None else sink.read(path) is not None
+
+
+def remove_stale_json(directory: Path, keep: set[str]) -> int:
+    """Delete the JSON files in directory whose names aren't in `keep`; returns how many.
+
+    Inside using_json_sink() nothing on disk is touched: the sink is told
+    which names are still current and drops the rest itself.
+    """
+    sink = _owning_sink(directory)
+    if sink is not None:
+        sink.retain(directory, keep)
+        return 0
+    removed = 0
+    for stale in directory.glob("*.json"):
+        if stale.name not in keep:
+            stale.unlink()
+            removed += 1
+    return removed
+
+
+def save_json(
+    path: Path,
+    data: Any,
+    *,
+    skip_if_only_timestamp_changed: bool = True,
+    quiet: bool = False,
+    compact: bool | None = None,
+) -> bool:
     """Write JSON, optionally skipping rewrites that only bump 'updated'.
 
     Skipping timestamp-only changes keeps CI commits (and git history) limited
-    to real data changes instead of churning on every scheduled run.
+    to real data changes instead of churning on every scheduled run. Returns
+    whether the file was written; `quiet` drops the per-file log line for
+    callers that write many small files and summarize themselves. `compact`
+    (default: COMPACT_JSON) writes the dictionary-encoded format instead of
+    indented JSON; switching formats alone counts as a change. Inside
+    using_json_sink() the document goes to the sink instead.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if skip_if_only_timestamp_changed and path.exists():
-        try:
-            old = json.loads(path.read_text(encoding="utf-8"))
-            if _strip_updated(old) == _strip_updated(data):
-                print(f"Unchanged: {path}")
-                return
-        except Exception:  # noqa: BLE001 - unreadable old file just means "rewrite it"
-            pass
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    print(f"Saved: {path}")
+    with span("save_json"):
+        if compact is None:
+            compact = COMPACT_JSON
+        sink = _owning_sink(path)
+        if sink is not None:
+            stored = sink.save(path, data, compact=compact,
+                               skip_if_only_timestamp_changed=skip_if_only_timestamp_changed)
+            if not quiet:
+                print(f"{'Saved' if stored else 'Unchanged'}: {path} ({sink.label})")
+            return stored
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if skip_if_only_timestamp_changed and path.exists():
+            try:
+                if only_timestamp_changed(path.read_text(encoding="utf-8"), data, compact):
+                    if not quiet:
+                        print(f"Unchanged: {path}")
+                    return False
+            except Exception:  # noqa: BLE001 - unreadable old file just means "rewrite it"
+                pass
+        path.write_text(json_text(data, compact), encoding="utf-8")
+        if not quiet:
+            print(f"Saved: {path}")
+        return True
 
 
 # ---------------------------------------------------------------------------
@@ -149,6 +297,24 @@ def date_sort_key(value: Any) -> date:
     return parse_date(value) or date.min
 
 
+_ISO_MONTH = re.compile(r"^(\d{4})-(\d{1,2})")
+_US_MONTH = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def month_key(value: Any) -> str | None:
+    """Year-month key ('2026-06') from an ISO or M/D/YYYY date, like app.js ymKey."""
+    if not value:
+        return None
+    s = str(value).strip()
+    m = _ISO_MONTH.match(s)
+    if m:
+        return f"{m.group(1)}-{int(m.group(2)):02d}"
+    m = _US_MONTH.match(s)
+    if m:
+        return f"{m.group(3)}-{int(m.group(1)):02d}"
+    return None
+
+
 # ---------------------------------------------------------------------------
 # YAML-ish parsing for the manually-edited data files
 # ---------------------------------------------------------------------------
@@ -213,9 +379,123 @@ def check_no_dropped_items(
         print(f"  WARNING: {msg}")
 
 
+# The parsers below mirror the dashboard's own (app.js) line for line, so a
+# pre-parsed payload renders exactly as if the browser had parsed the YAML.
+
+DIARY_TIERS = ("easy", "medium", "hard", "elite")
+
+_LEADING_INT = re.compile(r"\s*([+-]?\d+)")
+
+
+def _js_int(value: str) -> int:
+    """parseInt(value) || 0: the leading integer of a string, else 0."""
+    m = _LEADING_INT.match(value)
+    return int(m.group(1)) if m else 0
+
+
+def parse_drops_yaml(content: str) -> list[dict]:
+    """Parse drops.yaml into [{'boss', 'kc', 'item', 'date', 'droprate', 'notes'}]."""
+    drops: list[dict] = []
+    current = None
+    for line in content.split('\n'):
+        s = line.strip()
+        if s.startswith('- boss:'):
+            if current:
+                drops.append(current)
+            current = {'boss': s[len('- boss:'):].strip()}
+        elif current is None:
+            continue
+        elif s.startswith('kc:'):
+            current['kc'] = _js_int(s[3:])
+        elif s.startswith('item:'):
+            current['item'] = s[5:].strip()
+        elif s.startswith('date:'):
+            current['date'] = s[5:].strip()
+        elif s.startswith('droprate:'):
+            current['droprate'] = _js_int(s[9:])
+        elif s.startswith('notes:'):
+            current['notes'] = s[6:].strip()
+    if current:
+        drops.append(current)
+    return drops
+
+
+def parse_diaries_yaml(content: str) -> dict:
+    """Parse diaries.yaml into {'regions': {region: {tier: value|None}}, 'tasks_completed', 'tasks_total'}."""
+    regions: dict = {}
+    tasks_completed, tasks_total = 0, 492
+    region = None
+    for line in content.split('\n'):
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('tasks_completed:'):
+            tasks_completed = _js_int(line.split(':')[1])
+        elif line.startswith('tasks_total:'):
+            tasks_total = _js_int(line.split(':')[1]) or 492
+        elif not line.startswith(' ') and line.endswith(':'):
+            region = line[:-1]
+            regions[region] = dict.fromkeys(DIARY_TIERS)
+        elif region and ':' in line.strip():
+            parts = [p.strip() for p in line.strip().split(':')]
+            if parts[0] in DIARY_TIERS:
+                regions[region][parts[0]] = parts[1] or None
+    return {'regions': regions, 'tasks_completed': tasks_completed, 'tasks_total': tasks_total}
+
+
+def parse_diary_tasks_yaml(content: str) -> dict:
+    """Parse diary_tasks.yaml into {region: {tier (lowercase): [tasks]}}."""
+    out: dict = {}
+    region = tier = None
+    for raw in content.split('\n'):
+        s = raw.strip()
+        if not s or s.startswith('#'):
+            continue
+        indent = len(raw) - len(raw.lstrip())
+        if indent == 0 and s.endswith(':'):
+            region, tier = s[:-1], None
+            out[region] = {}
+        elif indent == 2 and s.endswith(':') and region:
+            tier = s[:-1].lower()
+            out[region][tier] = []
+        elif s.startswith('- ') and region and tier:
+            out[region][tier].append(s[2:].strip())
+    return out
+
+
+def parse_clog_categories(content: str) -> list[dict]:
+    """Parse clog_categories.yaml ('Bosses: 115/333') into [{'name', 'obtained', 'total'}]."""
+    out = []
+    for line in content.split('\n'):
+        s = line.strip()
+        if not s or s.startswith('#') or ':' not in s:
+            continue
+        name, val = s.split(':')[:2]
+        counts = [_js_int(n) for n in val.split('/')] + [0, 0]
+        out.append({'name': name.strip(), 'obtained': counts[0], 'total': counts[1]})
+    return out
+
+
+_data_dir: ContextVar[Path | None] = ContextVar("osrs_data_dir", default=None)
+
+
+def data_dir() -> Path:
+    """The data dir for the current context: using_data_dir()'s, else DATA_DIR."""
+    return _data_dir.get() or DATA_DIR
+
+
+@contextmanager
+def using_data_dir(path: Path):
+    """Point read_data_file() at `path` for this thread/context (fleet workers run several accounts)."""
+    token = _data_dir.set(Path(path))
+    try:
+        yield
+    finally:
+        _data_dir.reset(token)
+
+
 def read_data_file(name: str) -> str | None:
     """Read a file from the data dir, or return None if it doesn't exist."""
-    path = DATA_DIR / name
+    path = data_dir() / name
     if not path.exists():
         print(f"Data file not found: {path}")
         return None
@@ -235,3 +515,16 @@ def names_lower(items: Iterable) -> set:
         if name:
             out.add(name.lower())
     return out
+
+
+# ---------------------------------------------------------------------------
+# Run labels
+# ---------------------------------------------------------------------------
+
+def data_dir_label(script: str) -> str:
+    """'update_stats' -> 'update_stats-data-gim' for OSRS_DATA_DIR=data/gim."""
+    try:
+        rel = DATA_DIR.resolve().relative_to(REPO_ROOT.resolve()).as_posix()
+    except ValueError:
+        rel = DATA_DIR.name
+    return f"{script}-{rel.replace('/', '-')}"
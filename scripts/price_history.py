@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Local GE price history from the OSRS Wiki prices API.
+
+update_bank.py used to download the whole /latest snapshot on every run and
+throw it away. PriceStore keeps every snapshot instead, as per-item time
+series in .cache/ge_prices.json.gz:
+
+    {"version": 2,
+     "fetched": {"latest": <epoch s>, "5m": ..., "timeseries:24h:4151": ...},
+     "latest":  {"4151": [[<epoch s>, high, low], ...], ...},
+     "average": {"4151": [[<epoch s>, avg high, avg low], ...], ...}}
+
+/latest snapshots and the window/timeseries averages are kept apart, so a
+later average can never stand in for the instant price update_bank values
+the bank with. Rows are sorted by time and a row is only appended when the
+item's price moved, so an item that didn't trade between runs costs
+nothing; an item that drops out of /latest gets a [time, null, null] row.
+Each source has a freshness TTL: a bank run inside the TTL of the last
+/latest fetch gets exactly that snapshot back from the store and makes no
+request at all.
+
+Sources (all optional except /latest, which update_bank uses):
+
+  latest                 instant high/low, stamped with the fetch time
+                         ("latest" series)
+  5m, 1h                 average high/low over the window, stamped with the
+                         window's timestamp ("average" series)
+  timeseries             up to 365 points of history for one item
+                         (timestep 5m / 1h / 6h / 24h), for backfilling
+                         ("average" series)
+
+prices_at(when) answers "what was everything worth at this moment" from the
+stored rows alone (the newest row of either series), so bank value can be
+recomputed for any past date:
+
+    python scripts/price_history.py fetch [--source latest|5m|1h] [--ttl SECONDS]
+    python scripts/price_history.py backfill [--timestep 24h]   # bank items only
+    python scripts/price_history.py value --at 2026-05-01
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from instrumentation import run_instrumented
+from osrs_utils import CACHE_DIR, DATA_DIR, fetch_json, load_json
+
+PRICES_API = "https://prices.runescape.wiki/api/v1/osrs"
+
+STORE_PATH = CACHE_DIR / "ge_prices.json.gz"
+STORE_VERSION = 2
+SERIES = ("latest", "average")
+
+# Seconds a fetched snapshot stays fresh. OSRS_PRICE_TTL overrides the
+# /latest TTL (0 always refetches).
+DEFAULT_TTL = {
+    "latest": int(os.environ.get("OSRS_PRICE_TTL", 30 * 60)),
+    "5m": 5 * 60,
+    "1h": 60 * 60,
+    "timeseries": 24 * 60 * 60,
+}
+WINDOW_SOURCES = ("5m", "1h")
+TIMESTEPS = ("5m", "1h", "6h", "24h")
+
+
+class PriceStore:
+    """Per-item (time, high, low) series for /latest and for averages, plus the last fetch time per source."""
+
+    def __init__(self, path: Path | None = STORE_PATH):
+        self.path = path
+        self.fetched: dict[str, float] = {}
+        self.items: dict[str, list[list]] = {}  # /latest
+        self.averages: dict[str, list[list]] = {}  # /5m, /1h, /timeseries
+        self.dirty = False
+        if path is not None and path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            print(f"Price store unreadable, starting fresh: {self.path}")
+            return
+        if raw.get("version") == STORE_VERSION:
+            self.fetched = raw.get("fetched", {})
+            self.items = raw.get("latest", {})
+            self.averages = raw.get("average", {})
+
+    def save(self) -> bool:
+        """Write the store if anything was recorded since it was loaded."""
+        if self.path is None or not self.dirty:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": STORE_VERSION, "fetched": self.fetched, "latest": self.items, "average": self.averages}
+        # mtime=0 so an unchanged store is byte-identical.
+        with gzip.GzipFile(self.path, "wb", mtime=0) as f:
+            f.write(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        self.dirty = False
+        return True
+
+    # -- freshness ---------------------------------------------------------
+
+    def is_fresh(self, source: str, ttl: float, now: float | None = None) -> bool:
+        fetched = self.fetched.get(source)
+        return fetched is not None and (now if now is not None else time.time()) - fetched < ttl
+
+    def mark_fetched(self, source: str, now: float | None = None):
+        self.fetched[source] = now if now is not None else time.time()
+        self.dirty = True
+
+    # -- writing -----------------------------------------------------------
+
+    def _series(self, series: str) -> dict[str, list[list]]:
+        if series not in SERIES:
+            raise ValueError(f"unknown series {series!r} (expected one of {SERIES})")
+        return self.items if series == "latest" else self.averages
+
+    def add(self, item_id, ts: int, high: int | None, low: int | None, series: str = "latest", *,
+            allow_empty: bool = False) -> bool:
+        """Insert one price point; skipped if it repeats the previous row's prices.
+
+        A row with neither price is skipped unless `allow_empty` (how an item
+        that left /latest is marked).
+        """
+        if high is None and low is None and not allow_empty:
+            return False
+        series = self._series(series).setdefault(str(item_id), [])
+        ts = int(ts)
+        pos = bisect.bisect_right(series, ts, key=lambda row: row[0])
+        if pos and series[pos - 1][0] == ts:
+            if series[pos - 1][1:] == [high, low]:
+                return False
+            series[pos - 1] = [ts, high, low]
+        elif pos and series[pos - 1][1:] == [high, low]:
+            return False
+        else:
+            series.insert(pos, [ts, high, low])
+        self.dirty = True
+        return True
+
+    def record(self, prices: dict, ts: int, series: str = "latest") -> int:
+        """Record {id: {"high", "low"}} at one timestamp; returns rows written."""
+        return sum(self.add(item_id, ts, p.get("high"), p.get("low"), series) for item_id, p in prices.items())
+
+    def record_snapshot(self, prices: dict, ts: int) -> int:
+        """Record a whole /latest snapshot: items missing from it get an empty row."""
+        written = self.record(prices, ts)
+        gone = [i for i, rows in self.items.items() if i not in prices and rows[-1][1:] != [None, None]]
+        return written + sum(self.add(item_id, ts, None, None, allow_empty=True) for item_id in gone)
+
+    # -- reading -----------------------------------------------------------
+
+    @staticmethod
+    def _row_at(series: dict[str, list[list]], item_id, when: float | None) -> list | None:
+        rows = series.get(str(item_id))
+        if not rows:
+            return None
+        pos = len(rows) if when is None else bisect.bisect_right(rows, when, key=lambda row: row[0])
+        return rows[pos - 1] if pos else None
+
+    def price_at(self, item_id, when: float | None = None, series: str | None = None) -> dict | None:
+        """An item's price as of `when` from one series, or (series=None) the newer row of the two."""
+        if series is not None:
+            row = self._row_at(self._series(series), item_id, when)
+        else:
+            latest = self._row_at(self.items, item_id, when)
+            average = self._row_at(self.averages, item_id, when)
+            row = average if latest is None or (average is not None and average[0] > latest[0]) else latest
+        if row is None or row[1:] == [None, None]:
+            return None
+        return {"high": row[1], "low": row[2]}
+
+    def prices_at(self, when: float | None = None, series: str | None = None) -> dict[str, dict]:
+        """{id: {"high", "low"}} as of `when` (epoch seconds; None = newest)."""
+        ids = self._series(series).keys() if series is not None else self.items.keys() | self.averages.keys()
+        out = {}
+        for item_id in ids:
+            price = self.price_at(item_id, when, series)
+            if price is not None:
+                out[item_id] = price
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def latest_prices(store: PriceStore, ttl: float | None = None, now: float | None = None) -> dict[str, dict]:
+    """Current {id: {"high", "low"}}: from the store while fresh, else /latest."""
+    ttl = DEFAULT_TTL["latest"] if ttl is None else ttl
+    now = time.time() if now is None else now
+    if store.is_fresh("latest", ttl, now):
+        age = int(now - store.fetched["latest"])
+        print(f"Using stored GE prices ({age // 60} min old, TTL {int(ttl) // 60} min)")
+        return store.prices_at(series="latest")
+
+    print("Fetching GE prices from OSRS Wiki...")
+    data = fetch_json(f"{PRICES_API}/latest")
+    if not data or "data" not in data:
+        # Stale prices beat none; the caller logs how many it got.
+        return store.prices_at(series="latest")
+    prices = {item_id: {"high": p.get("high"), "low": p.get("low")} for item_id, p in data["data"].items()}
+    store.record_snapshot(prices, int(now))
+    store.mark_fetched("latest", now)
+    return prices
+
+
+def window_prices(store: PriceStore, source: str, ttl: float | None = None, now: float | None = None) -> int:
+    """Record the /5m or /1h average prices; returns rows written."""
+    if source not in WINDOW_SOURCES:
+        raise ValueError(f"unknown window source {source!r} (expected one of {WINDOW_SOURCES})")
+    ttl = DEFAULT_TTL[source] if ttl is None else ttl
+    if store.is_fresh(source, ttl, now):
+        return 0
+    data = fetch_json(f"{PRICES_API}/{source}")
+    if not data or "data" not in data:
+        return 0
+    ts = data.get("timestamp") or int(time.time() if now is None else now)
+    prices = {
+        item_id: {"high": p.get("avgHighPrice"), "low": p.get("avgLowPrice")}
+        for item_id, p in data["data"].items()
+    }
+    store.mark_fetched(source, now)
+    return store.record(prices, ts, "average")
+
+
+def timeseries(store: PriceStore, item_id, timestep: str = "24h", ttl: float | None = None,
+               now: float | None = None) -> int:
+    """Backfill one item's history from /timeseries; returns rows written."""
+    if timestep not in TIMESTEPS:
+        raise ValueError(f"unknown timestep {timestep!r} (expected one of {TIMESTEPS})")
+    key = f"timeseries:{timestep}:{item_id}"
+    ttl = DEFAULT_TTL["timeseries"] if ttl is None else ttl
+    if store.is_fresh(key, ttl, now):
+        return 0
+    data = fetch_json(f"{PRICES_API}/timeseries", {"timestep": timestep, "id": item_id})
+    if not data or "data" not in data:
+        return 0
+    store.mark_fetched(key, now)
+    return sum(
+        store.add(item_id, row["timestamp"], row.get("avgHighPrice"), row.get("avgLowPrice"), "average")
+        for row in data["data"] if row.get("timestamp")
+    )
+
+
+# ---------------------------------------------------------------------------
+# Valuation
+# ---------------------------------------------------------------------------
+
+def mid_price(price: dict | None) -> int:
+    """Same rule update_bank uses: mean of high and low, or whichever exists."""
+    if not price:
+        return 0
+    high, low = price.get("high") or 0, price.get("low") or 0
+    return (high + low) // 2 if high and low else high or low
+
+
+def bank_value_at(items: list[dict], store: PriceStore, when: float | None = None) -> tuple[int, int]:
+    """(value, items priced) of bank.json items at a past moment, from stored prices.
+
+    Quantities are the bank's current ones; items with no stored price before
+    `when` count as 0.
+    """
+    value = priced = 0
+    for item in items:
+        price = mid_price(store.price_at(item.get("id"), when))
+        if price:
+            priced += 1
+        value += price * item.get("quantity", 0)
+    return value, priced
+
+
+def _end_of_day(day: str) -> float:
+    start = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+    return (start + timedelta(days=1)).timestamp() - 1
+
+
+def _bank_items() -> list[dict]:
+    try:
+        return load_json(DATA_DIR / "bank.json").get("items", [])
+    except (OSError, ValueError):
+        print(f"No bank.json in {DATA_DIR}; run update_bank.py first.")
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+    fetch = sub.add_parser("fetch", help="record a price snapshot")
+    fetch.add_argument("--source", choices=("latest", *WINDOW_SOURCES), default="latest")
+    fetch.add_argument("--ttl", type=float, help="seconds a stored snapshot stays fresh")
+    backfill = sub.add_parser("backfill", help="record /timeseries history for every bank item")
+    backfill.add_argument("--timestep", choices=TIMESTEPS, default="24h")
+    value = sub.add_parser("value", help="bank value at a past date, from stored prices only")
+    value.add_argument("--at", required=True, metavar="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    store = PriceStore()
+    if args.command == "fetch":
+        if args.source == "latest":
+            latest_prices(store, args.ttl)
+        else:
+            print(f"{args.source}: {window_prices(store, args.source, args.ttl)} new price points")
+    elif args.command == "backfill":
+        ids = sorted({i["id"] for i in _bank_items() if i.get("id")})
+        rows = sum(timeseries(store, item_id, args.timestep) for item_id in ids)
+        print(f"Backfilled {rows} price points for {len(ids)} items")
+    else:
+        items = _bank_items()
+        total, priced = bank_value_at(items, store, _end_of_day(args.at))
+        print(f"Bank value at {args.at}: {total:,} gp ({priced}/{len(items)} items priced)")
+    if store.save():
+        print(f"Saved: {store.path} ({len(store.items.keys() | store.averages.keys())} items)")
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "price_history")
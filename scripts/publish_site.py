@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Stage the GitHub Pages site in _site/ with cache-friendly data files.
+
+Runs in CI after the data has been generated and committed. It copies the
+dashboard (index.html, styles.css, app.js) and every account's public data
+files into _site/, and for each file also writes:
+
+  - a content-hashed copy (skills.json -> skills.3f2a1b9c.json) that never
+    changes, so browsers and CDNs can cache it indefinitely;
+  - precompressed variants of the hashed copy: .gz (stdlib gzip) always, and
+    .br when the optional `brotli` package is installed.
+
+asset-manifest.json maps each logical path to its hashed one. It and
+index.html are the only files a client must revalidate; after a 6-hour update
+only the data that actually changed gets a new name. app.js resolves every
+data URL through the manifest and falls back to the logical path when the
+manifest is missing (e.g. a local checkout served as-is). index.html is
+rewritten to reference the hashed styles.css and app.js.
+
+    python scripts/publish_site.py [--out _site]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from instrumentation import run_instrumented, timed
+from osrs_config import ACCOUNTS
+from osrs_utils import REPO_ROOT
+
+try:  # Optional: stdlib has no Brotli encoder.
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "asset-manifest.json"
+MANIFEST_VERSION = 1
+
+STATIC_FILES = ["styles.css", "app.js"]
+ENTRY_FILE = "index.html"
+
+# Per-account data published to the site (relative to the account dir).
+DATA_PATTERNS = ["*.json", "*.yaml", "collection_log/*.json", "timeline/*.json"]
+
+# Private wealth data — never published, for any account.
+PRIVATE_FILES = {"bank.json", "potion_storage.json", "potion_storage.yaml", "seed_vault.json"}
+
+HASH_LENGTH = 8
+# Files smaller than this aren't worth a compressed variant.
+MIN_COMPRESS_BYTES = 256
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(rel: str, digest: str) -> str:
+    """'data/skills.json' -> 'data/skills.<digest>.json'."""
+    path = Path(rel)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def public_data_files(root: Path) -> list[str]:
+    """Repo-relative paths of every publishable data file, across accounts."""
+    found = set()
+    for account in ACCOUNTS:
+        data_dir = root / account["dir"]
+        for pattern in DATA_PATTERNS:
+            for path in data_dir.glob(pattern):
+                if path.is_file() and path.name not in PRIVATE_FILES:
+                    found.add(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def write_variants(out: Path, rel: str, data: bytes) -> list[str]:
+    """Write the hashed copy of one file plus its compressed variants."""
+    written = [rel]
+    (out / rel).write_bytes(data)
+    if len(data) >= MIN_COMPRESS_BYTES:
+        # mtime=0 keeps the .gz byte-identical across runs for unchanged input.
+        (out / f"{rel}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(f"{rel}.gz")
+        if brotli is not None:
+            (out / f"{rel}.br").write_bytes(brotli.compress(data, quality=11))
+            written.append(f"{rel}.br")
+    return written
+
+
+@timed()
+def publish(root: Path, out: Path) -> dict:
+    """Stage the site from `root` into `out`; returns the manifest."""
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    assets = {}
+    for rel in [*STATIC_FILES, *public_data_files(root)]:
+        data = (root / rel).read_bytes()
+        hashed = hashed_name(rel, content_hash(data))
+        (out / rel).parent.mkdir(parents=True, exist_ok=True)
+        # The logical name stays too, for old clients and direct links.
+        (out / rel).write_bytes(data)
+        write_variants(out, hashed, data)
+        assets[rel] = hashed
+
+    html = (root / ENTRY_FILE).read_text(encoding="utf-8")
+    for rel in STATIC_FILES:
+        html = html.replace(f'"{rel}"', f'"{assets[rel]}"')
+    (out / ENTRY_FILE).write_text(html, encoding="utf-8")
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "assets": assets,
+    }
+    (out / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--out", default="_site", help="output directory (default: _site)")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    if not out.is_absolute():
+        out = REPO_ROOT / out
+    manifest = publish(REPO_ROOT, out)
+    print(f"Staged {len(manifest['assets'])} assets in {out}"
+          f" (brotli {'on' if brotli is not None else 'unavailable, .gz only'})")
+
+
+if __name__ == "__main__":
+    run_instrumented(main, "publish_site")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Adaptive refresh schedule for a roster: poll active accounts often, dormant ones rarely.
+
+Polling every account on a fixed cron spends most upstream calls on players
+who haven't logged in. Instead, every finished update is an observation:
+did the account's total XP (hiscores) or its Temple collection-log sync time
+change since the last check? Each account keeps an exponentially decayed
+count of changes and of hours observed (half-life HALF_LIFE_HOURS, plus a
+prior of about one change a day for accounts with little history), and its
+change rate is changes / hours.
+
+A global budget of upstream requests per day (REQUESTS_PER_REFRESH per
+account update) is split across the roster in proportion to the square root
+of each account's rate; that is the split that minimizes the expected time
+a change goes unseen. Each account's share is held between one refresh every
+MAX_INTERVAL_HOURS and one every MIN_INTERVAL_HOURS, with the remainder
+re-split among the rest. An account is due once its interval has passed
+since its last check. Accounts never checked are due at once, and failing
+ones back off exponentially. Each run takes at most its slice of the
+budget, the most overdue first (rate x hours since checked).
+
+fleet.py --schedule runs only the due accounts and records what it saw; run
+it as often as --run-every says (e.g. hourly from cron). This prints the
+current plan:
+
+    python scripts/scheduler.py roster.txt --budget 2000
+
+The state lives in .cache/fleet/schedule.json.
+"""
+
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+
+from osrs_utils import CACHE_DIR
+
+SCHEDULE_PATH = CACHE_DIR / "fleet" / "schedule.json"
+SCHEDULE_VERSION = 1
+REQUESTS_PER_REFRESH = 2  # hiscores + Temple collection log
+DEFAULT_BUDGET = 400  # upstream requests per day
+DEFAULT_RUN_EVERY = 1.0  # hours between scheduled fleet runs
+MIN_INTERVAL_HOURS = 1.0
+MAX_INTERVAL_HOURS = 7 * 24.0
+HALF_LIFE_HOURS = 7 * 24.0
+PRIOR_CHANGES, PRIOR_HOURS = 0.5, 12.0  # one change a day, worth half a day of observation
+
+
+def allocate(rates: dict[str, float], per_day: float, *, lo: float = 24 / MAX_INTERVAL_HOURS,
+             hi: float = 24 / MIN_INTERVAL_HOURS) -> dict[str, float]:
+    """Refreshes per day for each account: proportional to sqrt(rate), summing to per_day within [lo, hi].
+
+    Accounts pushed past a bound are pinned to it and the rest of the budget
+    is re-split among the others. The floor wins over the budget: every
+    account is refreshed at least `lo` times a day.
+    """
+    weights = {key: math.sqrt(max(rate, 0.0)) for key, rate in rates.items()}
+    pinned: dict[str, float] = {}
+    while True:
+        free = {key: w for key, w in weights.items() if key not in pinned}
+        left = per_day - sum(pinned.values())
+        total = sum(free.values())
+        shares = {key: left * w / total if total else left / len(free) for key, w in free.items()}
+        over = [key for key, f in shares.items() if f > hi]
+        under = [] if over else [key for key, f in shares.items() if f < lo]
+        if not over and not under:
+            return {**shares, **pinned}
+        for key in over:
+            pinned[key] = hi
+        for key in under:
+            pinned[key] = lo
+
+
+class RefreshSchedule:
+    """Per-account change observations, and the refresh plan they imply."""
+
+    def __init__(self, path: Path | None = SCHEDULE_PATH):
+        self.path = path
+        self.accounts: dict[str, dict] = {}
+        self.dirty = False
+        if path is not None and path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            print(f"Schedule unreadable, starting fresh: {self.path}")
+            return
+        if raw.get("version") == SCHEDULE_VERSION:
+            self.accounts = raw.get("accounts", {})
+
+    def save(self) -> bool:
+        """Write the schedule if anything was observed since it was loaded."""
+        if self.path is None or not self.dirty:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": SCHEDULE_VERSION, "accounts": self.accounts}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+        self.dirty = False
+        return True
+
+    # -- observations --------------------------------------------------------
+
+    def observe(self, rsn: str, total_xp: int | None, synced: str | None, now: float | None = None) -> bool | None:
+        """Record a finished update; returns whether the account changed (None on its first check)."""
+        now = time.time() if now is None else now
+        entry = self.accounts.get(rsn.lower())
+        changed = None
+        if entry is None:
+            entry = self.accounts[rsn.lower()] = {"rsn": rsn, "changes": 0.0, "hours": 0.0}
+        elif entry.get("checked") is not None:
+            hours = max(now - entry["checked"], 0.0) / 3600
+            changed = ((total_xp is not None and entry.get("xp") is not None and total_xp != entry["xp"])
+                       or (synced is not None and synced != entry.get("synced")))
+            decay = 0.5 ** (hours / HALF_LIFE_HOURS)
+            entry["changes"] = entry["changes"] * decay + changed
+            entry["hours"] = entry["hours"] * decay + hours
+            if changed:
+                entry["changed"] = now
+        entry.update(checked=now, failures=0)
+        if total_xp is not None:
+            entry["xp"] = total_xp
+        if synced is not None:
+            entry["synced"] = synced
+        self.dirty = True
+        return changed
+
+    def failed(self, rsn: str, now: float | None = None):
+        """Record a failed update; the account backs off until it succeeds again."""
+        entry = self.accounts.setdefault(rsn.lower(), {"rsn": rsn, "changes": 0.0, "hours": 0.0})
+        entry["failures"] = entry.get("failures", 0) + 1
+        entry["failed"] = time.time() if now is None else now
+        self.dirty = True
+
+    def rate(self, rsn: str) -> float:
+        """Estimated changes per hour."""
+        entry = self.accounts.get(rsn.lower(), {})
+        return (entry.get("changes", 0.0) + PRIOR_CHANGES) / (entry.get("hours", 0.0) + PRIOR_HOURS)
+
+    # -- planning ------------------------------------------------------------
+
+    def plan(self, accounts: list[dict], budget: float = DEFAULT_BUDGET, now: float | None = None) -> list[dict]:
+        """Every account with its rate, refresh interval, when it's due and how overdue it is.
+
+        `budget` is upstream requests per day. Sorted most urgent first.
+        """
+        now = time.time() if now is None else now
+        rates = {a["rsn"].lower(): self.rate(a["rsn"]) for a in accounts}
+        per_day = allocate(rates, budget / REQUESTS_PER_REFRESH)
+        out = []
+        for account in accounts:
+            key = account["rsn"].lower()
+            entry = self.accounts.get(key, {})
+            interval = 24 / per_day[key] if per_day[key] > 0 else MAX_INTERVAL_HOURS
+            checked = entry.get("checked")
+            due = now if checked is None else checked + interval * 3600
+            if entry.get("failures"):
+                backoff = min(MIN_INTERVAL_HOURS * 2 ** entry["failures"], MAX_INTERVAL_HOURS)
+                due = max(due, entry["failed"] + backoff * 3600)
+            # Expected changes missed so far; never-checked accounts go first.
+            urgency = math.inf if checked is None else rates[key] * (now - checked) / 3600
+            out.append({**account, "rate_per_day": round(rates[key] * 24, 3), "interval_hours": round(interval, 2),
+                        "due": due, "urgency": urgency})
+        out.sort(key=lambda p: (p["due"] > now, -p["urgency"], p["due"]))
+        return out
+
+    def due(self, accounts: list[dict], budget: float = DEFAULT_BUDGET, run_every: float = DEFAULT_RUN_EVERY,
+            now: float | None = None) -> list[dict]:
+        """The accounts to refresh this run: due ones, most urgent first, capped at this run's share
+        of the daily budget (a run every `run_every` hours)."""
+        now = time.time() if now is None else now
+        cap = max(1, math.floor(budget / REQUESTS_PER_REFRESH * run_every / 24))
+        due = [p for p in self.plan(accounts, budget, now) if p["due"] <= now]
+        if len(due) > cap:
+            print(f"Schedule: {len(due)} accounts due, refreshing the {cap} most overdue within the budget")
+        return [{"rsn": p["rsn"], "variant": p["variant"]} for p in due[:cap]]
+
+
+def main():
+    import fleet  # here, not at the top: fleet imports this module
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("roster", type=Path)
+    parser.add_argument("--schedule", type=Path, default=SCHEDULE_PATH)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="upstream requests per day")
+    parser.add_argument("--run-every", type=float, default=DEFAULT_RUN_EVERY, help="hours between fleet runs")
+    args = parser.parse_args()
+
+    accounts = fleet.parse_roster(args.roster.read_text(encoding="utf-8"))
+    schedule = RefreshSchedule(args.schedule)
+    now = time.time()
+    plan = schedule.plan(accounts, args.budget, now)
+    due = schedule.due(accounts, args.budget, args.run_every, now)
+    print(f"{'RSN':<20} {'changes/day':>11} {'every':>9} {'due in':>9}")
+    for p in plan:
+        wait = max(p["due"] - now, 0) / 3600
+        print(f"{p['rsn']:<20} {p['rate_per_day']:>11.2f} {p['interval_hours']:>8.1f}h {wait:>8.1f}h")
+    spent = sum(24 / p["interval_hours"] for p in plan) * REQUESTS_PER_REFRESH
+    print(f"{len(due)} due now; plan uses {spent:,.0f} of {args.budget:,.0f} requests/day")
+
+
+if __name__ == "__main__":
+    main()
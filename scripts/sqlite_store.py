@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Optional SQLite backend for account data (stdlib sqlite3), with JSON export.
+
+At roster scale a directory of JSON files per account is slow to scan, diff
+and query. This keeps every account in one database instead:
+
+- documents: each generated file (skills.json, collection_log/<group>.json,
+  timeline/<month>.json, ...) exactly as save_json() would have written it,
+  keyed by account and path. The exporter writes these back out, so the
+  dashboard reads the same bytes it always has.
+- normalized tables, rebuilt from those documents in the same transaction
+  and indexed by account, item/name and date:
+    snapshots   one row per skill / boss / clue per hiscores snapshot (kept
+                across updates, so it is the account's history)
+    clog_items  every collection-log slot, obtained or missing
+    ca_tasks    every combat achievement, completed or not
+    pets        every pet, obtained or missing
+    drops       the notable drops from the account's drops.yaml
+
+update_stats writes through capture(): inside it, save_json() hands each
+document to the store instead of the filesystem (timestamp-only changes are
+still skipped), load_json() reads the account's previous documents from the
+store, and stale shards are dropped from the store rather than unlinked. On
+a clean exit the whole update lands in one bulk transaction; an update that
+raises leaves the database untouched. Only the account's YAML inputs are
+still read from its data dir; no JSON there is read or written. fleet.py
+--db uses this for every account.
+
+    python scripts/sqlite_store.py import FoolinSlays data/          # existing JSON -> db
+    python scripts/sqlite_store.py export FoolinSlays /tmp/site/data # db -> JSON files
+    python scripts/sqlite_store.py stats
+    sqlite3 .cache/tracker.sqlite3 "select rsn, date from clog_items join accounts on id = account_id
+                                    where item = 'Twisted bow' and obtained"
+
+--db (or OSRS_DB) picks the database; the default is .cache/tracker.sqlite3.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import compact_json
+from instrumentation import span, timed
+from osrs_utils import (
+    CACHE_DIR,
+    json_text,
+    normalize_date,
+    only_timestamp_changed,
+    parse_drops_yaml,
+    using_json_sink,
+)
+
+DB_PATH = Path(os.environ["OSRS_DB"]) if os.environ.get("OSRS_DB") else CACHE_DIR / "tracker.sqlite3"
+
+# Files update_stats writes into an account's data dir, and the directories it
+# shards into (each with an index.json; files it no longer writes are stale).
+ACCOUNT_FILES = ("skills.json", "bosses.json", "clues.json", "collection_log.json", "pets.json",
+                 "combat_achievements.json", "quests.json")
+SHARDED_DIRS = ("collection_log", "timeline")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY,
+    rsn TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    updated TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (account_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    taken TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    level INTEGER,
+    value INTEGER NOT NULL,
+    rank INTEGER,
+    PRIMARY KEY (account_id, kind, name, taken)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshots_by_date ON snapshots (account_id, taken);
+CREATE INDEX IF NOT EXISTS snapshots_by_name ON snapshots (kind, name, taken);
+CREATE TABLE IF NOT EXISTS clog_items (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    collection TEXT NOT NULL,
+    item TEXT NOT NULL,
+    obtained INTEGER NOT NULL,
+    date TEXT,
+    quantity INTEGER
+);
+CREATE INDEX IF NOT EXISTS clog_items_by_account ON clog_items (account_id, collection);
+CREATE INDEX IF NOT EXISTS clog_items_by_item ON clog_items (item, obtained);
+CREATE INDEX IF NOT EXISTS clog_items_by_date ON clog_items (account_id, date);
+CREATE TABLE IF NOT EXISTS ca_tasks (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    tier TEXT NOT NULL,
+    name TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS ca_tasks_by_account ON ca_tasks (account_id, tier);
+CREATE INDEX IF NOT EXISTS ca_tasks_by_name ON ca_tasks (name, completed);
+CREATE INDEX IF NOT EXISTS ca_tasks_by_date ON ca_tasks (account_id, date);
+CREATE TABLE IF NOT EXISTS pets (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    obtained INTEGER NOT NULL,
+    date TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS pets_by_account ON pets (account_id);
+CREATE INDEX IF NOT EXISTS pets_by_name ON pets (name, obtained);
+CREATE INDEX IF NOT EXISTS pets_by_date ON pets (account_id, date);
+CREATE TABLE IF NOT EXISTS drops (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    boss TEXT,
+    item TEXT NOT NULL,
+    kc INTEGER,
+    date TEXT,
+    droprate INTEGER,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS drops_by_account ON drops (account_id, boss);
+CREATE INDEX IF NOT EXISTS drops_by_item ON drops (item);
+CREATE INDEX IF NOT EXISTS drops_by_date ON drops (account_id, date);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Normalizing documents into rows
+# ---------------------------------------------------------------------------
+# Each takes a decoded document and returns the rows (minus account_id) for
+# its table; the table's rows for the account are replaced wholesale.
+
+def _snapshot_rows(kind: str, key: str, field: str):
+    def rows(doc: dict) -> list[tuple]:
+        taken = doc.get("updated")
+        return [(taken, kind, name, entry.get("level") if kind == "skill" else None,
+                 entry.get(field, 0), entry.get("rank"))
+                for name, entry in (doc.get(key) or {}).items()]
+    return rows
+
+
+def _clog_rows(doc: dict) -> list[tuple]:
+    out = []
+    for collection, group in (doc.get("collection_log") or {}).get("collections", {}).items():
+        for it in group.get("obtained", []):
+            out.append((collection, it["name"], 1, normalize_date(it.get("date")), it.get("quantity")))
+        for it in group.get("missing", []):
+            out.append((collection, it["name"] if isinstance(it, dict) else it, 0, None, None))
+    return out
+
+
+def _task(task) -> tuple[str, str | None]:
+    return (task["name"], normalize_date(task.get("date"))) if isinstance(task, dict) else (task, None)
+
+
+def _ca_rows(doc: dict) -> list[tuple]:
+    out = []
+    for tier, t in (doc.get("combat_achievements") or {}).get("tiers", {}).items():
+        for task in t.get("completed", []):
+            name, date = _task(task)
+            out.append((tier, name, 1, date))
+        out += [(tier, _task(task)[0], 0, None) for task in t.get("not_completed", [])]
+    return out
+
+
+def _pet_rows(doc: dict) -> list[tuple]:
+    pets = doc.get("pets") or {}
+    return ([(p["name"], 1, normalize_date(p.get("date")), p.get("source")) for p in pets.get("obtained", [])]
+            + [(p["name"], 0, None, p.get("source")) for p in pets.get("missing", [])])
+
+
+# document -> (table, columns, row builder); snapshots accumulate instead of being replaced.
+NORMALIZED = {
+    "skills.json": ("snapshots", ("taken", "kind", "name", "level", "value", "rank"),
+                    _snapshot_rows("skill", "skills", "xp")),
+    "bosses.json": ("snapshots", ("taken", "kind", "name", "level", "value", "rank"),
+                    _snapshot_rows("boss", "bosses", "kc")),
+    "clues.json": ("snapshots", ("taken", "kind", "name", "level", "value", "rank"),
+                   _snapshot_rows("clue", "clues", "count")),
+    "collection_log.json": ("clog_items", ("collection", "item", "obtained", "date", "quantity"), _clog_rows),
+    "combat_achievements.json": ("ca_tasks", ("tier", "name", "completed", "date"), _ca_rows),
+    "pets.json": ("pets", ("name", "obtained", "date", "source"), _pet_rows),
+}
+DROP_COLUMNS = ("boss", "item", "kc", "date", "droprate", "notes")
+
+
+def drop_rows(data_dir: Path) -> list[tuple] | None:
+    """Rows for the drops table from data_dir/drops.yaml, or None if there is no such file."""
+    path = Path(data_dir) / "drops.yaml"
+    if not path.exists():
+        return None
+    drops = parse_drops_yaml(path.read_text(encoding="utf-8"))
+    return [(d.get("boss"), d["item"], d.get("kc"), normalize_date(d.get("date")), d.get("droprate"), d.get("notes"))
+            for d in drops if d.get("item")]
+
+
+def _decode(body: str):
+    return compact_json.decode(json.loads(body))
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class SqliteStore:
+    """One database of accounts; safe to share between threads (writes are serialized)."""
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _account_id(self, rsn: str) -> int | None:
+        row = self.conn.execute("SELECT id FROM accounts WHERE rsn = ?", (rsn,)).fetchone()
+        return row[0] if row else None
+
+    def accounts(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT rsn FROM accounts ORDER BY rsn COLLATE NOCASE")]
+
+    def documents(self, rsn: str) -> dict[str, str]:
+        """{name: body} for an account's stored documents."""
+        with self._lock:
+            return dict(self.conn.execute(
+                "SELECT name, body FROM documents JOIN accounts ON id = account_id WHERE rsn = ?", (rsn,)))
+
+    def counts(self) -> dict[str, int]:
+        """Rows per table."""
+        tables = ("accounts", "documents", "snapshots", "clog_items", "ca_tasks", "pets", "drops")
+        with self._lock:
+            return {t: self.conn.execute(f"SELECT count(*) FROM {t}").fetchone()[0] for t in tables}
+
+    @timed("sqlite write")
+    def write(self, rsn: str, documents: dict[str, tuple[str, object]], *, present: set[str] | None = None,
+              drops: list[tuple] | None = None):
+        """Store an account's changed documents and their rows in one transaction.
+
+        `documents` maps name -> (body, decoded data). `present` is every
+        document the update produced, changed or not (default: `documents`);
+        files under SHARDED_DIRS that it no longer produced are deleted when
+        that dir's index.json is among them. `drops` replaces the drops rows.
+        """
+        present = set(documents) if present is None else present
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO accounts (rsn) VALUES (?)", (rsn,))
+            account = self._account_id(rsn)
+            self.conn.executemany(
+                "INSERT INTO documents (account_id, name, updated, body) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account_id, name) DO UPDATE SET updated = excluded.updated, body = excluded.body",
+                [(account, name, data.get("updated") if isinstance(data, dict) else None, body)
+                 for name, (body, data) in documents.items()])
+            stale = [(account, name) for (name,) in self.conn.execute(
+                         "SELECT name FROM documents WHERE account_id = ?", (account,))
+                     if "/" in name and f"{name.split('/')[0]}/index.json" in present and name not in present
+                     and name.split("/")[0] in SHARDED_DIRS]
+            self.conn.executemany("DELETE FROM documents WHERE account_id = ? AND name = ?", stale)
+
+            for name, (table, columns, build) in NORMALIZED.items():
+                if name not in documents:
+                    continue
+                rows = [(account, *row) for row in build(documents[name][1])]
+                if table == "snapshots":
+                    verb = "INSERT OR REPLACE"
+                else:
+                    verb = "INSERT"
+                    self.conn.execute(f"DELETE FROM {table} WHERE account_id = ?", (account,))
+                marks = ", ".join("?" * (len(columns) + 1))
+                self.conn.executemany(f"{verb} INTO {table} (account_id, {', '.join(columns)}) VALUES ({marks})",
+                                      rows)
+            if drops is not None:
+                self.conn.execute("DELETE FROM drops WHERE account_id = ?", (account,))
+                self.conn.executemany(f"INSERT INTO drops (account_id, {', '.join(DROP_COLUMNS)}) "
+                                      f"VALUES ({', '.join('?' * (len(DROP_COLUMNS) + 1))})",
+                                      [(account, *row) for row in drops])
+            self.conn.execute(
+                "UPDATE accounts SET updated = (SELECT max(updated) FROM documents WHERE account_id = ?) WHERE id = ?",
+                (account, account))
+
+    @contextmanager
+    def capture(self, rsn: str, data_dir: Path):
+        """Route save_json() for data_dir into this store; commits on a clean exit."""
+        capture = _Capture(self.documents(rsn), Path(data_dir))
+        with using_json_sink(capture):
+            yield capture
+        with span("sqlite commit"):
+            self.write(rsn, capture.changed, present=capture.present, drops=drop_rows(data_dir))
+        print(f"SQLite: {len(capture.changed)}/{len(capture.present)} documents changed for {rsn} in {self.path}")
+
+    @timed("sqlite import")
+    def import_dir(self, rsn: str, data_dir: Path) -> int:
+        """Load an account's existing JSON files from data_dir; returns how many."""
+        data_dir = Path(data_dir)
+        paths = [data_dir / name for name in ACCOUNT_FILES if (data_dir / name).exists()]
+        for sub in SHARDED_DIRS:
+            paths += sorted((data_dir / sub).glob("*.json"))
+        documents = {}
+        for path in paths:
+            body = path.read_text(encoding="utf-8")
+            documents[path.relative_to(data_dir).as_posix()] = (body, _decode(body))
+        self.write(rsn, documents, drops=drop_rows(data_dir))
+        return len(documents)
+
+    @timed("sqlite export")
+    def export(self, rsn: str, out_dir: Path) -> int:
+        """Write an account's documents under out_dir, byte for byte; returns how many changed.
+
+        Files already identical are left alone, and JSON files under
+        SHARDED_DIRS that the account no longer has are removed.
+        """
+        documents = self.documents(rsn)
+        if not documents:
+            raise KeyError(f"no stored documents for {rsn!r}")
+        out_dir = Path(out_dir)
+        written = 0
+        for name, body in documents.items():
+            path = out_dir / name
+            if path.exists() and path.read_text(encoding="utf-8") == body:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding="utf-8")
+            written += 1
+        for sub in SHARDED_DIRS:
+            for stale in (out_dir / sub).glob("*.json"):
+                if f"{sub}/{stale.name}" not in documents:
+                    stale.unlink()
+        return written
+
+
+class _Capture:
+    """The save_json() sink behind SqliteStore.capture(): buffers an update's documents in memory."""
+    label = "sqlite"
+
+    def __init__(self, existing: dict[str, str], root: Path):
+        self.existing = existing
+        self.root = root
+        self.changed: dict[str, tuple[str, object]] = {}
+        self.present: set[str] = set()
+
+    def _name(self, path: Path) -> str | None:
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None  # not this account's file (e.g. ranks.json)
+
+    def owns(self, path: Path) -> bool:
+        return self._name(path) is not None
+
+    def read(self, path: Path) -> str | None:
+        name = self._name(path)
+        return self.changed[name][0] if name in self.changed else self.existing.get(name)
+
+    def retain(self, directory: Path, names: set[str]):
+        """The update still produces these documents in directory, written this run or not."""
+        prefix = self._name(directory)
+        self.present.update(f"{prefix}/{n}" for n in names if f"{prefix}/{n}" in self.changed
+                            or f"{prefix}/{n}" in self.existing)
+
+    def save(self, path: Path, data, *, compact: bool, skip_if_only_timestamp_changed: bool) -> bool:
+        name = self._name(path)
+        self.present.add(name)
+        old = self.read(path)
+        if skip_if_only_timestamp_changed and old is not None:
+            try:
+                if only_timestamp_changed(old, data, compact):
+                    return False
+            except ValueError:
+                pass
+        self.changed[name] = (json_text(data, compact), data)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("import", help="load an account's JSON files into the database")
+    p.add_argument("rsn")
+    p.add_argument("data_dir", type=Path)
+    p = sub.add_parser("export", help="write an account's JSON files from the database")
+    p.add_argument("rsn")
+    p.add_argument("out_dir", type=Path)
+    sub.add_parser("stats", help="accounts and row counts")
+    args = parser.parse_args()
+
+    with SqliteStore(args.db) as store:
+        if args.command == "import":
+            print(f"Imported {store.import_dir(args.rsn, args.data_dir)} documents for {args.rsn} into {args.db}")
+        elif args.command == "export":
+            print(f"Exported {args.rsn} to {args.out_dir}: {store.export(args.rsn, args.out_dir)} files written")
+        else:
+            for table, count in store.counts().items():
+                print(f"  {table:<12} {count:>10,}")
+            print("Accounts: " + ", ".join(store.accounts()))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,11 @@ about into data/drops.yaml. Nothing is written automatically — notable drops
 stay a deliberate, manual choice.
 """
 
-import json
 import re
 from pathlib import Path
 
+from osrs_utils import load_json
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 
 
@@ -36,7 +37,7 @@ def main():
         print("suggest_drops: collection_log.json not found — run update_stats.py first.")
         return
 
-    clog = json.loads(clog_path.read_text(encoding="utf-8")).get("collection_log", {})
+    clog = load_json(clog_path).get("collection_log", {})
     recent = clog.get("recent_items", [])
     logged = load_logged_items()
 
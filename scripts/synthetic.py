@@ -0,0 +1,156 @@
+"""
+Seeded generators of realistic synthetic inputs at any scale.
+
+Collection logs, combat achievement and pet YAML, Temple responses, bank
+item names and league tasks, each reproducible from (size, seed). bench.py times the parsers on
+them, and upstream_sim.py serves them in place of the real APIs.
+"""
+
+import random
+from datetime import date, timedelta
+
+from osrs_config import CATEGORY_RULES
+from osrs_utils import parse_yaml_with_dates
+
+WORDS = (
+    "abyssal dragon rune adamant crystal blood shadow ancient twisted armadyl bandos zamorak saradomin "
+    "elder kodai toxic serpentine tanzanite magma venator masori virtus torva oathplate sunfire "
+    "bludgeon whip trident staff bow crossbow helm body legs boots gloves ring amulet cape shield "
+    "defender hilt axon claw spine fang jaw visage tome sigil pet jar orphan kraken hydra vorki"
+).split()
+_SKILLS = ("attack", "strength", "defence", "ranged", "prayer", "magic", "runecraft", "construction",
+           "hitpoints", "agility", "herblore", "thieving", "crafting", "fletching", "slayer", "hunter",
+           "mining", "smithing", "fishing", "cooking", "firemaking", "woodcutting", "farming")
+
+
+def _name(rng: random.Random, words: int = 3) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _date(rng: random.Random) -> str:
+    return (date(2022, 1, 1) + timedelta(days=rng.randrange(1500))).isoformat()
+
+
+def gen_clog_yaml(n_items: int, seed: int = 1, per_category: int = 12) -> str:
+    """collection_log.yaml text: categories of obtained (dated) and missing items."""
+    rng = random.Random(seed)
+    lines = ["# synthetic collection log"]
+    for c in range(max(1, n_items // per_category)):
+        lines += [f"{_name(rng, 2)} {c}:", "  obtained:"]
+        lines += [f"  - {_name(rng)} | {_date(rng)}" for _ in range(per_category // 2)]
+        lines.append("  missing:")
+        lines += [f"  - {_name(rng)}" for _ in range(per_category - per_category // 2)]
+    return "\n".join(lines)
+
+
+def gen_pets_yaml(n_pets: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    lines = ["obtained:"]
+    lines += [f"  - {_name(rng, 2)} | {_date(rng)} | {_name(rng, 2)}, {rng.randrange(2000)} KC"
+              for _ in range(n_pets // 2)]
+    lines.append("missing:")
+    lines += [f"  - {_name(rng, 2)} ({_name(rng, 2)})" for _ in range(n_pets - n_pets // 2)]
+    return "\n".join(lines)
+
+
+# (tier, share of all tasks, share of the tier completed), roughly the live game's mix.
+_CA_TIERS = (("Easy", 0.06, 0.95), ("Medium", 0.14, 0.85), ("Hard", 0.2, 0.7), ("Elite", 0.26, 0.5),
+             ("Master", 0.22, 0.25), ("Grandmaster", 0.12, 0.08))
+
+
+def gen_ca_yaml(n_tasks: int, seed: int = 1) -> str:
+    """combat_achievements.yaml text: per tier, completed (mostly dated) and not_completed tasks."""
+    rng = random.Random(seed)
+    lines = ["# synthetic combat achievements", f"# Total tasks: {n_tasks}"]
+    made = 0
+    for i, (tier, share, done) in enumerate(_CA_TIERS):
+        count = max(0, n_tasks - made if i == len(_CA_TIERS) - 1 else round(n_tasks * share))
+        names = [f"{_name(rng, 2)} {made + k}" for k in range(count)]
+        made += count
+        n_done = round(count * done)
+        lines += ["", f"{tier}:", "  completed:" if n_done else "  completed: []"]
+        lines += [f"  - {name} | {_date(rng)}" if rng.random() < 0.9 else f"  - {name}" for name in names[:n_done]]
+        lines.append("  not_completed:" if count > n_done else "  not_completed: []")
+        lines += [f"  - {name}" for name in names[n_done:]]
+    return "\n".join(lines)
+
+
+def gen_temple_clog(n_items: int, seed: int = 1, per_category: int = 12):
+    """(temple_data, manual_dates, yaml_data, item_names) for process_temple_clog."""
+    rng = random.Random(seed)
+    item_names, items = {}, {}
+    for c in range(max(1, n_items // per_category)):
+        entries = []
+        for _ in range(per_category // 2):
+            item_id = len(item_names) + 1
+            item_names[str(item_id)] = f"{_name(rng)} {item_id}"
+            entries.append({"id": item_id, "count": rng.randrange(1, 5), "date": f"{_date(rng)} 12:00:00"})
+        items[f"category_{c}"] = entries
+    temple = {"data": {"items": items, "total_collections_finished": len(item_names),
+                       "total_collections_available": n_items}}
+    manual_dates = {name.lower(): _date(rng) for name in rng.sample(sorted(item_names.values()),
+                                                                   len(item_names) // 10)}
+    yaml_data = parse_yaml_with_dates(gen_clog_yaml(n_items, seed, per_category))
+    return temple, manual_dates, yaml_data, item_names
+
+
+def gen_recent_items(n_items: int, seed: int = 1) -> tuple[list[dict], dict]:
+    """Recent clog items where ~1 in 5 filled several category slots at once."""
+    rng = random.Random(seed)
+    items, sources = [], {}
+    for i in range(n_items):
+        name = f"{_name(rng)} {i // 2 if i % 5 == 0 else i}"
+        items.append({"name": name, "date": _date(rng), "collection": f"category_{rng.randrange(80)}"})
+        if i % 5 == 0:
+            sources[name.lower()] = _name(rng, 2)
+    return items, sources
+
+
+def gen_bank_names(n_items: int, seed: int = 1) -> list[str]:
+    """Bank item names: ~2/3 hit a CATEGORY_RULES keyword, the rest fall through."""
+    rng = random.Random(seed)
+    keywords = [k for _, _, ks in CATEGORY_RULES for k in ks]
+    return [
+        f"{rng.choice(WORDS).capitalize()} {rng.choice(keywords)}" if i % 3 else _name(rng)
+        for i in range(n_items)
+    ]
+
+
+_TASK_TEMPLATES = (
+    "Reach level {n} in {skill}",
+    "Kill {kc} {boss}",
+    "Defeat {boss} without taking damage",
+    "Obtain a {item}",
+    "Complete {n} {tier} clue scrolls",
+    "Complete the {tier} {region} diary",
+    "Equip a full set of {item}",
+    "Reach a total level of {total}",
+)
+
+
+def gen_league_tasks(n_tasks: int, n_items: int = 600, seed: int = 1) -> tuple[list[dict], dict]:
+    """(tasks, account) in build_league_tasks.is_done's shapes, owning n_items items."""
+    rng = random.Random(seed)
+    bosses = [f"{_name(rng, 2).lower()}" for _ in range(60)]
+    items = {f"{_name(rng).lower()} {i}" for i in range(n_items)}
+    regions = ["ardougne", "desert", "falador", "fremennik", "kandarin", "karamja", "morytania", "varrock"]
+    acc = {
+        "skills": {s: rng.randrange(40, 100) for s in _SKILLS},
+        "total_level": 1900, "combat_level": 120,
+        "clues": {t.lower(): rng.randrange(300) for t in ("beginner", "easy", "medium", "hard", "elite", "master")},
+        "boss_kc": {b: rng.randrange(500) for b in bosses},
+        "items": items,
+        "ca": {_name(rng).lower() for _ in range(300)},
+        "quests_all_done": False,
+        "diaries": {r: {"easy", "medium"} for r in regions},
+    }
+    item_list = sorted(items)
+    tasks = []
+    for i in range(n_tasks):
+        desc = rng.choice(_TASK_TEMPLATES).format(
+            n=rng.randrange(1, 99), skill=rng.choice(_SKILLS), kc=rng.randrange(1, 200), boss=rng.choice(bosses),
+            item=rng.choice(item_list), tier=rng.choice(("easy", "medium", "hard", "elite")),
+            region=rng.choice(regions), total=rng.randrange(500, 2277),
+        )
+        tasks.append({"name": f"{_name(rng, 2)} {i}", "desc": desc})
+    return tasks, acc
@@ -1,11 +1,16 @@
 """
 Manual value overrides for untradeable items.
-Applied in update_stats.py when ge_price == 0.
+Applied in update_bank.py when ge_price == 0.
 
 Values are best-effort proxies:
 - Crystal/bowfa: tradeable inactive equivalent GE price
 - Barrows degraded: tradeable full version (4847+ id space)
 - Cosmetic/quest items: 0 (intentionally)
+
+Items that are built from tradeable parts are better priced by a recipe in
+UNTRADEABLE_RECIPES, which derived_values.py evaluates against each run's GE
+prices. The hardcoded number below is then only the fallback for when a
+component has no GE price.
 """
 
 UNTRADEABLE_VALUES = {
@@ -99,3 +104,32 @@ UNTRADEABLE_VALUES = {
     # --- Diary rewards (no good value) ---
     # Keep at 0: Ardougne cloak, Falador shield, Karamja gloves, etc.
 }
+
+
+# ---------------------------------------------------------------------------
+# Recipes: untradeable value as a function of tradeable components
+# ---------------------------------------------------------------------------
+# item id -> term, evaluated by derived_values.py. A term is one of:
+#   1_000                    constant gp
+#   ("ge", id)               GE mid price of a tradeable item
+#   ("value", id)            another item's value (its recipe, else the
+#                            table above, else its GE price)
+#   ("mul", term, n)         term x n
+#   ("sum", term, term, ...) sum of terms
+
+# Imbues cost NMZ / Soul Wars points, which have no GP price. Raise this to
+# put a value on the points spent.
+IMBUE_COST = 0
+
+CRYSTAL_ARMOUR_SEED = 23956
+CRYSTAL_SHARD = 23962
+
+UNTRADEABLE_RECIPES = {
+    # Crystal armour: 1/2/3 armour seeds plus 50 shards per seed.
+    33031: ("sum", ("ge", CRYSTAL_ARMOUR_SEED), ("mul", ("value", CRYSTAL_SHARD), 50)),          # Crystal helm
+    33027: ("sum", ("mul", ("ge", CRYSTAL_ARMOUR_SEED), 2), ("mul", ("value", CRYSTAL_SHARD), 100)),  # Crystal legs
+    33023: ("sum", ("mul", ("ge", CRYSTAL_ARMOUR_SEED), 3), ("mul", ("value", CRYSTAL_SHARD), 150)),  # Crystal body
+    33021: ("ge", 25862),                          # Bow of faerdhinen (c) = inactive bowfa
+    26770: ("sum", ("ge", 6737), IMBUE_COST),      # Berserker ring (i) = Berserker ring + imbue
+    26762: ("sum", ("ge", 19550), IMBUE_COST),     # Ring of suffering (ri) = Ring of suffering + imbue
+}
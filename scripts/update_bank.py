@@ -4,82 +4,271 @@ OSRS Bank Parser and GE Price Fetcher
 Parses bank export from Bank Memory plugin and fetches GE prices from OSRS Wiki API.
 """
 
+import argparse
+import copy
 import re
 from datetime import datetime, timezone
-
-from osrs_config import CATEGORY_RULES
-from osrs_utils import DATA_DIR, fetch_json, save_json
+from pathlib import Path
+
+from bank_categories import CategoryMatcher, CategoryMemo
+from bank_valuation import BankArrays
+from derived_values import DerivedValues
+from instrumentation import run_instrumented, timed
+from item_mapping import ItemMapping
+from osrs_utils import DATA_DIR, data_dir_label, load_json, save_json
+from price_history import PriceStore, latest_prices, mid_price
 from untradeable_values import UNTRADEABLE_VALUES
 
-GE_PRICES_URL = "https://prices.runescape.wiki/api/v1/osrs/latest"
-ITEM_MAPPING_URL = "https://prices.runescape.wiki/api/v1/osrs/mapping"
+
+def iter_bank_export(bank_path):
+    """Yield {id, name, quantity} from a Bank Memory export, one line at a time."""
+    with open(bank_path, 'r', encoding="utf-8") as f:
+        next(f, None)  # Skip header line
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            parts = line.split('\t')
+            if len(parts) >= 3:
+                try:
+                    yield {
+                        "id": int(parts[0]),
+                        "name": parts[1],
+                        "quantity": int(parts[2])
+                    }
+                except ValueError:
+                    continue
 
 
+@timed()
 def load_bank_data():
-    """Load bank data from YAML-like text file."""
+    """Load bank data from the Bank Memory export in DATA_DIR."""
     bank_path = DATA_DIR / "bank.txt"
     if not bank_path.exists():
         print(f"Bank data not found: {bank_path}")
         return None
+    return list(iter_bank_export(bank_path))
+
+
+@timed()
+def merge_bank_exports(exports):
+    """Combine several holders' exports into one item list, merged by item ID.
+
+    `exports` is [(holder, path), ...] — GIM members' banks, group storage,
+    alts. Each export is streamed, so memory grows with the number of
+    distinct items, not with the number of exports. Every merged item keeps
+    `holders`: {holder: quantity}.
+    """
+    merged = {}
+    for holder, path in exports:
+        lines = 0
+        for item in iter_bank_export(path):
+            lines += 1
+            entry = merged.setdefault(item["id"], {**item, "quantity": 0, "holders": {}})
+            entry["quantity"] += item["quantity"]
+            entry["holders"][holder] = entry["holders"].get(holder, 0) + item["quantity"]
+        print(f"  {holder}: {lines} items from {path}")
+    return list(merged.values())
+
+
+def parse_bank_arg(value):
+    """'HOLDER=PATH' (or a bare PATH, holder = file stem) -> (holder, Path)."""
+    holder, sep, path = value.partition("=")
+    if not sep:
+        holder, path = Path(value).stem, value
+    if not holder or not path:
+        raise argparse.ArgumentTypeError(f"expected HOLDER=PATH, got {value!r}")
+    path = Path(path)
+    if not path.exists():
+        raise argparse.ArgumentTypeError(f"bank export not found: {path}")
+    return holder, path
+
+
+def holder_totals(items):
+    """{holder: {items, quantity, value}} for merged items, valued at each item's price."""
+    totals = {}
+    for item in items:
+        for holder, quantity in (item.get("holders") or {}).items():
+            t = totals.setdefault(holder, {"items": 0, "quantity": 0, "value": 0})
+            t["items"] += 1
+            t["quantity"] += quantity
+            t["value"] += quantity * item["ge_price"]
+    return totals
 
-    items = []
-    with open(bank_path, 'r', encoding="utf-8") as f:
-        lines = f.readlines()
 
-    # Skip header line
-    for line in lines[1:]:
-        line = line.strip()
-        if not line:
-            continue
+# CATEGORY_RULES compiled once per process (see bank_categories.py).
+CATEGORY_MATCHER = CategoryMatcher()
 
-        parts = line.split('\t')
-        if len(parts) >= 3:
-            try:
-                item_id = int(parts[0])
-                item_name = parts[1]
-                quantity = int(parts[2])
-                items.append({
-                    "id": item_id,
-                    "name": item_name,
-                    "quantity": quantity
-                })
-            except ValueError:
-                continue
 
-    return items
+def categorize_item(item_name, memo=None):
+    """Categorize an item based on its name using priority-ordered rules.
 
+    With a CategoryMemo, names categorized on an earlier run are looked up
+    instead of matched.
+    """
+    if memo is not None:
+        return memo.categorize(item_name)
+    return CATEGORY_MATCHER.categorize(item_name)
 
-def categorize_item(item_name):
-    """Categorize an item based on its name using priority-ordered rules."""
-    name_lower = item_name.lower()
 
-    for category, subcategory, keywords in CATEGORY_RULES:
-        for keyword in keywords:
-            if keyword.lower() in name_lower:
-                return category, subcategory
+@timed()
+def fetch_ge_prices(store=None):
+    """Current GE prices {id: {"high", "low"}} from the OSRS Wiki API.
 
-    return "Miscellaneous", "Other"
+    Snapshots are kept in the local price store (see price_history.py); a run
+    within its TTL of the last fetch reuses the stored prices.
+    """
+    return latest_prices(store if store is not None else PriceStore(path=None))
 
 
-def fetch_ge_prices():
-    """Fetch current GE prices from OSRS Wiki API."""
-    print("Fetching GE prices from OSRS Wiki...")
-    data = fetch_json(GE_PRICES_URL)
-    if data and "data" in data:
-        return data["data"]
-    return {}
+@timed()
+def fetch_item_mapping():
+    """Item name -> ID mapping from the OSRS Wiki API, cached locally.
 
+    Names are matched normalized (case, dose/(unf) spacing); see item_mapping.py.
+    """
+    return ItemMapping()
+
+
+def resolve_id(item, item_mapping):
+    """Item ID as a string; items exported without one are looked up by (normalized) name."""
+    item_id = str(item.get("id", 0))
+    if item_id == "0" and item_mapping:
+        item_id = str(item_mapping.get(item["name"], 0))
+    return item_id
 
-def fetch_item_mapping():
-    """Fetch item name to ID mapping from OSRS Wiki API."""
-    print("Fetching item mapping...")
-    data = fetch_json(ITEM_MAPPING_URL)
-    if data:
-        # Create name -> id mapping
-        return {item.get("name", ""): item.get("id", 0) for item in data}
-    return {}
 
+def item_price(item_id, ge_prices, untradeables=UNTRADEABLE_VALUES):
+    """GE mid price, falling back to the untradeable value (recipe or manual)."""
+    price = mid_price(ge_prices.get(item_id))
+    if price == 0:
+        price = untradeables.get(int(item_id) if item_id.isdigit() else 0, 0)
+    return price
 
+
+def item_key(item, item_id):
+    """Identity of a bank.json item across runs."""
+    return item.get("source", "bank"), int(item_id) if str(item_id).isdigit() else 0, item["name"]
+
+
+def process_item(item, item_id, price, memo=None):
+    category, subcategory = categorize_item(item["name"], memo)
+    processed = {
+        "id": int(item_id) if item_id.isdigit() else 0,
+        "name": item["name"],
+        "quantity": item["quantity"],
+        "ge_price": price,
+        "total_value": price * item["quantity"],
+        "category": category,
+        "subcategory": subcategory,
+        "source": item.get("source", "bank")
+    }
+    if item.get("holders"):
+        processed["holders"] = item["holders"]
+    return processed
+
+
+def add_to_summary(summary, item, sign=1):
+    """Add (sign=1) or remove (sign=-1) one item's count and value from the category totals."""
+    cat = summary.setdefault(item["category"], {"count": 0, "value": 0, "subcategories": {}})
+    sub = cat["subcategories"].setdefault(item["subcategory"], {"count": 0, "value": 0})
+    for totals in (cat, sub):
+        totals["count"] += sign * item["quantity"]
+        totals["value"] += sign * item["total_value"]
+    if sign < 0:
+        if not sub["count"] and not sub["value"]:
+            del cat["subcategories"][item["subcategory"]]
+        if not cat["subcategories"]:
+            del summary[item["category"]]
+
+
+def load_previous_bank():
+    """The last bank.json, or None if there isn't a usable one."""
+    try:
+        previous = load_json(DATA_DIR / "bank.json")
+    except (OSError, ValueError):
+        return None
+    return previous if isinstance(previous, dict) and "items" in previous else None
+
+
+@timed()
+def revalue(items, ge_prices, item_mapping, memo, previous=None, untradeables=None):
+    """Processed items, category totals and a change report for a bank export.
+
+    Items whose quantity and price match the previous bank.json are reused as
+    they are. Only added, removed and changed items are re-categorized and
+    applied to the previous category totals. Without a usable previous
+    bank.json, or if CATEGORY_RULES changed since it was written, everything
+    is rebuilt and the totals come from one grouped reduction (BankArrays).
+    `untradeables` defaults to UNTRADEABLE_VALUES with its recipes evaluated
+    against ge_prices.
+    """
+    if untradeables is None:
+        untradeables = DerivedValues(ge_prices).table_with_recipes()
+    incremental = previous is not None and previous.get("category_rules") == memo.digest
+    old_items = {}
+    for old in previous["items"] if incremental else []:
+        old_items.setdefault(item_key(old, old["id"]), []).append(old)
+    summary = copy.deepcopy(previous["categories"]) if incremental else {}
+    before = {cat: c["value"] for cat, c in summary.items()}
+
+    processed = []
+    added = changed = 0
+    for item in items:
+        item_id = resolve_id(item, item_mapping)
+        price = item_price(item_id, ge_prices, untradeables)
+        matches = old_items.get(item_key(item, item_id))
+        old = matches.pop(0) if matches else None
+        if (old is not None and old["quantity"] == item["quantity"] and old["ge_price"] == price
+                and old.get("holders") == item.get("holders")):
+            processed.append(old)
+            continue
+        new = process_item(item, item_id, price, memo)
+        if old is not None:
+            add_to_summary(summary, old, -1)
+            changed += 1
+        else:
+            added += 1
+        if incremental:
+            add_to_summary(summary, new)
+        processed.append(new)
+
+    removed = [old for matches in old_items.values() for old in matches]
+    for old in removed:
+        add_to_summary(summary, old, -1)
+    if not incremental:
+        summary = BankArrays(processed).summary()
+
+    deltas = {
+        cat: summary.get(cat, {}).get("value", 0) - before.get(cat, 0)
+        for cat in sorted({*before, *summary})
+        if summary.get(cat, {}).get("value", 0) != before.get(cat, 0)
+    }
+    change = {
+        "incremental": incremental,
+        "added": added,
+        "removed": len(removed),
+        "changed": changed,
+        "unchanged": len(processed) - added - changed,
+        "value_delta": sum(deltas.values()),
+        "categories": deltas,
+    }
+    return processed, summary, change
+
+
+def report_change(change):
+    if not change["incremental"]:
+        print("Revalued every item (no previous bank.json, or CATEGORY_RULES changed)")
+        return
+    print(f"Since last run: {change['added']} added, {change['removed']} removed,"
+          f" {change['changed']} changed, {change['unchanged']} unchanged"
+          f" ({change['value_delta']:+,} gp)")
+    for cat, delta in sorted(change["categories"].items(), key=lambda kv: -abs(kv[1])):
+        print(f"  {cat:<20} {delta:+,} gp")
+
+
+@timed()
 def load_potion_storage_as_items():
     """Load potion storage from YAML and convert doses to 4-dose potions."""
     yaml_path = DATA_DIR / "potion_storage.yaml"
@@ -133,13 +322,25 @@ def load_potion_storage_as_items():
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--bank", action="append", type=parse_bank_arg, metavar="HOLDER=PATH",
+        help="value several Bank Memory exports as one (GIM members, group storage); "
+             "repeatable. Default: DATA_DIR/bank.txt",
+    )
+    args = parser.parse_args()
+
     now = datetime.now(timezone.utc)
     print("Updating bank data...")
     print(f"Timestamp: {now.isoformat()}")
     print("-" * 50)
 
     # Load bank data
-    items = load_bank_data()
+    if args.bank:
+        print(f"Merging {len(args.bank)} bank exports...")
+        items = merge_bank_exports(args.bank)
+    else:
+        items = load_bank_data()
     if not items:
         items = []
         print("No bank data found.")
@@ -157,83 +358,55 @@ def main():
         return
 
     # Fetch GE prices
-    ge_prices = fetch_ge_prices()
+    price_store = PriceStore()
+    ge_prices = fetch_ge_prices(price_store)
+    price_store.save()
     print(f"Fetched prices for {len(ge_prices)} items")
 
     # Fetch item mapping to get IDs for potions
     item_mapping = fetch_item_mapping()
-    print(f"Fetched mapping for {len(item_mapping)} items")
-
-    # Process items
-    processed_items = []
-    total_value = 0
-    categories_summary = {}
-
-    for item in items:
-        item_id = str(item.get("id", 0))
-
-        # If no ID, try to look it up by name
-        if item_id == "0" and item_mapping:
-            item_id = str(item_mapping.get(item["name"], 0))
-
-        category, subcategory = categorize_item(item["name"])
-
-        # Get GE price
-        price_data = ge_prices.get(item_id, {})
-        high_price = price_data.get("high", 0) or 0
-        low_price = price_data.get("low", 0) or 0
-        avg_price = (high_price + low_price) // 2 if high_price and low_price else high_price or low_price
-
-        # Fall back to manual override for untradeables (ge_price == 0)
-        if avg_price == 0:
-            avg_price = UNTRADEABLE_VALUES.get(int(item_id) if item_id.isdigit() else 0, 0)
-
-        item_value = avg_price * item["quantity"]
-        total_value += item_value
-
-        processed_item = {
-            "id": int(item_id) if item_id.isdigit() else 0,
-            "name": item["name"],
-            "quantity": item["quantity"],
-            "ge_price": avg_price,
-            "total_value": item_value,
-            "category": category,
-            "subcategory": subcategory,
-            "source": item.get("source", "bank")
-        }
-        processed_items.append(processed_item)
-
-        # Track category totals
-        if category not in categories_summary:
-            categories_summary[category] = {"count": 0, "value": 0, "subcategories": {}}
-        categories_summary[category]["count"] += item["quantity"]
-        categories_summary[category]["value"] += item_value
-
-        if subcategory not in categories_summary[category]["subcategories"]:
-            categories_summary[category]["subcategories"][subcategory] = {"count": 0, "value": 0}
-        categories_summary[category]["subcategories"][subcategory]["count"] += item["quantity"]
-        categories_summary[category]["subcategories"][subcategory]["value"] += item_value
-
-    # Sort by value for top items
-    sorted_by_value = sorted(processed_items, key=lambda x: x["total_value"], reverse=True)
-    top_items = sorted_by_value[:10]
+    print(f"Item mapping: {len(item_mapping)} items")
+
+    # Process items: only what changed since the previous bank.json
+    memo = CategoryMemo()
+    previous = load_previous_bank()
+    derived = DerivedValues(ge_prices)
+    untradeables = derived.table_with_recipes()
+    print(f"Untradeable values: {derived.priced}/{len(derived.recipes)} recipes priced from GE")
+    processed_items, categories_summary, change = revalue(
+        items, ge_prices, item_mapping, memo, previous, untradeables)
+    bank = BankArrays(processed_items)
+    total_value = bank.total_value()
+    top_items = [processed_items[i] for i in bank.top(10)]
 
     # Build output
     output = {
         "updated": now.isoformat(),
         "total_items": len(processed_items),
-        "total_quantity": sum(i["quantity"] for i in processed_items),
+        "total_quantity": bank.total_quantity(),
         "total_value": total_value,
         "top_items": top_items,
         "categories": categories_summary,
+        "change": change,
+        "category_rules": memo.digest,
         "items": processed_items
     }
+    holders = holder_totals(processed_items)
+    if holders:
+        output["holders"] = holders
 
     save_json(DATA_DIR / "bank.json", output)
+    if memo.added:
+        print(f"Categorized {memo.added} new item name(s); memo has {len(memo.entries)}")
+    memo.save()
 
     print("-" * 50)
     print(f"Total items: {len(processed_items)}")
     print(f"Total value: {total_value:,} gp")
+    for holder, t in sorted(holders.items(), key=lambda kv: -kv[1]["value"]):
+        share = 100 * t["value"] / total_value if total_value else 0
+        print(f"  {holder:<20} {t['value']:>15,} gp ({share:.1f}%)")
+    report_change(change)
 
     # Surface items that fell through to the catch-all so you can add keyword
     # rules for them (these are the ones whose categorization is just a guess).
@@ -252,4 +425,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_instrumented(main, data_dir_label("update_bank"))
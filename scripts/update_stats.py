@@ -5,23 +5,37 @@ Fetches data from official hiscores and TempleOSRS API.
 Preserves manually-entered dates from YAML files.
 """
 
+import hashlib
+import json
 import os
+import re
 from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime, timezone
+from pathlib import Path
 
-from osrs_config import BOSS_EXCLUSIONS, BOSS_RENAMES, PET_NAMES
+from instrumentation import run_instrumented, span, timed
+from osrs_config import ACCOUNTS, BOSS_EXCLUSIONS, BOSS_RENAMES, PET_NAMES
 from osrs_utils import (
     DATA_DIR,
+    REPO_ROOT,
     check_no_dropped_items,
     count_items,
+    data_dir_label,
     date_sort_key,
     fetch_json,
+    json_exists,
+    load_json,
+    month_key,
     names_lower,
     normalize_date,
+    parse_drops_yaml,
     parse_yaml_with_dates,
     read_data_file,
+    remove_stale_json,
     save_json,
+    using_data_dir,
 )
 
 RSN = os.environ.get("RSN", "FoolinSlays")
@@ -29,12 +43,22 @@ RSN = os.environ.get("RSN", "FoolinSlays")
 # Hiscores leaderboard variant. Default is the ironman board; group-ironman
 # accounts (e.g. GIM Foolin) aren't on it, so set HISCORES_VARIANT=hiscore_oldschool.
 HISCORES_VARIANT = os.environ.get("HISCORES_VARIANT", "hiscore_oldschool_ironman")
-HISCORES_URL = f"https://secure.runescape.com/m={HISCORES_VARIANT}/index_lite.json"
+
+
+def hiscores_url(variant: str = HISCORES_VARIANT) -> str:
+    return f"https://secure.runescape.com/m={variant}/index_lite.json"
+
+
+HISCORES_URL = hiscores_url()
 TEMPLE_CLOG_URL = "https://templeosrs.com/api/collection-log/player_collection_log.php"
 TEMPLE_ITEMS_URL = "https://templeosrs.com/api/collection-log/items.php"
 
 NUM_SKILLS = 24
 
+# Cross-account rank comparison for the Ranks tab, rebuilt from every
+# configured account's skills.json on each run.
+RANKS_FILE = REPO_ROOT / "data" / "ranks.json"
+
 XP_TABLE = [
     0, 83, 174, 276, 388, 512, 650, 801, 969, 1154, 1358, 1584, 1833, 2107,
     2411, 2746, 3115, 3523, 3973, 4470, 5018, 5624, 6291, 7028, 7842, 8740,
@@ -74,6 +98,7 @@ def load_yaml_collection_log():
     check_no_dropped_items(content, count_items(data), "collection_log.yaml", strict=False)
     return data
 
+@timed()
 def fetch_temple_collection_log(rsn):
     """Fetch collection log from TempleOSRS API"""
     print(f"Fetching collection log from TempleOSRS for {rsn}...")
@@ -91,6 +116,7 @@ def fetch_temple_collection_log(rsn):
 
     return data
 
+@timed()
 def load_item_names():
     """Load item ID to name mapping from Temple API"""
     data = fetch_json(TEMPLE_ITEMS_URL)
@@ -101,6 +127,7 @@ def load_item_names():
         return items
     return {}
 
+@timed()
 def load_collection_log(temple_data, item_names):
     """
     Build the collection log from pre-fetched TempleOSRS data, preserving manual
@@ -170,6 +197,7 @@ def dedup_recent_items(items, drops_sources=None):
     return out
 
 
+@timed()
 def process_temple_clog(temple_data, manual_dates, yaml_data, item_names):
     """Process TempleOSRS collection log data, merging with manual dates AND missing items from YAML"""
     collections = {}
@@ -342,6 +370,180 @@ def load_collection_log_from_yaml():
         'source': 'yaml'
     }
 
+CLOG_SHARD_DIR = "collection_log"
+
+
+def merge_clog_groups(collections):
+    """Group Temple categories under their first tag, like app.js mergeClogCollections.
+
+    TempleOSRS splits multi-tag items into their own categories (e.g. "Abyssal
+    Sire, All Pets"); the dashboard shows each boss's pet/slayer items in one
+    collapsible, so shards follow the same grouping.
+    """
+    merged = {}
+    for name, coll in collections.items():
+        primary = name.split(',')[0].strip()
+        group = merged.setdefault(primary, {'obtained': [], 'missing': [], '_o': set(), '_m': set()})
+        for it in coll.get('obtained', []):
+            key = (it.get('name') or '').lower()
+            if key not in group['_o']:
+                group['_o'].add(key)
+                group['obtained'].append(it)
+        for it in coll.get('missing', []):
+            key = (it if isinstance(it, str) else it.get('name') or '').lower()
+            if key not in group['_m']:
+                group['_m'].add(key)
+                group['missing'].append(it)
+    for group in merged.values():
+        del group['_o'], group['_m']
+        group['obtained_count'] = len(group['obtained'])
+        group['total_count'] = group['obtained_count'] + len(group['missing'])
+    return merged
+
+
+def _shard_filename(name, taken):
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'category'
+    filename, n = f"{slug}.json", 2
+    while filename in taken:
+        filename, n = f"{slug}-{n}.json", n + 1
+    taken.add(filename)
+    return filename
+
+
+def shard_collection_log(clog):
+    """Split a collection log into (index, {filename: shard}).
+
+    The index carries the headline totals, recent items, per-group counts and
+    obtained-per-month counts — enough for the overview and Progress tab — and
+    each group's items live in their own shard, fetched when it is opened.
+    """
+    groups = merge_clog_groups(clog.get('collections', {}))
+    categories, shards, taken = {}, {}, set()
+    by_month = Counter()
+    for name, group in groups.items():
+        filename = _shard_filename(name, taken)
+        shards[filename] = {'category': name, 'collection': group}
+        categories[name] = {
+            'obtained_count': group['obtained_count'],
+            'total_count': group['total_count'],
+            'shard': filename,
+        }
+        by_month.update(k for k in (month_key(it.get('date')) for it in group['obtained']) if k)
+    index = {
+        'total_obtained': clog.get('total_obtained', 0),
+        'total_items': clog.get('total_items', 0),
+        'recent_items': clog.get('recent_items', []),
+        'source': clog.get('source'),
+        'categories': categories,
+        'obtained_by_month': dict(sorted(by_month.items())),
+    }
+    return index, shards
+
+
+@timed()
+def save_clog_shards(data_dir, clog, rsn, updated):
+    """Write collection_log/index.json plus one shard per category group.
+
+    Shards for groups that no longer exist are removed so the directory never
+    serves stale categories.
+    """
+    shard_dir = data_dir / CLOG_SHARD_DIR
+    index, shards = shard_collection_log(clog)
+    written = sum(
+        save_json(shard_dir / filename, {'rsn': rsn, 'updated': updated, **shard}, quiet=True)
+        for filename, shard in shards.items()
+    )
+    remove_stale_json(shard_dir, {'index.json', *shards})
+    print(f"Collection log shards: {written}/{len(shards)} rewritten in {shard_dir}")
+    save_json(shard_dir / 'index.json', {'rsn': rsn, 'updated': updated, 'collection_log': index})
+
+
+# ---------------------------------------------------------------------------
+# Timeline
+# ---------------------------------------------------------------------------
+
+TIMELINE_DIR = 'timeline'
+TIMELINE_SOURCES = ('clog', 'ca', 'pet', 'drop')
+
+
+@timed()
+def build_timeline(clog, ca, pets, drops, drops_sources=None):
+    """Every dated collection-log item, CA, pet and notable drop, by month.
+
+    Returns {'YYYY-MM': [entry, ...]} (entries newest first) and the counts of
+    undated entries per source. Collection-log items are deduplicated with
+    dedup_recent_items, so an item that fills several log slots at once is
+    listed once.
+    """
+    entries, undated = [], Counter()
+
+    def add(source, date, name, detail, **extra):
+        iso = normalize_date(date) if date else None
+        if not month_key(iso):
+            undated[source] += 1
+            return
+        entries.append({'date': iso, 'source': source, 'name': name, 'detail': detail, **extra})
+
+    clog_items = [
+        {'name': it['name'], 'date': it.get('date'), 'collection': coll}
+        for coll, group in (clog or {}).get('collections', {}).items()
+        for it in group.get('obtained', [])
+    ]
+    for it in dedup_recent_items(clog_items, drops_sources):
+        add('clog', it['date'], it['name'], it['collection'])
+    for tier, t in (ca or {}).get('tiers', {}).items():
+        for task in t.get('completed', []):
+            if isinstance(task, dict):
+                add('ca', task.get('date'), task['name'], tier, points=t.get('points_per_task'))
+    for pet in (pets or {}).get('obtained', []):
+        add('pet', pet.get('date'), pet['name'], pet.get('source'))
+    for d in drops or []:
+        add('drop', d.get('date'), d['item'], d.get('boss'), kc=d.get('kc'))
+
+    months = {}
+    for e in sorted(entries, key=lambda e: (e['date'], e['source'], e['name']), reverse=True):
+        months.setdefault(month_key(e['date']), []).append(e)
+    return dict(sorted(months.items())), dict(undated)
+
+
+def _timeline_summary(entries):
+    counts = Counter(e['source'] for e in entries)
+    summary = {src: counts.get(src, 0) for src in TIMELINE_SOURCES}
+    summary['ca_points'] = sum(e.get('points') or 0 for e in entries if e['source'] == 'ca')
+    return summary
+
+
+@timed()
+def save_timeline(data_dir, months, undated, rsn, updated):
+    """Write timeline/index.json plus one file per month, incrementally.
+
+    The index keeps a content hash per month; a month whose hash matches the
+    previous index (and whose file exists) isn't read or rewritten, so a run
+    only touches the months that gained or lost entries.
+    """
+    tl_dir = data_dir / TIMELINE_DIR
+    try:
+        previous = load_json(tl_dir / 'index.json')['timeline']['months']
+    except (OSError, ValueError, KeyError, TypeError):
+        previous = {}
+
+    index, written = {}, 0
+    for month, entries in months.items():
+        digest = hashlib.sha1(json.dumps(entries, sort_keys=True).encode()).hexdigest()[:12]
+        filename = f'{month}.json'
+        index[month] = {'counts': _timeline_summary(entries), 'hash': digest, 'file': filename}
+        if previous.get(month, {}).get('hash') == digest and json_exists(tl_dir / filename):
+            continue
+        written += save_json(tl_dir / filename, {'rsn': rsn, 'updated': updated, 'month': month,
+                                                 'entries': entries}, quiet=True)
+    remove_stale_json(tl_dir, {'index.json', *(entry['file'] for entry in index.values())})
+    print(f"Timeline: {written}/{len(months)} months rewritten in {tl_dir}")
+    save_json(tl_dir / 'index.json', {'rsn': rsn, 'updated': updated, 'timeline': {
+        'months': index, 'undated': undated,
+    }})
+
+
+@timed()
 def load_combat_achievements():
     """Load combat achievements from YAML file with date support"""
     content = read_data_file("combat_achievements.yaml")
@@ -485,6 +687,7 @@ def parse_quests_yaml(content):
 
     return result
 
+@timed()
 def load_quests():
     """Load quests from YAML file with date support"""
     content = read_data_file("quests.yaml")
@@ -534,6 +737,7 @@ def load_quests():
         'total_miniquests': miniquest_total
     }
 
+@timed()
 def load_pets():
     """Load pets from YAML file with date support"""
     content = read_data_file("pets.yaml")
@@ -562,6 +766,7 @@ def load_pets():
         'total_pets': len(obtained) + len(missing_raw)
     }
 
+@timed()
 def extract_pets_from_clog(clog):
     """Extract pets from collection log data"""
     if not clog or 'collections' not in clog:
@@ -645,22 +850,88 @@ def extract_pets_from_clog(clog):
         'source': 'collection_log'
     }
 
-def main():
-    now = datetime.now(timezone.utc)
-    print(f"Updating stats for: {RSN}")
-    print(f"Timestamp: {now.isoformat()}")
-    print("-" * 50)
+def best_rank_index(ranks):
+    """Index of the best (lowest) rank, or None.
+
+    Only marks a winner when at least two accounts are actually ranked in the
+    row (unranked is -1 or missing) and one of them is strictly ahead.
+    """
+    ranked = sorted((r, i) for i, r in enumerate(ranks) if r is not None and r >= 0)
+    if len(ranked) < 2 or ranked[0][0] == ranked[1][0]:
+        return None
+    return ranked[0][1]
+
+
+def build_ranks(accounts, payloads):
+    """ranks.json body from each account's skills.json payload (None if missing)."""
+    names = []
+    for payload in payloads:
+        for name in (payload or {}).get("skills", {}):
+            if name not in names:
+                names.append(name)
+
+    rows = {}
+    for name in names:
+        cells = []
+        for payload in payloads:
+            s = (payload or {}).get("skills", {}).get(name)
+            cells.append({"rank": s.get("rank", -1), "level": s.get("level"), "xp": s.get("xp")} if s else None)
+        rows[name] = {"accounts": cells, "best": best_rank_index([c and c["rank"] for c in cells])}
+
+    return {
+        "accounts": [
+            {
+                "id": a["id"], "label": a["label"],
+                "rsn": (p or {}).get("rsn", a["rsn"]),
+                "updated": (p or {}).get("updated"),
+                "total_level": (p or {}).get("milestones", {}).get("total_level"),
+                "total_xp": (p or {}).get("milestones", {}).get("total_xp"),
+            }
+            for a, p in zip(accounts, payloads, strict=True)
+        ],
+        "skills": rows,
+    }
+
+
+@timed()
+def update_ranks(updated):
+    """Rebuild ranks.json from every configured account's current skills.json."""
+    payloads = []
+    for account in ACCOUNTS:
+        try:
+            payloads.append(load_json(REPO_ROOT / account["dir"] / "skills.json"))
+        except (OSError, ValueError):
+            payloads.append(None)
+    if any(payloads):
+        save_json(RANKS_FILE, {"updated": updated, **build_ranks(ACCOUNTS, payloads)})
 
+
+def update_account(rsn: str, data_dir: Path, *, hiscores_variant: str = HISCORES_VARIANT,
+                   now: datetime | None = None, item_names: dict | None = None) -> dict:
+    """Fetch and write one account's data files into data_dir; returns what was available.
+
+    The account's own YAML (dates, CAs, quests, ...) is read from data_dir too,
+    so several accounts can be updated side by side (see fleet.py). Pass
+    item_names to reuse one Temple item map across accounts.
+    """
+    with using_data_dir(data_dir):
+        return _update_account(rsn, Path(data_dir), hiscores_variant, now or datetime.now(timezone.utc), item_names)
+
+
+def _update_account(rsn: str, data_dir: Path, hiscores_variant: str, now: datetime, item_names: dict | None) -> dict:
     # Fetch the three independent network sources concurrently — they don't
     # depend on each other, so there's no reason to wait for them in series.
     print("Fetching hiscores, collection log and item names...")
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        f_official = pool.submit(fetch_json, HISCORES_URL, {"player": RSN})
-        f_temple = pool.submit(fetch_temple_collection_log, RSN)
-        f_items = pool.submit(load_item_names)
+    # Each runs in a copy of this context, so the account's data dir (and a
+    # fleet run's per-account log) follow it into the pool.
+    with span("fetch sources"), ThreadPoolExecutor(max_workers=3) as pool:
+        f_official = pool.submit(copy_context().run, fetch_json, hiscores_url(hiscores_variant), {"player": rsn})
+        f_temple = pool.submit(copy_context().run, fetch_temple_collection_log, rsn)
+        f_items = pool.submit(copy_context().run, load_item_names) if item_names is None else None
         official = f_official.result()
         temple_data = f_temple.result()
-        item_names = f_items.result()
+        if f_items is not None:
+            item_names = f_items.result()
 
     # Pull Combat Achievement points and collection-log count straight from the
     # hiscores so the headline numbers stay current without any manual edits.
@@ -697,8 +968,8 @@ def main():
     combat = 0.25 * (def_ + hp + (pray // 2)) + max(0.325 * (att + str_), 0.325 * rng * 1.5, 0.325 * mag * 1.5)
 
     if skills:
-        save_json(DATA_DIR / "skills.json", {
-            "rsn": RSN, "updated": now.isoformat(), "skills": skills,
+        save_json(data_dir / "skills.json", {
+            "rsn": rsn, "updated": now.isoformat(), "skills": skills,
             "milestones": {
                 "total_level": overall.get("level", 0),
                 "total_xp": overall.get("xp", 0),
@@ -724,26 +995,27 @@ def main():
                     bosses[BOSS_RENAMES.get(name, name)] = {"kc": score, "rank": a.get("rank", -1)}
 
     if bosses:
-        save_json(DATA_DIR / "bosses.json", {"rsn": RSN, "updated": now.isoformat(), "bosses": bosses})
+        save_json(data_dir / "bosses.json", {"rsn": rsn, "updated": now.isoformat(), "bosses": bosses})
 
     if clues:
-        save_json(DATA_DIR / "clues.json", {"rsn": RSN, "updated": now.isoformat(), "clues": clues})
+        save_json(data_dir / "clues.json", {"rsn": rsn, "updated": now.isoformat(), "clues": clues})
 
     # Build collection log from pre-fetched Temple data (falls back to YAML)
     print("Loading collection log...")
     clog = load_collection_log(temple_data, item_names)
     if clog:
-        save_json(DATA_DIR / "collection_log.json", {
-            "rsn": RSN, "updated": now.isoformat(), "collection_log": clog
+        save_json(data_dir / "collection_log.json", {
+            "rsn": rsn, "updated": now.isoformat(), "collection_log": clog
         })
         print(f"Collection log: {clog['total_obtained']}/{clog['total_items']} items (source: {clog.get('source', 'unknown')})")
+        save_clog_shards(data_dir, clog, rsn, now.isoformat())
 
         # Extract pets from collection log
         print("Extracting pets from collection log...")
         pets = extract_pets_from_clog(clog)
         if pets:
-            save_json(DATA_DIR / "pets.json", {
-                "rsn": RSN, "updated": now.isoformat(), "pets": pets
+            save_json(data_dir / "pets.json", {
+                "rsn": rsn, "updated": now.isoformat(), "pets": pets
             })
             print(f"Pets: {pets['total_obtained']}/{pets['total_pets']} pets (from clog)")
     else:
@@ -751,8 +1023,8 @@ def main():
         print("Loading pets from YAML (fallback)...")
         pets = load_pets()
         if pets:
-            save_json(DATA_DIR / "pets.json", {
-                "rsn": RSN, "updated": now.isoformat(), "pets": pets
+            save_json(data_dir / "pets.json", {
+                "rsn": rsn, "updated": now.isoformat(), "pets": pets
             })
             print(f"Pets: {pets['total_obtained']}/{pets['total_pets']} pets")
 
@@ -760,8 +1032,8 @@ def main():
     print("Loading combat achievements from YAML...")
     ca = load_combat_achievements()
     if ca:
-        save_json(DATA_DIR / "combat_achievements.json", {
-            "rsn": RSN, "updated": now.isoformat(), "combat_achievements": ca
+        save_json(data_dir / "combat_achievements.json", {
+            "rsn": rsn, "updated": now.isoformat(), "combat_achievements": ca
         })
         print(f"Combat achievements: {ca['total_completed']}/{ca['total_tasks']} tasks")
 
@@ -769,14 +1041,38 @@ def main():
     print("Loading quests from YAML...")
     quests = load_quests()
     if quests:
-        save_json(DATA_DIR / "quests.json", {
-            "rsn": RSN, "updated": now.isoformat(), "quests": quests
+        save_json(data_dir / "quests.json", {
+            "rsn": rsn, "updated": now.isoformat(), "quests": quests
         })
         print(f"Quests: {quests['total_completed']}/{quests['total_quests']} "
               f"(+{quests['miniquests_completed']}/{quests['total_miniquests']} miniquests)")
 
+    # Month-by-month timeline of everything dated across the sources above
+    drops_yaml = read_data_file("drops.yaml")
+    months, undated = build_timeline(clog, ca, pets, parse_drops_yaml(drops_yaml) if drops_yaml else [],
+                                     load_drops_sources())
+    save_timeline(data_dir, months, undated, rsn, now.isoformat())
+
+    return {
+        "rsn": rsn,
+        "hiscores": official is not None,
+        "temple": temple_data is not None,
+        "clog_source": clog.get("source") if clog else None,
+        # Activity signals for the refresh schedule (scheduler.py).
+        "total_xp": overall.get("xp"),
+        "temple_synced": temple_data["data"].get("last_changed") if temple_data and "data" in temple_data else None,
+    }
+
+
+def main():
+    now = datetime.now(timezone.utc)
+    print(f"Updating stats for: {RSN}")
+    print(f"Timestamp: {now.isoformat()}")
+    print("-" * 50)
+    update_account(RSN, DATA_DIR, now=now)
+    update_ranks(now.isoformat())
     print("-" * 50)
     print("Update complete!")
 
 if __name__ == "__main__":
-    main()
+    run_instrumented(main, data_dir_label("update_stats"))
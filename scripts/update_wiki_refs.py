@@ -25,6 +25,8 @@ from datetime import datetime, timezone
 from html.parser import HTMLParser
 from pathlib import Path
 
+from osrs_utils import upstream_url
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 API = "https://oldschool.runescape.wiki/api.php"
 
@@ -33,7 +35,7 @@ def fetch_rendered_html(page):
     params = {"action": "parse", "page": page, "prop": "text",
               "format": "json", "formatversion": "2"}
     url = f"{API}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers={"User-Agent": "OSRS-Ironman-Tracker/1.0"})
+    req = urllib.request.Request(upstream_url(url), headers={"User-Agent": "OSRS-Ironman-Tracker/1.0"})
     with urllib.request.urlopen(req, timeout=60) as resp:
         return json.loads(resp.read().decode())["parse"]["text"]
 
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for every upstream API the scripts call, with fault injection.
+
+Point the scripts at it with OSRS_UPSTREAM; fetch_json (and the two wiki
+scrapers that call urlopen directly) then request
+https://<host>/<path>?<query> as <OSRS_UPSTREAM>/<host>/<path>?<query>:
+
+    python scripts/upstream_sim.py --port 8765 --latency 150 --jitter 100 \\
+        --error-rate 0.05 --rate-limit 0.05 --truncate-rate 0.02
+    OSRS_UPSTREAM=http://127.0.0.1:8765 OSRS_DATA_DIR=/tmp/sim-data \\
+        python scripts/update_stats.py
+
+Responses come from one of three sources:
+
+  synthetic (default)  seeded payloads in each service's shape: hiscores
+                       index_lite.json, Temple clog + items, prices.wiki
+                       latest/5m/1h/timeseries/mapping and MediaWiki
+                       parse/query (--items sizes the collection log)
+  --record DIR         proxy to the real service (or --origin, e.g. another
+                       simulator) and save every response to DIR
+  --replay DIR         serve what --record saved; anything not recorded is a 404
+
+Faults are rolled per request from a seeded RNG, after the latency delay:
+--rate-limit answers 429 with Retry-After, --error-rate answers 500, and
+--truncate-rate sends a full Content-Length with only half the body, which
+the client sees as a dropped connection. GET /_sim/stats returns request and
+fault counts per upstream host.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from osrs_utils import USER_AGENT
+from synthetic import gen_league_tasks, gen_temple_clog
+
+DEFAULT_PORT = 8765
+DEFAULT_ITEMS = 1500
+SYNTHETIC_SYNC = "2026-01-01 00:00:00"  # Temple's last_changed for every synthetic player
+
+HISCORES_SKILLS = (
+    "Overall", "Attack", "Defence", "Strength", "Hitpoints", "Ranged", "Prayer", "Magic", "Cooking",
+    "Woodcutting", "Fletching", "Fishing", "Firemaking", "Crafting", "Smithing", "Mining", "Herblore",
+    "Agility", "Thieving", "Slayer", "Farming", "Runecraft", "Hunter", "Construction", "Sailing",
+)
+HISCORES_ACTIVITIES = (
+    "Clue Scrolls (all)", "Clue Scrolls (beginner)", "Clue Scrolls (easy)", "Clue Scrolls (medium)",
+    "Clue Scrolls (hard)", "Clue Scrolls (elite)", "Clue Scrolls (master)", "Collections Logged",
+    "Combat Achievements", "Chambers of Xeric", "Theatre of Blood", "Tombs of Amascut", "Zulrah", "Vorkath",
+    "General Graardor", "Kree'Arra", "Commander Zilyana", "K'ril Tsutsaroth", "The Corrupted Gauntlet",
+    "Phantom Muspah", "Vardorvis", "Duke Sucellus", "The Leviathan", "The Whisperer",
+)
+DIARY_TIERS = ("Easy", "Medium", "Hard", "Elite")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic payloads
+# ---------------------------------------------------------------------------
+
+def _rng(seed: int, *key) -> random.Random:
+    """A generator seeded by the run seed plus the request's identity."""
+    return random.Random(f"{seed}:{':'.join(map(str, key))}")
+
+
+def hiscores(player: str, seed: int = 1) -> dict:
+    rng = _rng(seed, "hiscores", player.lower())
+    skills = [{"id": i, "name": name, "rank": rng.randrange(1, 200_000), "level": rng.randrange(40, 100),
+               "xp": rng.randrange(40_000, 14_000_000)} for i, name in enumerate(HISCORES_SKILLS[1:], start=1)]
+    overall = {"id": 0, "name": "Overall", "rank": rng.randrange(1, 200_000),
+               "level": sum(s["level"] for s in skills), "xp": sum(s["xp"] for s in skills)}
+    activities = [{"id": i, "name": name, "rank": rng.randrange(1, 100_000), "score": rng.randrange(-1, 800)}
+                  for i, name in enumerate(HISCORES_ACTIVITIES)]
+    return {"name": player, "skills": [overall, *skills], "activities": activities}
+
+
+class SyntheticData:
+    """The collection log and item universe shared by the Temple and prices routes."""
+
+    def __init__(self, n_items: int = DEFAULT_ITEMS, seed: int = 1):
+        self.seed = seed
+        self.temple, _, _, self.item_names = gen_temple_clog(n_items, seed)
+        rng = _rng(seed, "prices")
+        self.prices = {item_id: rng.randrange(1, 5_000_000) for item_id in self.item_names}
+
+    def temple_clog(self, player: str) -> dict:
+        return {"data": {**self.temple["data"], "player": player, "last_changed": SYNTHETIC_SYNC}}
+
+    def latest(self, now: int) -> dict:
+        return {"data": {item_id: {"high": p, "highTime": now, "low": p * 97 // 100, "lowTime": now}
+                         for item_id, p in self.prices.items()}}
+
+    def window(self, now: int) -> dict:
+        return {"timestamp": now, "data": {item_id: {
+            "avgHighPrice": p, "highPriceVolume": 10, "avgLowPrice": p * 97 // 100, "lowPriceVolume": 12,
+        } for item_id, p in self.prices.items()}}
+
+    def timeseries(self, item_id: str, timestep: str, now: int) -> dict:
+        step = {"5m": 300, "1h": 3600, "6h": 21600, "24h": 86400}.get(timestep, 86400)
+        base, rng = self.prices.get(item_id, 1000), _rng(self.seed, "timeseries", item_id, timestep)
+        rows = []
+        for i in range(365, 0, -1):
+            price = max(1, round(base * rng.uniform(0.8, 1.2)))
+            rows.append({"timestamp": now - now % step - i * step, "avgHighPrice": price,
+                         "avgLowPrice": price * 97 // 100, "highPriceVolume": 5, "lowPriceVolume": 7})
+        return {"data": rows, "itemId": int(item_id) if item_id.isdigit() else None}
+
+    def mapping(self) -> list[dict]:
+        return [{"id": int(item_id), "name": name, "examine": name, "members": True, "lowalch": p // 3,
+                 "highalch": p // 2, "value": p // 2, "limit": 8, "icon": f"{name}.png"}
+                for (item_id, name), p in zip(self.item_names.items(), self.prices.values(), strict=True)]
+
+
+def diary_wikitext(page: str, seed: int = 1) -> str:
+    rng = _rng(seed, "diary", page)
+    lines = []
+    for tier in DIARY_TIERS:
+        lines.append(f'{{| class="wikitable" data-diary-tier="{tier}"')
+        lines += [f"|{i}. [[{page}|Task]] number {i} for the {tier.lower()} tier" for i in range(1, rng.randrange(8, 16))]
+        lines.append("|}")
+    return "\n".join(lines)
+
+
+def league_tasks_html(seed: int = 1, n_tasks: int = 400) -> str:
+    tasks, _ = gen_league_tasks(n_tasks, n_items=50, seed=seed)
+    rng = _rng(seed, "league")
+    rows = ["<tr><th>Area</th><th>Name</th><th>Task</th><th>Requirements</th><th>Pts</th><th>Comp%</th></tr>"]
+    for task in tasks:
+        area = rng.choice(("Misthalin", "Karamja", "Asgarnia", "Kandarin", "General"))
+        rows.append(f'<tr><td><a title="Leagues/{area}">{area}</a></td><td>{task["name"]}</td>'
+                    f'<td>{task["desc"]}</td><td>N/A</td><td>{rng.choice((10, 30, 80, 200, 400))}</td>'
+                    f"<td>{rng.uniform(0, 90):.1f}%</td></tr>")
+    return f'<table class="wikitable">{"".join(rows)}</table>'
+
+
+def wiki_api(query: dict, seed: int = 1) -> dict | None:
+    action = query.get("action")
+    if action == "parse":
+        page = query.get("page", "")
+        if query.get("prop") == "text":
+            return {"parse": {"title": page, "pageid": 1, "text": league_tasks_html(seed)}}
+        return {"parse": {"title": page, "pageid": 1, "wikitext": diary_wikitext(page, seed)}}
+    if action == "query":
+        titles = [t for t in query.get("titles", "").split("|") if t]
+        return {"batchcomplete": True, "query": {"pages": [
+            {"pageid": i, "ns": 0, "title": title,
+             "revisions": [{"slots": {"main": {"contentmodel": "wikitext", "content": diary_wikitext(title, seed)}}}]}
+            for i, title in enumerate(titles, start=1)
+        ]}}
+    return None
+
+
+def synthetic_response(host: str, path: str, query: dict, data: SyntheticData, now: int | None = None):
+    """The JSON payload for one upstream request, or None if no route matches."""
+    now = int(time.time()) if now is None else now
+    if host == "secure.runescape.com" and path.endswith("/index_lite.json"):
+        return hiscores(query.get("player", "player"), data.seed)
+    if host == "templeosrs.com" and path.endswith("/player_collection_log.php"):
+        return data.temple_clog(query.get("player", "player"))
+    if host == "templeosrs.com" and path.endswith("/items.php"):
+        return {"items": data.item_names}
+    if host == "prices.runescape.wiki":
+        endpoint = path.rsplit("/", 1)[-1]
+        if endpoint == "latest":
+            return data.latest(now)
+        if endpoint in ("5m", "1h"):
+            return data.window(now)
+        if endpoint == "timeseries":
+            return data.timeseries(query.get("id", ""), query.get("timestep", "24h"), now)
+        if endpoint == "mapping":
+            return data.mapping()
+    if host == "oldschool.runescape.wiki" and path.endswith("/api.php"):
+        return wiki_api(query, data.seed)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Record / replay
+# ---------------------------------------------------------------------------
+
+def cassette_path(root: Path, host: str, path: str, query: str) -> Path:
+    key = hashlib.sha1(f"{path}?{query}".encode()).hexdigest()[:16]
+    return root / host / f"{key}.json"
+
+
+def record(root: Path, host: str, path: str, query: str, status: int, content_type: str, body: bytes):
+    target = cassette_path(root, host, path, query)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({
+        "url": f"https://{host}{path}" + (f"?{query}" if query else ""),
+        "status": status, "content_type": content_type, "body": body.decode("utf-8", "replace"),
+    }, indent=1), encoding="utf-8")
+
+
+def replay(root: Path, host: str, path: str, query: str) -> tuple[int, str, bytes] | None:
+    try:
+        saved = json.loads(cassette_path(root, host, path, query).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return saved["status"], saved["content_type"], saved["body"].encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class SimConfig:
+    """What the simulator serves and which faults it injects."""
+
+    def __init__(self, *, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 rate_limit: float = 0, truncate_rate: float = 0, retry_after: int = 1,
+                 items: int = DEFAULT_ITEMS, seed: int = 1, record_dir: Path | None = None,
+                 replay_dir: Path | None = None, origin: str | None = None):
+        if record_dir and replay_dir:
+            raise ValueError("record and replay are mutually exclusive")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.truncate_rate = truncate_rate
+        self.retry_after = retry_after
+        self.items = items
+        self.seed = seed
+        self.record_dir = record_dir
+        self.replay_dir = replay_dir
+        self.origin = origin  # where --record forwards to; None = https://<host>
+
+
+class SimStats:
+    """Request and fault counts per upstream host (thread-safe)."""
+
+    KINDS = ("requests", "ok", "rate_limited", "errors", "truncated", "not_found", "recorded", "replayed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts: dict[str, dict[str, int]] = {}
+
+    def count(self, host: str, kind: str):
+        with self._lock:
+            counts = self.hosts.setdefault(host, dict.fromkeys(self.KINDS, 0))
+            counts[kind] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {host: dict(counts) for host, counts in sorted(self.hosts.items())}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_SimServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: dict | None = None,
+              truncate: bool = False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if truncate:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body[:len(body) // 2] if truncate else body)
+        if truncate:
+            self.close_connection = True
+
+    def do_GET(self):
+        sim = self.server
+        split = urllib.parse.urlsplit(self.path)
+        if split.path == "/_sim/stats":
+            return self._send(HTTPStatus.OK, json.dumps(sim.stats.to_dict()).encode())
+        host, _, rest = split.path.lstrip("/").partition("/")
+        path = "/" + rest
+        sim.stats.count(host, "requests")
+
+        config, rng = sim.config, sim.roll()
+        delay = config.latency_ms + (rng.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if rng.random() < config.rate_limit:
+            sim.stats.count(host, "rate_limited")
+            return self._send(HTTPStatus.TOO_MANY_REQUESTS, b'{"error": "rate limited"}',
+                              headers={"Retry-After": str(config.retry_after)})
+        if rng.random() < config.error_rate:
+            sim.stats.count(host, "errors")
+            return self._send(HTTPStatus.INTERNAL_SERVER_ERROR, b'{"error": "injected failure"}')
+
+        response = sim.respond(host, path, split.query)
+        if response is None:
+            sim.stats.count(host, "not_found")
+            return self._send(HTTPStatus.NOT_FOUND, json.dumps({"error": f"no route for {host}{path}"}).encode())
+        status, content_type, body = response
+        truncate = status == HTTPStatus.OK and rng.random() < config.truncate_rate
+        sim.stats.count(host, "truncated" if truncate else "ok")
+        self._send(status, body, content_type, truncate=truncate)
+
+
+class _SimServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: SimConfig, quiet: bool):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.quiet = quiet
+        self.stats = SimStats()
+        self.data = SyntheticData(config.items, config.seed)
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+
+    def roll(self) -> random.Random:
+        """A per-request RNG drawn from the seeded stream, so fault patterns are repeatable."""
+        with self._rng_lock:
+            return random.Random(self._rng.getrandbits(64))
+
+    def respond(self, host: str, path: str, query: str) -> tuple[int, str, bytes] | None:
+        config = self.config
+        if config.replay_dir is not None:
+            saved = replay(config.replay_dir, host, path, query)
+            if saved is not None:
+                self.stats.count(host, "replayed")
+            return saved
+        if config.record_dir is not None:
+            return self._forward(host, path, query)
+        payload = synthetic_response(host, path, dict(urllib.parse.parse_qsl(query)), self.data)
+        if payload is None:
+            return None
+        return HTTPStatus.OK, "application/json", json.dumps(payload, separators=(",", ":")).encode()
+
+    def _forward(self, host: str, path: str, query: str) -> tuple[int, str, bytes]:
+        base = f"{self.config.origin.rstrip('/')}/{host}" if self.config.origin else f"https://{host}"
+        url = f"{base}{path}" + (f"?{query}" if query else "")
+        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                status, content_type, body = resp.status, resp.headers.get_content_type(), resp.read()
+        except urllib.error.HTTPError as e:
+            status, content_type, body = e.code, e.headers.get_content_type(), e.read()
+        except OSError as e:
+            # Don't record a local network failure as the service's answer.
+            return HTTPStatus.BAD_GATEWAY, "application/json", json.dumps({"error": str(e)}).encode()
+        record(self.config.record_dir, host, path, query, status, content_type, body)
+        self.stats.count(host, "recorded")
+        return status, content_type, body
+
+
+class UpstreamSimulator:
+    """Run the simulator in a background thread: `with UpstreamSimulator(config) as sim: sim.url`."""
+
+    def __init__(self, config: SimConfig | None = None, host: str = "127.0.0.1", port: int = 0,
+                 quiet: bool = True):
+        self.server = _SimServer((host, port), config or SimConfig(), quiet)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict:
+        return self.server.stats.to_dict()
+
+    def start(self) -> "UpstreamSimulator":
+        # A short poll interval keeps stop() (and test teardown) quick.
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0, metavar="MS", help="delay before every response")
+    parser.add_argument("--jitter", type=float, default=0, metavar="MS", help="extra random delay, 0..MS")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests answered 500")
+    parser.add_argument("--rate-limit", type=float, default=0, help="fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on a 429")
+    parser.add_argument("--truncate-rate", type=float, default=0, help="fraction of 200s cut off halfway")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="synthetic collection log size")
+    parser.add_argument("--seed", type=int, default=1)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, metavar="DIR", help="proxy upstream and save responses to DIR")
+    mode.add_argument("--replay", type=Path, metavar="DIR", help="serve responses saved by --record")
+    parser.add_argument("--origin", help="with --record, forward to <ORIGIN>/<host>/... instead of https://<host>")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    config = SimConfig(
+        latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate, rate_limit=args.rate_limit,
+        truncate_rate=args.truncate_rate, retry_after=args.retry_after, items=args.items, seed=args.seed,
+        record_dir=args.record, replay_dir=args.replay, origin=args.origin,
+    )
+    sim = UpstreamSimulator(config, args.host, args.port, quiet=not args.verbose)
+    mode = f"recording to {args.record}" if args.record else f"replaying {args.replay}" if args.replay else "synthetic"
+    print(f"Upstream simulator ({mode}) on {sim.url}")
+    print(f"  OSRS_UPSTREAM={sim.url}")
+    try:
+        sim.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.server.server_close()
+        print(json.dumps(sim.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
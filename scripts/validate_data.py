@@ -9,11 +9,12 @@ files that exist are checked, so optional/local-only data is fine to omit.
 Exit code 0 = all present files valid, 1 = at least one problem.
 """
 
-import json
 import os
 import sys
 from pathlib import Path
 
+from osrs_utils import load_json
+
 # Respects OSRS_DATA_DIR (e.g. "data/gim") so CI can validate each account.
 DATA_DIR = Path(os.environ["OSRS_DATA_DIR"]) if os.environ.get("OSRS_DATA_DIR") else (Path(__file__).parent.parent / "data")
 
@@ -37,6 +38,18 @@ SCHEMA = {
     ],
     "quests.json": [("updated", str), ("quests.categories", dict)],
     "pets.json": [("updated", str), ("pets.obtained", list), ("pets.missing", list)],
+    "collection_log/index.json": [
+        ("updated", str),
+        ("collection_log.categories", dict),
+        ("collection_log.total_obtained", int),
+        ("collection_log.recent_items", list),
+    ],
+    "dashboard.json": [("version", int), ("account", str), ("updated", str)],
+    "progression.json": [("updated", str), ("current_phase", str), ("phases", list)],
+    "ranks.json": [("updated", str), ("accounts", list), ("skills", dict)],
+    "targets_clog.json": [("updated", str), ("missing_count", int), ("top_sources", list), ("items", list)],
+    "targets_ca.json": [("updated", str), ("monsters", list), ("orders", dict), ("tasks", list)],
+    "timeline/index.json": [("updated", str), ("timeline.months", dict), ("timeline.undated", dict)],
 }
 
 
@@ -51,8 +64,8 @@ def _get(data, dotted):
 def validate_file(path: Path, rules) -> list:
     errors = []
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError) as e:
+        data = load_json(path)
+    except (ValueError, OSError) as e:
         return [f"{path.name}: not valid JSON ({e})"]
 
     for key_path, expected_type in rules:
@@ -0,0 +1,28 @@
+"""Fixtures shared across test modules."""
+
+import pytest
+
+import osrs_utils as U
+import upstream_sim
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Start a simulator with the given config and route every fetch through it."""
+    running = []
+
+    def start(items=120, **config):
+        server = upstream_sim.UpstreamSimulator(upstream_sim.SimConfig(items=items, **config)).start()
+        running.append(server)
+        monkeypatch.setattr(U, "UPSTREAM", server.url)
+        return server
+
+    yield start
+    for server in running:
+        server.stop()
+
+
+@pytest.fixture
+def simulator(upstream):
+    """A small default simulator every fetch goes to, for tests that run whole account updates."""
+    return upstream(items=60)
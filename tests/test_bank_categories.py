@@ -0,0 +1,45 @@
+"""Tests for the compiled bank categorizer and its persisted memo."""
+
+import bank_categories as C
+from osrs_config import CATEGORY_RULES
+
+
+def _linear(name, rules=CATEGORY_RULES):
+    """The original rule-by-rule substring scan the automaton replaces."""
+    for category, subcategory, keywords in rules:
+        if any(k.lower() in name.lower() for k in keywords):
+            return category, subcategory
+    return C.FALLBACK
+
+
+def test_matcher_agrees_with_linear_scan():
+    matcher = C.CategoryMatcher()
+    keywords = [k for _, _, ks in CATEGORY_RULES for k in ks]
+    names = keywords + [f"{a} {b}" for a, b in zip(keywords, reversed(keywords), strict=True)]
+    names += [k[1:] + "x" + k for k in keywords] + ["Mysterious widget", ""]
+    assert [matcher.categorize(n) for n in names] == [_linear(n) for n in names]
+
+
+def test_matcher_lowest_rule_wins_and_finds_suffix_keywords():
+    rules = [("A", "late", ["berry pie"]), ("B", "early", ["pie"]), ("C", "x", ["xpie"])]
+    matcher = C.CategoryMatcher(rules)
+    # "pie" only matches through the failure link out of "xpie".
+    assert matcher.categorize("Apple pie") == ("B", "early")
+    assert matcher.categorize("xpie") == ("B", "early")
+    assert matcher.categorize("Redberry pie") == ("A", "late")
+
+
+def test_memo_persists_and_is_invalidated_by_rule_edits(tmp_path):
+    path = tmp_path / "memo.json"
+    rules = [("Food", "Pie", ["pie"])]
+    memo = C.CategoryMemo(path, rules)
+    assert memo.categorize("Apple pie") == ("Food", "Pie")
+    assert memo.save() and not memo.save()  # nothing new the second time
+
+    again = C.CategoryMemo(path, rules)
+    assert again.categorize("APPLE PIE") == ("Food", "Pie")
+    assert again.added == 0 and again._matcher is None
+
+    edited = C.CategoryMemo(path, [("Food", "Pastry", ["pie"])])
+    assert edited.entries == {}
+    assert edited.categorize("Apple pie") == ("Food", "Pastry")
@@ -0,0 +1,51 @@
+"""Tests for the array-backed bank valuation engine."""
+
+import pytest
+
+import bank_valuation as V
+import update_bank as B
+
+
+def _items():
+    rows = [
+        ("Abyssal whip", "Equipment", "Melee Weapons", 1, 1_400_000),
+        ("Coins", "Currency", "Coins & Tokens", 5_000_000, 1),
+        ("Shark", "Food", "Cooked Fish", 300, 900),
+        ("Dragon claws", "Equipment", "Melee Weapons", 1, 70_000_000),
+        ("Rune platebody", "Equipment", "Armor", 2, 38_000),
+        ("Manta ray", "Food", "Cooked Fish", 270_000, 1),  # ties Shark on value
+    ]
+    return [
+        {"id": i, "name": n, "category": c, "subcategory": s, "quantity": q, "ge_price": p, "total_value": q * p}
+        for i, (n, c, s, q, p) in enumerate(rows, start=1)
+    ]
+
+
+def test_summary_matches_item_by_item_totals():
+    items = _items()
+    expected = {}
+    for item in items:
+        B.add_to_summary(expected, item)
+    summary = V.BankArrays(items, use_numpy=False).summary()
+    assert summary == expected
+    assert list(summary) == list(expected)  # first-appearance order kept
+    assert list(summary["Equipment"]["subcategories"]) == ["Melee Weapons", "Armor"]
+
+
+def test_top_matches_full_sort_including_ties():
+    items = _items()
+    bank = V.BankArrays(items, use_numpy=False)
+    by_sort = sorted(range(len(items)), key=lambda i: items[i]["total_value"], reverse=True)
+    for n in (1, 3, 4, 5, len(items), 50):
+        assert bank.top(n) == by_sort[:n]
+    assert bank.total_value() == sum(i["total_value"] for i in items)
+    assert V.BankArrays([]).top(10) == []
+
+
+def test_numpy_path_agrees_with_stdlib_path():
+    pytest.importorskip("numpy")
+    items = _items() * 50
+    plain, fast = V.BankArrays(items, use_numpy=False), V.BankArrays(items, use_numpy=True)
+    assert fast.summary() == plain.summary()
+    for n in (1, 4, 10, 299):
+        assert fast.top(n) == plain.top(n)
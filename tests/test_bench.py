@@ -0,0 +1,39 @@
+"""Tests for the benchmark cases and baseline comparison."""
+
+import bench
+
+
+def test_every_case_runs_at_a_tiny_size(capsys):  # capsys swallows the functions' logging
+    for setup, _, _ in bench.CASES.values():
+        setup(12)()
+
+
+def _run(results):
+    return {"calibration": 1.0, "results": results,
+            "seconds": {name: dict(sizes) for name, sizes in results.items()}}
+
+
+def test_compare_flags_regressions_past_tolerance():
+    baseline = {"results": {"a": {"10": 1.0, "100": 10.0}}}
+    rows = bench.compare(_run({"a": {"10": 1.4, "100": 16.0}, "b": {"10": 1.0}}), baseline, tolerance=0.5)
+    by_key = {(r["case"], r["size"]): r for r in rows}
+    assert not by_key["a", 10]["regression"]
+    assert by_key["a", 100]["regression"] and round(by_key["a", 100]["ratio"], 2) == 1.6
+    assert by_key["b", 10]["ratio"] is None and not by_key["b", 10]["regression"]
+    assert round(by_key["a", 100]["growth"], 2) == 1.06  # log(16 / 1.4) / log(10)
+
+
+def test_save_baseline_merges_sizes(tmp_path):
+    path = tmp_path / "baseline.json"
+    bench.save_baseline(_run({"a": {"10": 1.0, "100": 10.0}}), path)
+    bench.save_baseline(_run({"a": {"10": 2.0}}), path, merge=bench.load_baseline(path))
+    assert bench.load_baseline(path)["results"] == {"a": {"10": 2.0, "100": 10.0}}
+    path.write_text('{"version": 0}')
+    assert bench.load_baseline(path) is None
+
+
+def test_best_of_keeps_the_faster_reading():
+    first = _run({"a": {"10": 2.0, "100": 10.0}, "b": {"10": 1.0}})
+    best = bench.best_of(first, _run({"a": {"10": 1.5, "100": 12.0}}))
+    assert best["results"] == {"a": {"10": 1.5, "100": 10.0}, "b": {"10": 1.0}}
+    assert best["seconds"]["a"] == {"10": 1.5, "100": 10.0}
@@ -0,0 +1,34 @@
+"""Tests for the batched diary-page fetch (fetch_json is stubbed, no network)."""
+
+import build_diary_tasks as D
+
+WIKITEXT = (
+    '<div data-diary-tier="Easy">\n'
+    "|1. Kill a [[Goblin|goblin]]{{SCP|Attack|1}}\n"
+    '<div data-diary-tier="Hard">\n'
+    "|1. Enter the [[Wilderness]]\n"
+)
+
+
+def _query_response(pages, normalized=()):
+    return {"query": {
+        "normalized": [{"from": f, "to": t} for f, t in normalized],
+        "pages": [{"title": t, "revisions": [{"slots": {"main": {"content": c}}}]}
+                  for t, c in pages],
+    }}
+
+
+def test_batch_maps_normalized_titles_back(monkeypatch):
+    resp = _query_response([("Kourend & Kebos Diary", WIKITEXT)],
+                           normalized=[("Kourend_&_Kebos_Diary", "Kourend & Kebos Diary")])
+    monkeypatch.setattr(D, "fetch_json", lambda url, params=None: resp)
+    out = D.fetch_wikitext_batch(["Kourend_&_Kebos_Diary"])
+    assert out == {"Kourend_&_Kebos_Diary": WIKITEXT}
+
+
+def test_fetch_all_tasks_falls_back_for_missing_pages(monkeypatch):
+    monkeypatch.setattr(D, "fetch_json", lambda url, params=None: _query_response([("A Diary", WIKITEXT)]))
+    monkeypatch.setattr(D, "fetch_wikitext", lambda page: WIKITEXT)
+    tasks = D.fetch_all_tasks(["A Diary", "B Diary"], batch_size=1)
+    assert tasks["A Diary"]["Easy"] == ["Kill a goblin"]
+    assert tasks["B Diary"]["Hard"] == ["Enter the Wilderness"]
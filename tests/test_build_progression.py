@@ -0,0 +1,59 @@
+"""Tests for build-time milestone and gear-target evaluation."""
+
+import pytest
+
+import build_progression as P
+
+
+def _index(**kw):
+    defaults = {
+        "skills": {"Overall": {"level": 1500}, "Attack": {"level": 75}, "Prayer": {"level": 70}},
+        "bosses": {"Kraken": {"kc": 60}, "Cave Kraken": {"kc": 5}},
+        "drops": [{"item": "Zenyte shard", "boss": "Demonic gorillas"},
+                  {"item": "Zenyte shard", "boss": "Demonic gorillas"},
+                  {"item": "Ahrim's hood", "boss": "Barrows"}],
+        "quests": {"categories": {"Members": {"completed": [{"name": "Recipe for Disaster"}]}}, "total_completed": 1},
+        "ca": {"tiers": {"Grandmaster": {"completed_count": 3, "total_count": 3}}},
+        "clog": {"total_obtained": 2, "collections": {
+            "Fight Caves": {"obtained": [{"name": "Fire cape"}], "missing": []},
+            "Barrows": {"obtained": [{"name": "Ahrim's hood"}], "missing": ["Ahrim's robetop"]}}},
+        "clog_items": ["Fire cape", "Infernal cape", "Ahrim's robetop"],
+    }
+    return P.ProgressIndex(**{**defaults, **kw})
+
+
+def test_checks_use_the_index():
+    idx = _index()
+    assert P.evaluate(("drop", "fire cape"), idx)  # clog-obtained counts as a drop
+    assert P.evaluate(("drop_count", "Zenyte", 2), idx)
+    assert not P.evaluate(("drop_count", "Zenyte", 3), idx)
+    assert P.evaluate(("drops_from", "Barrows", 1), idx)
+    assert P.evaluate(("boss_kc", "kraken", 50), idx)  # first substring match wins
+    assert P.evaluate(("quest", "recipe for"), idx)
+    assert P.evaluate(("any", [("skill", "Prayer", 99), ("skill", "Attack", 70)]), idx)
+    assert not P.evaluate(("all_skills", 99), idx)
+    assert P.evaluate(("ca_tier_done", "Grandmaster"), idx)
+    assert not P.evaluate(("ca_tier_done", "Master"), idx)
+    with pytest.raises(ValueError):
+        P.evaluate(("nope",), idx)
+
+
+def test_evaluate_phases_advances_past_mostly_done_phases():
+    phases = [
+        {"name": "A", "phase": "a", "icon": "", "description": "",
+         "milestones": [("x", "", "skill", ("always",))] * 4 + [("y", "", "drop", ("drop", "Twisted bow"))]},
+        {"name": "B", "phase": "b", "icon": "", "description": "", "milestones": [("z", "", "drop", ("drop", "Nope"))]},
+    ]
+    out = P.evaluate_phases(_index(), phases)
+    assert [p["percent"] for p in out["phases"]] == [80, 0]
+    assert out["current_phase"] == "B"
+    assert (out["completed"], out["total"]) == (4, 6)
+
+
+def test_gear_piece_status_alternatives_and_variants():
+    idx = _index()
+    assert P.piece_status("Rune platebody / Fire cape", idx) is True
+    assert P.piece_status("Infernal cape", idx) is False
+    assert P.piece_status("Ahrim's robetop + Ahrim's hood", idx) is False
+    assert P.piece_status("Fire cape (i)", idx) is True  # variant falls back to the base item
+    assert P.piece_status("Rune platelegs", idx) is None  # not a collection-log item
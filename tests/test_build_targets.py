@@ -0,0 +1,53 @@
+"""Tests for the precomputed Targets tab data (no network involved)."""
+
+import build_targets as T
+
+
+def _clog(*names):
+    return {"collections": {"Misc": {"obtained": [{"name": n, "date": None, "quantity": 1} for n in names]}}}
+
+
+def test_clog_targets_skip_obtained_dedupe_and_rank():
+    comp = {
+        "updated": "2026-04-30",
+        "items": [
+            {"name": "Dragon spear", "sources": ["Misc"], "source_display": "Misc", "comp_pct": 50.1},
+            {"name": "Pet rock", "sources": ["Misc"], "source_display": "Misc", "comp_pct": None},
+            {"name": "Bones", "sources": ["Misc"], "source_display": "Misc", "comp_pct": 99.0},
+            {"name": "Dragon Spear", "sources": ["Misc"], "source_display": "Misc", "comp_pct": 50.1},
+            {"name": "Zenyte", "sources": ["Zulrah", "Misc"], "comp_pct": 10.0},
+        ],
+    }
+    out = T.build_clog_targets(_clog("bones "), comp)
+    assert [i["name"] for i in out["items"]] == ["Dragon spear", "Zenyte", "Pet rock"]
+    assert out["items"][1]["source"] == "Zulrah, Misc"
+    assert out["top_sources"] == [{"name": "Misc", "missing": 2}, {"name": "Zulrah, Misc", "missing": 1}]
+    assert out["wiki"] == {"updated": "2026-04-30", "item_count": 5}
+
+
+def test_ca_targets_orders_indexes_and_rollups():
+    ca = {"tiers": {"Easy": {"completed": [{"name": "Noxious Foe", "date": None}], "not_completed": []}}}
+    table = {"tasks": [
+        {"name": "Noxious Foe", "monster": "Aberrant Spectre", "tier": "Easy", "points": 1, "comp_pct": 61.2},
+        {"name": "Zulrah Speed-Chaser", "monster": "Zulrah", "type": "Speed", "tier": "Elite", "comp_pct": 9.0},
+        {"name": "Snake Rebound", "monster": "Zulrah", "type": "Mechanical", "tier": "Hard", "comp_pct": 20.0},
+        {"name": "Mystery", "tier": "Master", "points": 5, "comp_pct": None},
+    ]}
+    out = T.build_ca_targets(ca, table)
+    names = [t["name"] for t in out["tasks"]]
+    assert names == ["Snake Rebound", "Zulrah Speed-Chaser", "Mystery"]
+
+    def ordered(sort):
+        return [names[i] for i in out["orders"][sort]]
+
+    assert ordered("pct-asc") == ["Zulrah Speed-Chaser", "Snake Rebound", "Mystery"]
+    assert ordered("tier-asc") == ["Snake Rebound", "Zulrah Speed-Chaser", "Mystery"]
+    assert ordered("name-asc") == ["Mystery", "Snake Rebound", "Zulrah Speed-Chaser"]
+    assert out["by_monster"] == {"Zulrah": [0, 1], "Miscellaneous": [2]}
+    assert out["by_type"] == {"Mechanical": [0], "Speed": [1]}
+    assert out["tasks"][1]["points"] == 4  # tier default when the wiki omits points
+    assert out["monsters"] == [
+        {"name": "Zulrah", "points": 7, "tasks": 2},
+        {"name": "Miscellaneous", "points": 5, "tasks": 1},
+    ]
+    assert out["points_available"] == 12
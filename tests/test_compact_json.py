@@ -0,0 +1,40 @@
+"""Tests for the compact dictionary-encoded JSON format."""
+
+import json
+
+import compact_json as C
+
+
+def test_round_trip_collection_log_shape():
+    data = {
+        "updated": "2026-06-22T10:00:00+00:00",
+        "collection_log": {
+            "recent_items": [
+                {"name": "Dragon pickaxe", "date": "2026-06-20", "collection": "Venenatis"},
+                {"name": "Dragon pickaxe", "date": None, "collection": "Callisto"},
+            ],
+            "missing": ["Tyrannical ring", "Treasonous ring"],
+            "empty": [],
+        },
+    }
+    assert C.decode(json.loads(json.dumps(C.encode(data)))) == data
+
+
+def test_table_columns_use_string_table_and_day_numbers():
+    enc = C.encode([{"name": "Bones", "date": "1970-01-11"}, {"name": "Bones", "date": "1970-01-02"}])
+    table = enc["data"]
+    assert table["$c"] == ["s", "d"]
+    assert table["$r"] == [[0, 10], [0, 1]]
+    assert enc["strings"] == ["Bones"]
+
+
+def test_ragged_rows_and_non_dates_stay_literal():
+    rows = [{"name": "a", "kc": 5}, {"name": "b"}]
+    assert C.encode(rows)["data"] == rows
+    enc = C.encode([{"date": "2024-02-30"}, {"date": "soon"}])
+    assert enc["data"]["$c"] == ["s"]
+
+
+def test_decode_passes_plain_json_through():
+    data = {"updated": "t", "value": [1, 2]}
+    assert C.decode(data) is data
@@ -0,0 +1,53 @@
+"""Tests for the untradeable value recipe graph."""
+
+import pytest
+
+import derived_values as D
+from untradeable_values import UNTRADEABLE_RECIPES, UNTRADEABLE_VALUES
+
+
+def _ge(**prices):
+    return {k.lstrip("_"): {"high": v, "low": v} for k, v in prices.items()}
+
+
+def test_recipes_chain_through_values_and_evaluate_once():
+    recipes = {1: ("sum", ("ge", 10), ("mul", ("value", 2), 3)), 2: ("sum", ("value", 3), 5), 4: ("value", 2)}
+    values = D.DerivedValues(_ge(_10=100, _3=7), recipes, table={3: 999})
+    calls = []
+    term = values._term
+    values._term = lambda t: calls.append(t) or term(t)
+    table = values.table_with_recipes()
+    assert table[1] == 100 + 3 * (999 + 5)  # table value beats item 3's GE price
+    assert table[4] == table[2] == 1004
+    assert sum(1 for t in calls if t is recipes[2]) == 1  # item 2 memoized
+    assert values.priced == 3
+
+
+def test_missing_ge_input_falls_back_to_table():
+    values = D.DerivedValues({}, {1: ("ge", 10)}, table={1: 50})
+    assert values.table_with_recipes() == {1: 50}
+    assert values.priced == 0
+
+
+def test_cycle_is_an_error():
+    with pytest.raises(ValueError, match="cycle"):
+        D.DerivedValues({}, {1: ("value", 2), 2: ("value", 1)}, table={}).table_with_recipes()
+
+
+def test_shipped_recipes_evaluate_against_a_full_snapshot():
+    ge_ids = set()
+
+    def collect(term):
+        if isinstance(term, tuple):
+            if term[0] == "ge":
+                ge_ids.add(term[1])
+            for arg in term[1:]:
+                collect(arg)
+
+    for recipe in UNTRADEABLE_RECIPES.values():
+        collect(recipe)
+    snapshot = {str(i): {"high": 1_000_000, "low": 1_000_000} for i in ge_ids}
+    values = D.DerivedValues(snapshot)
+    table = values.table_with_recipes()
+    assert values.priced == len(UNTRADEABLE_RECIPES)
+    assert set(table) == set(UNTRADEABLE_VALUES)  # recipes only re-price existing entries
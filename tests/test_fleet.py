@@ -0,0 +1,115 @@
+"""Tests for the fleet runner's roster, resumable queue and worker loop."""
+
+import json
+
+import fleet as F
+
+
+def test_parse_roster_variants_comments_and_repeats():
+    roster = "# header\nAlpha\n\nGIM Bravo | hiscore_oldschool  # group\nalpha\n"
+    assert F.parse_roster(roster, "board") == [
+        {"rsn": "Alpha", "variant": "board"},
+        {"rsn": "GIM Bravo", "variant": "hiscore_oldschool"},
+    ]
+    assert F.slug("GIM Bravo") == "gim_bravo" and F.slug("a/../b") == "ab"
+
+
+def test_queue_resumes_from_journal(tmp_path):
+    path = tmp_path / "queue.jsonl"
+    queue = F.WorkQueue(path)
+    accounts = [{"rsn": name, "variant": "v"} for name in ("A", "B", "C", "D")]
+    queue.record("A", "running")
+    queue.record("A", "done", seconds=1.0)
+    queue.record("B", "running")  # interrupted mid-update
+    queue.record("C", "running")
+    queue.record("C", "failed", error="boom")
+    queue.close()
+    with open(path, "a") as f:
+        f.write('{"rsn": "D", "sta')  # torn last line
+
+    resumed = F.WorkQueue(path)
+    assert [a["rsn"] for a in resumed.todo(accounts, max_attempts=2)] == ["B", "C", "D"]
+    assert [a["rsn"] for a in resumed.todo(accounts, max_attempts=1)] == ["D"]
+    assert resumed.status("c") == {"status": "failed", "attempts": 1, "error": "boom"}
+    resumed.close()
+    assert F.WorkQueue(path, fresh=True).todo(accounts, 1) == accounts
+
+
+def test_throughput_rates():
+    rate = F.Throughput(now=0)
+    for t in (10, 20, 100):
+        rate.add(now=t)
+    assert rate.per_minute(now=120) == 1.5
+    assert rate.recent_per_minute(now=120) == 1.0  # only t=100 is in the last minute
+
+
+def test_run_fleet_retries_failures_and_logs_per_account(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_update(rsn, data_dir, *, hiscores_variant, item_names):
+        calls.append(rsn)
+        print(f"updating {rsn}")
+        if rsn == "Broken":
+            raise ValueError("bad payload")
+        return {"rsn": rsn, "hiscores": rsn != "Unranked", "temple": True, "clog_source": "temple"}
+
+    monkeypatch.setattr(F.update_stats, "update_account", fake_update)
+    accounts = F.parse_roster("Alpha\nBroken\nUnranked\nBravo")
+    queue = F.WorkQueue(tmp_path / "queue.jsonl")
+    summary = F.run_fleet(accounts, queue, tmp_path / "out", workers=2, max_attempts=2)
+
+    assert summary["done"] == 2 and summary["failed"] == 2
+    assert sorted(calls) == ["Alpha", "Bravo", "Broken", "Broken", "Unranked", "Unranked"]
+    errors = {f["rsn"]: (f["attempts"], f["error"]) for f in summary["failures"]}
+    assert errors["Broken"] == (2, "ValueError: bad payload")
+    assert errors["Unranked"][1].startswith("RuntimeError: hiscores unavailable")
+    assert (tmp_path / "logs" / "alpha.log").read_text() == "updating Alpha\n"
+
+    # Nothing left to do on a rerun: done accounts are skipped, failures are out of attempts.
+    calls.clear()
+    F.run_fleet(accounts, queue, tmp_path / "out", workers=2, max_attempts=2)
+    assert calls == []
+    queue.close()
+
+
+def test_run_fleet_feeds_the_refresh_schedule(tmp_path, monkeypatch):
+    def fake_update(rsn, data_dir, *, hiscores_variant, item_names):
+        if rsn == "Broken":
+            raise ValueError("bad payload")
+        return {"rsn": rsn, "hiscores": True, "temple": True, "clog_source": "temple",
+                "total_xp": 1_000, "temple_synced": "2026-01-01 00:00:00"}
+
+    monkeypatch.setattr(F.update_stats, "update_account", fake_update)
+    schedule = F.RefreshSchedule(None)
+    queue = F.WorkQueue(tmp_path / "queue.jsonl")
+    F.run_fleet(F.parse_roster("Alpha\nBroken"), queue, tmp_path / "out", max_attempts=2, schedule=schedule)
+    queue.close()
+    assert schedule.accounts["alpha"]["xp"] == 1_000 and "checked" in schedule.accounts["alpha"]
+    assert schedule.accounts["broken"]["failures"] == 1  # once, after its last attempt
+    assert [a["rsn"] for a in schedule.due(F.parse_roster("Alpha\nBroken"))] == []
+
+
+def test_fleet_updates_each_account_from_its_own_dir(tmp_path, simulator):
+    out = tmp_path / "accounts"
+    (out / "alpha").mkdir(parents=True)
+    (out / "alpha" / "quests.yaml").write_text("Free-to-play:\n  completed:\n    - Cook's Assistant | 2022-11-25\n")
+    queue = F.WorkQueue(tmp_path / "queue.jsonl")
+    summary = F.run_fleet(F.parse_roster("Alpha\nBravo"), queue, out, workers=2)
+    queue.close()
+
+    assert summary["done"] == 2
+    alpha = json.loads((out / "alpha" / "quests.json").read_text())["quests"]
+    assert alpha["total_completed"] == 1
+    assert not (out / "bravo" / "quests.json").exists()
+    assert json.loads((out / "bravo" / "skills.json").read_text())["rsn"] == "Bravo"
+    assert "Fetching collection log from TempleOSRS for Bravo" in (tmp_path / "logs" / "bravo.log").read_text()
+
+
+def test_fleet_writes_into_a_sqlite_store(tmp_path, simulator):
+    with F.SqliteStore(tmp_path / "fleet.sqlite3") as store:
+        queue = F.WorkQueue(tmp_path / "queue.jsonl")
+        summary = F.run_fleet(F.parse_roster("Alpha\nBravo"), queue, tmp_path / "accounts", workers=2, store=store)
+        queue.close()
+        assert summary["done"] == 2 and store.accounts() == ["Alpha", "Bravo"]
+        assert not list((tmp_path / "accounts").rglob("*.json"))
+        assert '"rsn": "Bravo"' in store.documents("Bravo")["skills.json"]
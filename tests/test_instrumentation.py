@@ -0,0 +1,75 @@
+"""Tests for the timing spans, profiling and tracemalloc reporting in instrumentation."""
+
+import json
+import types
+from pathlib import Path
+
+import instrumentation as T
+import osrs_utils
+
+
+def test_spans_nest_aggregate_and_write_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(T, "PROFILE", False)
+
+    @T.timed()
+    def leaf():
+        return 1
+
+    def main():
+        with T.span("outer"):
+            leaf()
+            leaf()
+        with T.span("outer"):
+            pass
+        return "done"
+
+    assert T.run_instrumented(main, "t", tmp_path) == "done"
+    report = json.loads((tmp_path / "t.json").read_text())
+    [outer] = report["spans"]
+    assert outer["name"] == "outer" and outer["calls"] == 2
+    assert outer["children"] == [{"name": "leaf", "calls": 2, "seconds": outer["children"][0]["seconds"]}]
+
+    T.run_instrumented(main, "t", tmp_path)
+    history = (tmp_path / "t.history.jsonl").read_text().splitlines()
+    assert len(history) == 2
+    assert set(json.loads(history[1])["spans"]) == {"outer", "outer/leaf"}
+
+
+def test_run_instrumented_profiles_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(T, "PROFILE", True)
+    T.run_instrumented(lambda: sum(range(10)), "p", tmp_path)
+    assert (tmp_path / "p.prof").exists()
+    assert "function calls" in (tmp_path / "p.pstats.txt").read_text()
+
+
+def test_run_instrumented_traces_memory_per_span(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(T, "PROFILE", False)
+    monkeypatch.setattr(T, "TRACE_MEMORY", 1)
+    kept = []
+
+    def main():
+        with T.span("keep"):
+            kept.append([bytes(200) for _ in range(2_000)])
+        with T.span("transient"):
+            assert len(b"".join([bytes(200) for _ in range(2_000)])) == 400_000
+
+    T.run_instrumented(main, "m", tmp_path)
+    assert not T.tracemalloc.is_tracing()
+    report = json.loads((tmp_path / "m.json").read_text())
+    keep, transient = (s["memory"] for s in report["spans"])
+    assert keep["retained_kb"] > 390 and keep["peak_kb"] >= keep["retained_kb"]
+    assert keep["sites"][0]["site"].startswith("test_instrumentation.py:")
+    assert transient["retained_kb"] < 50 and transient["peak_kb"] - keep["retained_kb"] > 390
+    assert report["memory"]["snapshot_depth"] == 1 and report["memory"]["peak_kb"] >= keep["peak_kb"]
+    assert "Memory (tracemalloc):" in capsys.readouterr().out
+
+
+def test_only_frames_in_instrumentation_are_excluded_from_sites():
+    def frame(module, lineno):
+        return types.SimpleNamespace(filename=str(Path(module.__file__).resolve()), lineno=lineno)
+
+    assert T._instrumentation(frame(T, 1))
+    # osrs_utils helpers are allocation sites wherever they sit in their file.
+    last_line = len(Path(osrs_utils.__file__).read_text().splitlines())
+    assert not T._instrumentation(frame(osrs_utils, 1))
+    assert not T._instrumentation(frame(osrs_utils, last_line))
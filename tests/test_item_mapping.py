@@ -0,0 +1,49 @@
+"""Tests for the cached item mapping and its normalized name index (no network)."""
+
+import item_mapping as M
+
+MAPPING = [
+    {"id": 2434, "name": "Prayer potion(4)"},
+    {"id": 139, "name": "Prayer potion(3)"},
+    {"id": 99, "name": "Ranarr potion (unf)"},
+    {"id": 6685, "name": "Saradomin brew(4)"},
+    {"id": 4151, "name": "Abyssal whip"},
+]
+
+
+def _no_network(*args, **kwargs):
+    raise AssertionError("fetch_json called with a current cache")
+
+
+def test_normalize_name_collapses_case_spacing_and_suffixes():
+    assert M.normalize_name("prayer potion (4)") == M.normalize_name("Prayer potion(4)")
+    assert M.normalize_name("Ranarr potion(unf)") == M.normalize_name("Ranarr potion ( unf )")
+    assert M.normalize_name("Dharok’s  helm") == "dharok's helm"
+
+
+def test_resolve_normalized_names_and_dose_less_base(monkeypatch):
+    monkeypatch.setattr(M, "fetch_json", lambda url: MAPPING)
+    mapping = M.ItemMapping(path=None)
+    assert mapping.resolve("PRAYER POTION (4)") == 2434
+    assert mapping.resolve("Prayer potion (3)") == 139
+    assert mapping.resolve("Prayer potion") == 2434  # highest dose
+    assert mapping.resolve("Ranarr potion(unf)") == 99
+    assert mapping.resolve("Ranarr potion") is None  # (unf) isn't a dose
+    assert mapping.get("Abyssal whip", 0) == 4151
+
+
+def test_cache_is_reused_until_stale_or_reformatted(monkeypatch, tmp_path):
+    path = tmp_path / "mapping.json"
+    monkeypatch.setattr(M, "fetch_json", lambda url: MAPPING)
+    assert len(M.ItemMapping(path)) == len(MAPPING)
+
+    monkeypatch.setattr(M, "fetch_json", _no_network)
+    cached = M.ItemMapping(path)
+    assert cached.resolve("saradomin brew (4)") == 6685
+
+    calls = []
+    monkeypatch.setattr(M, "fetch_json", lambda url: calls.append(url) or MAPPING[:1])
+    monkeypatch.setattr(M, "CACHE_VERSION", M.CACHE_VERSION + 1)
+    assert len(M.ItemMapping(path)) == 1 and len(calls) == 1
+    monkeypatch.setattr(M, "fetch_json", _no_network)
+    assert len(M.ItemMapping(path, ttl=0, offline=True)) == 1
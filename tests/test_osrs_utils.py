@@ -3,6 +3,7 @@
 import json
 from datetime import date
 
+import instrumentation
 import osrs_utils as U
 
 # --- date handling -------------------------------------------------------
@@ -85,6 +86,32 @@ def test_check_no_dropped_items_raises_on_mismatch():
     raise AssertionError("expected ValueError for dropped item")
 
 
+def test_parse_drops_yaml_matches_dashboard_rules():
+    content = (
+        "drops:\n"
+        "  - boss: Cerberus\n"
+        "    kc: 168\n"
+        "    item: Primordial crystal\n"
+        "    date: 1/15/2026\n"
+        "    droprate: 512\n"
+        "  - boss: Zulrah\n"
+        "    kc: ?\n"
+        "    item: Tanzanite fang\n"
+    )
+    assert U.parse_drops_yaml(content) == [
+        {"boss": "Cerberus", "kc": 168, "item": "Primordial crystal", "date": "1/15/2026", "droprate": 512},
+        {"boss": "Zulrah", "kc": 0, "item": "Tanzanite fang"},  # unparseable kc -> 0, like parseInt || 0
+    ]
+
+
+def test_parse_diaries_yaml_blank_tier_is_incomplete():
+    content = "# header\nArdougne:\n  easy: completed\n  elite:\n"
+    parsed = U.parse_diaries_yaml(content)
+    assert parsed["regions"]["Ardougne"] == {
+        "easy": "completed", "medium": None, "hard": None, "elite": None}
+    assert parsed["tasks_total"] == 492
+
+
 def test_names_lower_handles_dicts_and_strings():
     assert U.names_lower([{"name": "Beaver"}, "Heron"]) == {"beaver", "heron"}
 
@@ -106,3 +133,49 @@ def test_save_json_writes_real_change(tmp_path):
     U.save_json(path, {"updated": "t1", "value": 1})
     U.save_json(path, {"updated": "t2", "value": 2})
     assert json.loads(path.read_text())["value"] == 2
+
+
+def test_save_json_compact_round_trips_and_detects_no_change(tmp_path, capsys):
+    path = tmp_path / "out.json"
+    data = {"updated": "t1", "items": [{"name": "Abyssal whip", "date": "2024-01-15", "quantity": 1}]}
+    U.save_json(path, data, compact=True)
+    assert "$compact" in json.loads(path.read_text())
+    assert U.load_json(path) == data
+    U.save_json(path, {**data, "updated": "t2"}, compact=True)
+    assert "Unchanged" in capsys.readouterr().out
+
+
+# --- HTTP metrics ---------------------------------------------------------
+
+def test_fetch_json_records_per_host_metrics(monkeypatch):
+    class Resp:
+        def __init__(self, body):
+            self.body = body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def read(self):
+            return self.body
+
+    replies = iter([OSError("reset"), b'{"ok": 1}', OSError("down"), OSError("down")])
+
+    def fake_urlopen(req, timeout):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return Resp(reply)
+
+    monkeypatch.setattr(U.urllib.request, "urlopen", fake_urlopen)
+    instrumentation.http_metrics.reset()
+    assert U.fetch_json("https://api.example/a", backoff=0) == {"ok": 1}
+    assert U.fetch_json("https://api.example/b", retries=2, backoff=0) is None
+
+    h = instrumentation.http_metrics.to_dict()["hosts"]["api.example"]
+    assert (h["requests"], h["ok"], h["errors"], h["retries"], h["gave_up"]) == (4, 1, 3, 2, 1)
+    assert h["bytes"] == len(b'{"ok": 1}')
+    assert sum(h["latency_hist"]) == 4
+    assert "api.example" in instrumentation.http_metrics.summary_lines()[1]
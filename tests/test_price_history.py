@@ -0,0 +1,79 @@
+"""Tests for the local GE price store (no network)."""
+
+import pytest
+
+import price_history as P
+
+
+def _no_network(*args, **kwargs):
+    raise AssertionError("fetch_json called while the store was fresh")
+
+
+def test_add_skips_unchanged_prices_and_keeps_time_order():
+    store = P.PriceStore(path=None)
+    assert store.add(4151, 200, 1_500_000, 1_400_000)
+    assert not store.add(4151, 300, 1_500_000, 1_400_000)  # no movement
+    assert store.add(4151, 100, 1_600_000, 1_500_000)      # backfilled, older
+    assert store.items["4151"] == [[100, 1_600_000, 1_500_000], [200, 1_500_000, 1_400_000]]
+    assert store.price_at(4151, 150) == {"high": 1_600_000, "low": 1_500_000}
+    assert store.price_at(4151, 99) is None
+    assert store.prices_at() == {"4151": {"high": 1_500_000, "low": 1_400_000}}
+
+
+def test_latest_prices_uses_store_within_ttl(monkeypatch, tmp_path):
+    path = tmp_path / "prices.json.gz"
+    monkeypatch.setattr(P, "fetch_json", lambda url, *a, **k: {"data": {"4151": {"high": 10, "low": 6}}})
+    store = P.PriceStore(path)
+    assert P.latest_prices(store, ttl=600, now=1000) == {"4151": {"high": 10, "low": 6}}
+    assert store.save()
+
+    monkeypatch.setattr(P, "fetch_json", _no_network)
+    reloaded = P.PriceStore(path)
+    assert P.latest_prices(reloaded, ttl=600, now=1500) == {"4151": {"high": 10, "low": 6}}
+    assert not reloaded.save()  # nothing new recorded
+
+    monkeypatch.setattr(P, "fetch_json", lambda url, *a, **k: {"data": {"4151": {"high": 12, "low": 8}}})
+    assert P.latest_prices(reloaded, ttl=600, now=1700)["4151"]["high"] == 12
+    assert P.bank_value_at([{"id": 4151, "quantity": 2}], reloaded, when=1200) == (16, 1)
+
+
+def test_window_and_timeseries_sources(monkeypatch):
+    store = P.PriceStore(path=None)
+    monkeypatch.setattr(P, "fetch_json", lambda url, params=None, **k: {
+        "timestamp": 900, "data": {"4151": {"avgHighPrice": 11, "avgLowPrice": None}},
+    } if url.endswith("/5m") else {"data": [
+        {"timestamp": 100, "avgHighPrice": 9, "avgLowPrice": 7},
+        {"timestamp": 200, "avgHighPrice": None, "avgLowPrice": None},
+    ]})
+    assert P.window_prices(store, "5m", now=1000) == 1
+    assert P.timeseries(store, 4151, "24h", now=1000) == 1
+    assert store.averages["4151"] == [[100, 9, 7], [900, 11, None]] and store.items == {}
+    monkeypatch.setattr(P, "fetch_json", _no_network)
+    assert P.window_prices(store, "5m", now=1100) == 0
+    with pytest.raises(ValueError):
+        P.window_prices(store, "latest")
+
+
+def test_averages_never_replace_the_latest_snapshot(monkeypatch):
+    store = P.PriceStore(path=None)
+    latest = {"data": {"4151": {"high": 2_000_000, "low": 1_900_000}, "11840": {"high": 500, "low": 400}}}
+    monkeypatch.setattr(P, "fetch_json", lambda url, params=None, **k: latest if url.endswith("/latest") else {
+        "timestamp": 1_100, "data": {"4151": {"avgHighPrice": None, "avgLowPrice": 1_500_000}},
+    } if url.endswith("/5m") else {"data": [{"timestamp": 1_200, "avgHighPrice": 1_700_000, "avgLowPrice": 1_600_000}]})
+    snapshot = P.latest_prices(store, ttl=600, now=1_000)
+    P.window_prices(store, "5m", now=1_100)
+    P.timeseries(store, 4151, "5m", now=1_200)
+
+    monkeypatch.setattr(P, "fetch_json", _no_network)
+    assert P.latest_prices(store, ttl=600, now=1_300) == snapshot
+    # Historical valuation still sees the newest row of either series.
+    assert store.price_at(4151, 1_150) == {"high": None, "low": 1_500_000}
+    assert store.prices_at()["4151"] == {"high": 1_700_000, "low": 1_600_000}
+
+    # An item that leaves /latest is no longer part of the stored snapshot.
+    latest = {"data": {"4151": {"high": 2_000_000, "low": 1_900_000}}}
+    monkeypatch.setattr(P, "fetch_json", lambda url, *a, **k: latest)
+    P.latest_prices(store, ttl=600, now=2_000)
+    monkeypatch.setattr(P, "fetch_json", _no_network)
+    assert P.latest_prices(store, ttl=600, now=2_100) == latest["data"]
+    assert store.price_at(11840, 1_500) == {"high": 500, "low": 400}
@@ -0,0 +1,36 @@
+"""Tests for staging the Pages site (no network involved)."""
+
+import gzip
+import json
+
+import publish_site as P
+
+
+def _tree(root):
+    (root / "data" / "gim").mkdir(parents=True)
+    (root / "index.html").write_text('<link href="styles.css"><script src="app.js"></script>')
+    (root / "styles.css").write_text("body {}")
+    (root / "app.js").write_text("x" * 300)
+    (root / "data" / "skills.json").write_text('{"a": 1}')
+    (root / "data" / "bank.json").write_text("{}")
+    (root / "data" / "gim" / "seed_vault.json").write_text("{}")
+    (root / "data" / "gim" / "drops.yaml").write_text("drops:")
+
+
+def test_publish_hashes_compresses_and_skips_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(P, "ACCOUNTS", [{"dir": "data"}, {"dir": "data/gim"}])
+    _tree(tmp_path)
+    out = tmp_path / "_site"
+    manifest = P.publish(tmp_path, out)
+
+    assets = manifest["assets"]
+    assert set(assets) == {"styles.css", "app.js", "data/skills.json", "data/gim/drops.yaml"}
+    assert not (out / "data" / "bank.json").exists()
+    assert not (out / "data" / "gim" / "seed_vault.json").exists()
+
+    hashed_app = assets["app.js"]
+    assert hashed_app == f"app.{P.content_hash(b'x' * 300)}.js"
+    assert gzip.decompress((out / f"{hashed_app}.gz").read_bytes()) == b"x" * 300
+    assert not (out / f"{assets['data/skills.json']}.gz").exists()  # too small to bother
+    assert f'src="{hashed_app}"' in (out / "index.html").read_text()
+    assert json.loads((out / P.MANIFEST_NAME).read_text())["assets"] == assets
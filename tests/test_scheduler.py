@@ -0,0 +1,69 @@
+"""Tests for the adaptive refresh schedule: learning change rates and spending the budget."""
+
+import math
+
+import pytest
+
+import scheduler as SC
+
+HOUR = 3600
+
+
+def test_allocate_splits_by_sqrt_rate_within_bounds():
+    shares = SC.allocate({"a": 4.0, "b": 1.0, "c": 1.0}, 8, lo=0.5, hi=100)
+    assert shares == pytest.approx({"a": 4.0, "b": 2.0, "c": 2.0})
+    # "a" would get 16/day; pinned at 10, its excess is re-split between the others.
+    shares = SC.allocate({"a": 64.0, "b": 1.0, "c": 1.0}, 20, lo=0.5, hi=10)
+    assert shares == pytest.approx({"a": 10.0, "b": 5.0, "c": 5.0})
+    # The floor wins over a budget too small to honor it.
+    assert SC.allocate({"a": 1.0, "b": 0.0}, 0.1, lo=0.5, hi=10) == {"a": 0.5, "b": 0.5}
+
+
+def _learn(schedule, rsn, days, change_every_hours, now=0.0):
+    xp = 1_000
+    for hour in range(0, days * 24, 6):
+        if hour % change_every_hours == 0:
+            xp += 100
+        schedule.observe(rsn, xp, None, now=now + hour * HOUR)
+
+
+def test_active_accounts_are_refreshed_more_often_than_dormant_ones(tmp_path):
+    schedule = SC.RefreshSchedule(tmp_path / "schedule.json")
+    _learn(schedule, "Active", days=14, change_every_hours=6)
+    _learn(schedule, "Dormant", days=14, change_every_hours=10_000)
+    assert schedule.rate("active") > 20 * schedule.rate("dormant")
+
+    accounts = [{"rsn": "Active", "variant": "v"}, {"rsn": "Dormant", "variant": "v"}, {"rsn": "New", "variant": "v"}]
+    now = 14 * 24 * HOUR
+    plan = {p["rsn"]: p for p in schedule.plan(accounts, budget=40, now=now)}
+    assert plan["Active"]["interval_hours"] < plan["New"]["interval_hours"] < plan["Dormant"]["interval_hours"]
+    per_day = sum(24 / p["interval_hours"] for p in plan.values())
+    assert per_day * SC.REQUESTS_PER_REFRESH == pytest.approx(40, rel=0.01)
+    assert plan["New"]["urgency"] == math.inf
+
+    schedule.save()
+    assert SC.RefreshSchedule(tmp_path / "schedule.json").accounts == schedule.accounts
+
+
+def test_temple_sync_counts_as_activity():
+    schedule = SC.RefreshSchedule(None)
+    assert schedule.observe("A", 5, "2026-01-01 00:00:00", now=0) is None  # first check: nothing to compare
+    assert schedule.observe("A", 5, "2026-01-01 00:00:00", now=HOUR) is False
+    assert schedule.observe("A", 5, "2026-01-02 09:30:00", now=2 * HOUR) is True
+    assert schedule.observe("A", None, None, now=3 * HOUR) is False  # hiscores down: not a change
+
+
+def test_due_caps_each_run_and_backs_off_failures():
+    schedule = SC.RefreshSchedule(None)
+    accounts = [{"rsn": f"P{i}", "variant": "v"} for i in range(10)]
+    for i, account in enumerate(accounts[:6]):
+        schedule.observe(account["rsn"], 1, None, now=0)
+        schedule.observe(account["rsn"], 1 + i, None, now=HOUR)  # P0 unchanged, the rest changed
+    schedule.failed("P9", now=100 * HOUR)
+
+    # 48 requests/day = one refresh an hour; a run every 3 hours gets 3 of them.
+    due = schedule.due(accounts, budget=48, run_every=3, now=100 * HOUR)
+    assert [a["rsn"] for a in due] == ["P6", "P7", "P8"]  # never checked; P9 is backing off
+    due = schedule.due(accounts[:6], budget=48, run_every=24, now=100 * HOUR)
+    assert due[0]["rsn"] != "P0" and due[-1]["rsn"] == "P0"  # most overdue changes first
+    assert [a["rsn"] for a in schedule.due(accounts[9:], now=100 * HOUR + 3 * HOUR)] == ["P9"]
@@ -0,0 +1,105 @@
+"""Tests for the SQLite backend: exact JSON export, capture of an update, normalized rows."""
+
+import shutil
+from datetime import datetime, timezone
+
+import pytest
+
+import osrs_utils as U
+import sqlite_store as Q
+import update_stats as S
+import upstream_sim
+from osrs_utils import REPO_ROOT
+
+
+def _files(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*.json")}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with Q.SqliteStore(tmp_path / "tracker.sqlite3") as db:
+        yield db
+
+
+def test_import_then_export_is_byte_exact(tmp_path, store):
+    data = tmp_path / "data"
+    shutil.copytree(REPO_ROOT / "data", data, ignore=shutil.ignore_patterns("gim", "wiki_*"))
+    assert store.import_dir("FoolinSlays", data) == len(Q.ACCOUNT_FILES)
+
+    out = tmp_path / "out"
+    assert store.export("FoolinSlays", out) == len(Q.ACCOUNT_FILES)
+    assert _files(out) == {name: (data / name).read_bytes() for name in Q.ACCOUNT_FILES}
+    assert store.export("foolinslays", out) == 0  # already identical: nothing rewritten
+
+    clog = U.load_json(data / "collection_log.json")["collection_log"]
+    ca = U.load_json(data / "combat_achievements.json")["combat_achievements"]
+    q = store.conn.execute
+    # One row per slot: an item listed under several collections counts in each.
+    slots = sum(len(c["obtained"]) for c in clog["collections"].values())
+    assert q("SELECT count(*) FROM clog_items WHERE obtained").fetchone()[0] == slots
+    assert q("SELECT count(*) FROM ca_tasks WHERE completed").fetchone()[0] == ca["total_completed"]
+    assert q("SELECT count(*) FROM drops").fetchone()[0] == len(U.parse_drops_yaml((data / "drops.yaml").read_text()))
+    kinds = dict(q("SELECT kind, count(*) FROM snapshots GROUP BY kind").fetchall())
+    assert kinds["skill"] == len(U.load_json(data / "skills.json")["skills"])
+
+
+def test_captured_update_exports_what_a_file_update_writes(tmp_path, store, simulator):
+    t1 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    names = S.load_item_names()
+    result = S.update_account("Zezima", tmp_path / "files", now=t1, item_names=names)
+    assert result["total_xp"] > 0 and result["temple_synced"] == upstream_sim.SYNTHETIC_SYNC
+
+    with store.capture("Zezima", tmp_path / "inputs") as capture:
+        S.update_account("Zezima", tmp_path / "inputs", now=t1, item_names=names)
+    assert not list((tmp_path / "inputs").rglob("*.json"))
+    assert capture.changed and set(capture.changed) == capture.present
+    store.export("Zezima", tmp_path / "out")
+    assert _files(tmp_path / "out") == _files(tmp_path / "files")
+
+    # A later run with the same data only bumps timestamps: nothing is rewritten or re-snapshotted.
+    snapshots = store.counts()["snapshots"]
+    with store.capture("Zezima", tmp_path / "inputs") as capture:
+        S.update_account("Zezima", tmp_path / "inputs", now=datetime(2026, 1, 2, tzinfo=timezone.utc),
+                         item_names=names)
+    assert capture.changed == {} and store.counts()["snapshots"] == snapshots
+    assert '"2026-01-01T00:00:00+00:00"' in store.documents("Zezima")["skills.json"]
+
+
+def test_failed_capture_writes_nothing_and_stale_shards_are_dropped(tmp_path, store):
+    with pytest.raises(RuntimeError), store.capture("A", tmp_path):
+        U.save_json(tmp_path / "skills.json", {"rsn": "A", "skills": {}})
+        raise RuntimeError("fetch failed mid-update")
+    assert store.documents("A") == {}
+
+    with store.capture("A", tmp_path):
+        for name in ("timeline/2026-01.json", "timeline/2026-02.json", "timeline/index.json"):
+            U.save_json(tmp_path / name, {"month": name})
+    with store.capture("A", tmp_path):
+        for name in ("timeline/2026-02.json", "timeline/index.json"):
+            U.save_json(tmp_path / name, {"month": name})
+    assert sorted(store.documents("A")) == ["timeline/2026-02.json", "timeline/index.json"]
+
+
+def test_capture_over_existing_files_keeps_unchanged_months_and_leaves_disk_alone(tmp_path, store):
+    def month(day, name):
+        return [{"date": f"{day}", "source": "drop", "name": name, "detail": "Vorkath"}]
+
+    months = {"2023-12": month("2023-12-01", "Draconic visage"), "2024-01": month("2024-01-05", "Jar of decay"),
+              "2024-02": month("2024-02-09", "Vorki")}
+    S.save_timeline(tmp_path, months, {}, "X", "t1")
+    store.import_dir("X", tmp_path)
+    on_disk = _files(tmp_path)
+
+    # 2023-12 is gone, 2024-01 is unchanged and 2024-02 gained an entry.
+    months = {"2024-01": months["2024-01"], "2024-02": months["2024-02"] + month("2024-02-10", "Dragonbone necklace")}
+    with store.capture("X", tmp_path) as capture:
+        S.save_timeline(tmp_path, months, {}, "X", "t2")
+    assert set(capture.changed) == {"timeline/2024-02.json", "timeline/index.json"}
+    assert sorted(store.documents("X")) == ["timeline/2024-01.json", "timeline/2024-02.json", "timeline/index.json"]
+    assert _files(tmp_path) == on_disk
+
+    out = tmp_path / "out"
+    store.export("X", out)
+    listed = U.load_json(out / "timeline" / "index.json")["timeline"]["months"]
+    assert sorted(listed) == sorted(p.stem for p in (out / "timeline").glob("20*.json")) == ["2024-01", "2024-02"]
@@ -0,0 +1,30 @@
+"""Tests for the seeded synthetic input generators."""
+
+import build_league_tasks as L
+import synthetic
+import update_stats as U
+from osrs_utils import parse_yaml_with_dates
+
+
+def test_generators_produce_inputs_the_real_parsers_accept():
+    clog = parse_yaml_with_dates(synthetic.gen_clog_yaml(48))
+    assert len(clog) == 4
+    assert all(len(c["obtained"]) == 6 and len(c["missing"]) == 6 for c in clog.values())
+
+    pets = U.parse_pets_yaml(synthetic.gen_pets_yaml(10))
+    assert len(pets["obtained"]) == 5 and len(pets["missing"]) == 5
+
+    ca = parse_yaml_with_dates(synthetic.gen_ca_yaml(100))
+    assert list(ca) == ["Easy", "Medium", "Hard", "Elite", "Master", "Grandmaster"]
+    assert sum(len(t.get("completed", [])) + len(t.get("not_completed", [])) for t in ca.values()) == 100
+    assert {task["date"] is None for t in ca.values() for task in t.get("completed", [])} == {True, False}
+
+    tasks, acc = synthetic.gen_league_tasks(30, n_items=20)
+    assert len(acc["items"]) == 20
+    assert {L.is_done(t, acc)[0] for t in tasks} == {True, False}
+
+
+def test_generators_are_deterministic():
+    assert synthetic.gen_bank_names(50) == synthetic.gen_bank_names(50)
+    assert synthetic.gen_recent_items(20, seed=3) == synthetic.gen_recent_items(20, seed=3)
+    assert synthetic.gen_bank_names(50, seed=2) != synthetic.gen_bank_names(50)
@@ -42,3 +42,62 @@ def test_load_potion_storage_doses_to_4dose(monkeypatch, tmp_path):
     assert by_name["Super combat potion(4)"]["quantity"] == 3
     assert by_name["Prayer potion(4)"]["quantity"] == 1
     assert all(i["source"] == "potion_storage" for i in items)
+
+
+def _bank(items, prices, previous=None):
+    memo = B.CategoryMemo(path=None)
+    processed, summary, change = B.revalue(items, prices, {}, memo, previous)
+    return {"items": processed, "categories": summary, "category_rules": memo.digest}, change
+
+
+def test_revalue_incremental_matches_full_rebuild():
+    prices = {"4151": {"high": 1_500_000, "low": 1_400_000}, "995": {"high": 1, "low": 1},
+              "385": {"high": 900, "low": 800}}
+    old_export = [
+        {"id": 4151, "name": "Abyssal whip", "quantity": 1},
+        {"id": 995, "name": "Coins", "quantity": 1000},
+        {"id": 385, "name": "Shark", "quantity": 100},
+    ]
+    previous, _ = _bank(old_export, prices)
+
+    prices["4151"] = {"high": 1_300_000, "low": 1_300_000}    # price moved
+    new_export = [
+        {"id": 4151, "name": "Abyssal whip", "quantity": 1},
+        {"id": 995, "name": "Coins", "quantity": 5000},        # quantity changed
+        {"id": 11832, "name": "Bandos chestplate", "quantity": 1},  # added; Shark removed
+    ]
+    incremental, change = _bank(new_export, prices, previous)
+    full, _ = _bank(new_export, prices)
+
+    assert incremental["categories"] == full["categories"]
+    assert incremental["items"] == full["items"]
+    assert change["incremental"]
+    assert (change["added"], change["removed"], change["changed"], change["unchanged"]) == (1, 1, 2, 0)
+    assert change["categories"]["Currency"] == 4000
+    assert change["categories"]["Food"] == -85_000
+    assert "Food" not in incremental["categories"]
+    assert change["value_delta"] == sum(change["categories"].values())
+
+
+def test_revalue_rebuilds_when_rules_changed():
+    items = [{"id": 995, "name": "Coins", "quantity": 10}]
+    previous, _ = _bank(items, {})
+    previous["category_rules"] = "stale"
+    previous["categories"] = {"Bogus": {"count": 1, "value": 1, "subcategories": {}}}
+    rebuilt, change = _bank(items, {}, previous)
+    assert not change["incremental"]
+    assert list(rebuilt["categories"]) == ["Currency"]
+
+
+def test_merge_bank_exports_sums_by_id_and_keeps_holders(tmp_path):
+    header = "Item id\tItem name\tItem quantity\n"
+    (tmp_path / "a.txt").write_text(header + "995\tCoins\t100\n4151\tAbyssal whip\t1\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text(header + "995\tCoins\t50\n\nbad\tline\tx\n", encoding="utf-8")
+    exports = [("alice", tmp_path / "a.txt"), B.parse_bank_arg(str(tmp_path / "b.txt"))]
+    merged = {i["id"]: i for i in B.merge_bank_exports(exports)}
+    assert merged[995]["quantity"] == 150
+    assert merged[995]["holders"] == {"alice": 100, "b": 50}
+    assert merged[4151]["holders"] == {"alice": 1}
+
+    processed, _, _ = B.revalue(list(merged.values()), {"995": {"high": 1, "low": 1}}, {}, B.CategoryMemo(None))
+    assert B.holder_totals(processed)["b"] == {"items": 1, "quantity": 50, "value": 50}
@@ -93,6 +93,27 @@ def test_dedup_recent_items_collapses_multi_source():
     assert jaw["collection"] == "slayer"
 
 
+def test_shard_collection_log_groups_by_first_tag():
+    clog = {
+        "total_obtained": 2, "total_items": 4, "recent_items": [], "source": "templeosrs",
+        "collections": {
+            "Abyssal Sire": {"obtained": [{"name": "Unsired", "date": "2024-01-05"}], "missing": ["Bludgeon claw"]},
+            "Abyssal Sire, All Pets": {"obtained": [{"name": "Abyssal orphan", "date": "2024-02-01"}],
+                                       "missing": ["Bludgeon claw"]},
+            "Callisto And Artio": {"obtained": [], "missing": ["Callisto cub"]},
+            "Callisto and Artio": {"obtained": [], "missing": ["Tyrannical ring"]},
+        },
+    }
+    index, shards = S.shard_collection_log(clog)
+    sire = index["categories"]["Abyssal Sire"]
+    # Both Sire categories share one shard; the duplicated missing item is listed once.
+    assert (sire["obtained_count"], sire["total_count"]) == (2, 3)
+    assert shards[sire["shard"]]["collection"]["missing"] == ["Bludgeon claw"]
+    # Names that slug the same still get distinct shard files.
+    assert len({c["shard"] for c in index["categories"].values()}) == 3
+    assert index["obtained_by_month"] == {"2024-01": 1, "2024-02": 1}
+
+
 # --- pet extraction ------------------------------------------------------
 
 def test_extract_pets_from_clog_finds_pets(monkeypatch):
@@ -108,3 +129,67 @@ def test_extract_pets_from_clog_finds_pets(monkeypatch):
     names = {p["name"] for p in pets["obtained"]}
     assert names == {"Vorki"}
     assert pets["source"] == "collection_log"
+
+
+def test_best_rank_index_needs_two_ranked_accounts():
+    assert S.best_rank_index([500, 120]) == 1
+    assert S.best_rank_index([500, -1]) is None
+    assert S.best_rank_index([None, 120, 300]) == 1
+    assert S.best_rank_index([120, 120]) is None
+
+
+def test_build_ranks_aligns_skills_across_accounts():
+    accounts = [{"id": "a", "label": "A", "rsn": "A"}, {"id": "b", "label": "B", "rsn": "B"}]
+    payloads = [
+        {"rsn": "A", "skills": {"Overall": {"level": 1500, "xp": 10, "rank": 900}},
+         "milestones": {"total_level": 1500, "total_xp": 10}},
+        {"rsn": "B", "skills": {"Overall": {"level": 1600, "xp": 20, "rank": 800},
+                                "Sailing": {"level": 30, "xp": 5, "rank": 70}}},
+    ]
+    out = S.build_ranks(accounts, payloads)
+    assert out["skills"]["Overall"]["best"] == 1
+    assert out["skills"]["Sailing"]["accounts"] == [None, {"rank": 70, "level": 30, "xp": 5}]
+    assert out["skills"]["Sailing"]["best"] is None
+    assert out["accounts"][0]["total_level"] == 1500
+    assert out["accounts"][1]["total_level"] is None
+
+
+def test_build_timeline_groups_by_month_and_counts_undated():
+    clog = {"collections": {
+        "zulrah": {"obtained": [{"name": "Uncut onyx", "date": "2026-06-22"}]},
+        "skotizo": {"obtained": [{"name": "Uncut onyx", "date": "2026-06-22"},
+                                 {"name": "Dark claw", "date": None}]},
+    }}
+    ca = {"tiers": {"Hard": {"points_per_task": 3, "completed": [{"name": "Noxious Foe", "date": "2026-05-01"}]}}}
+    pets = {"obtained": [{"name": "Vorki", "source": "Vorkath", "date": "2026-06-30"}]}
+    drops = [{"item": "Draconic visage", "boss": "Vorkath", "kc": 412, "date": "2026-06-02"}]
+    months, undated = S.build_timeline(clog, ca, pets, drops, {"uncut onyx": "Zulrah"})
+    assert list(months) == ["2026-05", "2026-06"]
+    # newest first, the multi-slot clog item listed once
+    assert [e["name"] for e in months["2026-06"]] == ["Vorki", "Uncut onyx", "Draconic visage"]
+    assert months["2026-06"][1]["detail"] == "zulrah"
+    assert months["2026-05"][0]["points"] == 3
+    assert undated == {"clog": 1}
+
+
+def test_save_timeline_only_rewrites_changed_months(tmp_path):
+    months = {
+        "2026-05": [{"date": "2026-05-01", "source": "ca", "name": "A", "detail": "Hard", "points": 3}],
+        "2026-06": [{"date": "2026-06-02", "source": "drop", "name": "B", "detail": "Vorkath", "kc": 1}],
+    }
+    S.save_timeline(tmp_path, months, {}, "rsn", "t1")
+    index = S.load_json(tmp_path / "timeline" / "index.json")["timeline"]
+    assert index["months"]["2026-05"]["counts"]["ca_points"] == 3
+    may = tmp_path / "timeline" / "2026-05.json"
+    may.write_text('{"sentinel": true}')  # left alone while its hash is unchanged
+
+    months["2026-06"].append({"date": "2026-06-03", "source": "pet", "name": "C", "detail": None})
+    S.save_timeline(tmp_path, {"2026-06": months["2026-06"]}, {}, "rsn", "t2")
+    assert not may.exists()  # month dropped from the timeline
+    june = S.load_json(tmp_path / "timeline" / "2026-06.json")
+    assert len(june["entries"]) == 2
+
+    S.save_timeline(tmp_path, months, {}, "rsn", "t3")
+    may.write_text('{"sentinel": true}')
+    S.save_timeline(tmp_path, months, {}, "rsn", "t4")
+    assert S.load_json(may) == {"sentinel": True}
@@ -0,0 +1,68 @@
+"""Tests for the local upstream simulator, driving the real fetch paths through it."""
+
+import pytest
+
+import build_diary_tasks as D
+import build_league_tasks as L
+import instrumentation
+import item_mapping as M
+import osrs_utils as U
+import price_history as P
+import update_stats as S
+import upstream_sim as sim
+
+
+def test_synthetic_payloads_feed_the_real_parsers(upstream):
+    server = upstream()
+    hiscores = U.fetch_json(S.HISCORES_URL, {"player": "Zezima"})
+    assert [s["name"] for s in hiscores["skills"]] == list(sim.HISCORES_SKILLS)
+
+    temple = S.fetch_temple_collection_log("Zezima")
+    names = S.load_item_names()
+    clog = S.load_collection_log(temple, names)
+    assert clog["source"] != "yaml" and clog["total_obtained"] == len(names)
+
+    prices = P.latest_prices(P.PriceStore(None), ttl=0)
+    assert set(prices) == set(names)
+    mapping = M.ItemMapping(None)
+    assert mapping.resolve(next(iter(names.values())).upper()) == int(next(iter(names)))
+
+    assert len(L.scrape_tasks()) == 400
+    wikitext = D.fetch_wikitext_batch(["Ardougne Diary", "Desert Diary"])
+    assert all(D.parse_tasks(wt)["Elite"] for wt in wikitext.values()) and len(wikitext) == 2
+
+    stats = server.stats
+    assert stats["templeosrs.com"]["requests"] == 2 and stats["prices.runescape.wiki"]["ok"] == 2
+
+
+@pytest.mark.parametrize("fault, kind", [
+    ({"error_rate": 1}, "errors"),
+    ({"rate_limit": 1}, "rate_limited"),
+    ({"truncate_rate": 1}, "truncated"),
+])
+def test_injected_faults_exhaust_retries(upstream, fault, kind):
+    server = upstream(**fault)
+    instrumentation.http_metrics.reset()
+    assert U.fetch_json(S.TEMPLE_ITEMS_URL, retries=2, backoff=0) is None
+    assert server.stats["templeosrs.com"][kind] == 2
+    assert instrumentation.http_metrics.to_dict()["hosts"]["templeosrs.com"]["gave_up"] == 1
+
+
+def test_latency_is_applied(upstream):
+    upstream(latency_ms=50)
+    instrumentation.http_metrics.reset()
+    U.fetch_json(S.TEMPLE_ITEMS_URL)
+    assert instrumentation.http_metrics.to_dict()["hosts"]["templeosrs.com"]["latency_ms_max"] >= 50
+
+
+def test_record_then_replay(upstream, tmp_path):
+    origin = upstream()
+    upstream(record_dir=tmp_path, origin=origin.url)
+    recorded = U.fetch_json(S.HISCORES_URL, {"player": "Zezima"})
+    assert recorded and len(list(tmp_path.glob("secure.runescape.com/*.json"))) == 1
+
+    replaying = upstream(replay_dir=tmp_path)
+    assert U.fetch_json(S.HISCORES_URL, {"player": "Zezima"}) == recorded
+    assert U.fetch_json(S.HISCORES_URL, {"player": "Lynx Titan"}, retries=1) is None
+    assert replaying.stats["secure.runescape.com"]["replayed"] == 1
+    assert replaying.stats["secure.runescape.com"]["not_found"] == 1